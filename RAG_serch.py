@@ -3,8 +3,8 @@ import time
 import os
 import requests
 import faiss
-import pickle
 from sentence_transformers import SentenceTransformer
+from janus.serialization import dumps_many, loads_many
 
 # ===== 設定 =====
 JANUS_HOST = "http://localhost:8000"
@@ -20,7 +20,7 @@ embedder = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
 
 # FAISSデータ保存先
 FAISS_INDEX_PATH = "./rag_index.faiss"
-DOCS_PATH = "./rag_docs.pkl"
+DOCS_PATH = "./rag_docs.bin"
 
 # BOT自身のID（固定で入れる）
 BOT_ID = "auth0|68c051a0716fe7384425473f"
@@ -33,9 +33,9 @@ client = janus.Client(
 )
 
 # ===== AIチャンネル確認/作成 =====
-channels = client.get_channels()
-ai_channel = next((c for c in channels if c.name == AI_CHANNEL_NAME), None)
-if not ai_channel:
+try:
+    ai_channel = client.get_channel_by_name(AI_CHANNEL_NAME, type="text")
+except janus.exceptions.ChannelNotFoundError:
     ai_channel = client.create_channel(
         name=AI_CHANNEL_NAME,
         type="text",
@@ -45,32 +45,23 @@ print(f"AIチャンネル: {ai_channel.name} (ID: {ai_channel.id})")
 
 # ===== メッセージ全取得 =====
 def fetch_all_messages(channel_id, batch_size=200):
-    all_messages = []
-    last_seen = 0
-    while True:
-        messages = client.get_messages(channel_id, limit=batch_size)
-        if not messages:
-            break
-        messages = sorted(messages, key=lambda m: m.id)
-        new_msgs = [m for m in messages if m.id > last_seen]
-        if not new_msgs:
-            break
-        all_messages.extend(new_msgs)
-        last_seen = new_msgs[-1].id
-        if len(messages) < batch_size:
-            break
+    # before カーソルで履歴を遡る（新しい順に返るので古い順に並べ直す）
+    all_messages = list(client.iter_messages(channel_id, page_size=batch_size))
+    all_messages.reverse()
     return all_messages
 
+def to_doc(m):
+    return f"{m.author.id}: {m.content}"
+
 # ===== RAG更新 =====
 def update_rag_data():
-    docs = []
+    messages = []
     channels = client.get_channels()
     for ch in channels:
         if ch.id == ai_channel.id:
             continue
-        messages = fetch_all_messages(ch.id)
-        for m in messages:
-            docs.append(f"{m.author.id}: {m.content}")
+        messages.extend(fetch_all_messages(ch.id))
+    docs = [to_doc(m) for m in messages]
     if not docs:
         print("メッセージがありません")
         return
@@ -78,17 +69,19 @@ def update_rag_data():
     index = faiss.IndexFlatL2(embeddings.shape[1])
     index.add(embeddings)
     faiss.write_index(index, FAISS_INDEX_PATH)
+    # メッセージごと保存（pickle と違い読み込み時に任意のコードは実行されない）
     with open(DOCS_PATH, "wb") as f:
-        pickle.dump(docs, f)
+        f.write(dumps_many(messages))
     print("RAGデータ更新完了")
 
 # ===== RAG検索 =====
 def rag_search(query, top_k=5):
-    if not os.path.exists(FAISS_INDEX_PATH):
+    # インデックスとメッセージは update_rag_data で必ず対にして作る（片方だけなら作り直しが必要）
+    if not (os.path.exists(FAISS_INDEX_PATH) and os.path.exists(DOCS_PATH)):
         return "データがありません"
     index = faiss.read_index(FAISS_INDEX_PATH)
     with open(DOCS_PATH, "rb") as f:
-        docs = pickle.load(f)
+        docs = [to_doc(m) for m in loads_many(f.read())]
     q_emb = embedder.encode([query], convert_to_numpy=True)
     D, I = index.search(q_emb, top_k)
     results = [docs[i] for i in I[0] if i < len(docs)]
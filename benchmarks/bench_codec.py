@@ -0,0 +1,64 @@
+"""
+JSONコーデックのベンチマーク
+
+典型的なメッセージペイロード（WebSocketイベント1件・メッセージ履歴1ページ）を
+各コーデックでエンコード・デコードし、1メッセージあたりの処理時間を比較します。
+
+実行:
+    python benchmarks/bench_codec.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from janus.codec import available_codecs, get_codec
+
+
+def make_message(i: int) -> dict:
+    return {
+        "id": 100000 + i,
+        "channel_id": 42,
+        "author": {
+            "id": f"auth0|{i % 50:024x}",
+            "name": f"user{i % 50}",
+            "display_name": f"ユーザー{i % 50}",
+            "avatar_url": f"https://cdn.example.com/avatars/{i % 50}.png",
+            "status": "online",
+            "roles": ["member"],
+        },
+        "content": "こんにちは！これはベンチマーク用のメッセージです。" * 3,
+        "timestamp": "2025-09-13T12:34:56.789Z",
+        "edited_at": None,
+        "attachments": [],
+        "embeds": [],
+    }
+
+
+def bench(number: int = 2000):
+    event = make_message(0)
+    event_payload = {"type": "message", "data": event}
+    page = [make_message(i) for i in range(100)]
+
+    results = {}
+    for name in available_codecs():
+        codec = get_codec(name)
+        event_bytes = codec.dumps(event_payload)
+        page_bytes = codec.dumps(page)
+
+        decode_event = timeit.timeit(lambda: codec.loads(event_bytes), number=number) / number
+        decode_page = timeit.timeit(lambda: codec.loads(page_bytes), number=number // 10) / (number // 10) / len(page)
+        encode_event = timeit.timeit(lambda: codec.dumps(event_payload), number=number) / number
+        results[name] = (decode_event, decode_page, encode_event)
+
+    baseline = results["json"]
+    print(f"{'codec':<10}{'event decode':>16}{'page decode/msg':>18}{'event encode':>16}{'speedup':>10}")
+    for name, (de, dp, ee) in results.items():
+        speedup = baseline[0] / de
+        print(f"{name:<10}{de * 1e6:>13.2f} us{dp * 1e6:>15.2f} us{ee * 1e6:>13.2f} us{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,71 @@
+"""
+データモデルのメモリ使用量ベンチマーク
+
+メッセージ履歴（既定 100万件）を janus.models.Message と janus.compact の
+CompactMessage / FrozenMessage に変換して保持し、1メッセージあたりのメモリ使用量と変換時間を比較します。
+
+実行:
+    python benchmarks/bench_models_memory.py
+    python benchmarks/bench_models_memory.py 200000
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from janus.compact import CompactMessage, FrozenMessage
+from janus.models import Message
+
+
+def make_message(i: int) -> dict:
+    return {
+        "id": 100000 + i,
+        "channel_id": 42 + i % 10,
+        "author": {
+            "id": f"auth0|{i % 50:024x}",
+            "name": f"user{i % 50}",
+            "display_name": f"ユーザー{i % 50}",
+            "status": "online",
+            "roles": ["member"],
+        },
+        "content": f"メッセージ {i}",
+        "timestamp": "2025-09-13T12:34:56.789Z",
+        "edited_at": None,
+        "attachments": [],
+        "embeds": [],
+    }
+
+
+def measure(cls, count: int):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    messages = [cls.from_dict(make_message(i)) for i in range(count)]
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del messages
+    return current, elapsed
+
+
+def bench(count: int = 1_000_000):
+    results = {}
+    for cls in (Message, CompactMessage, FrozenMessage):
+        results[cls.__name__] = measure(cls, count)
+
+    baseline = results["Message"][0]
+    print(f"{count:,} messages")
+    print(f"{'model':<16}{'total':>12}{'per message':>14}{'from_dict':>14}{'ratio':>8}")
+    for name, (size, elapsed) in results.items():
+        print(
+            f"{name:<16}{size / 1024 ** 2:>9.1f} MB{size / count:>11.0f} B"
+            f"{elapsed / count * 1e6:>11.2f} us{size / baseline:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
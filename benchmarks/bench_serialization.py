@@ -0,0 +1,73 @@
+"""
+データモデルのシリアライズのベンチマーク
+
+メッセージ履歴（既定 10万件、投稿者 50人）を pickle と janus.serialization.dumps_many で保存・復元し、
+サイズと時間（3回の最小値）を比較します。msgpack がインストールされていない場合は純 Python の実装で計測します。
+
+実行:
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py 500000
+"""
+
+import os
+import pickle
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from janus import serialization
+from janus.identity import UserIdentityMap
+from janus.models import Message
+
+
+def make_message(i: int) -> dict:
+    return {
+        "id": 100000 + i,
+        "channel_id": 42 + i % 10,
+        "author": {
+            "id": f"auth0|{i % 50:024x}",
+            "name": f"user{i % 50}",
+            "display_name": f"ユーザー{i % 50}",
+            "status": "online",
+            "roles": ["member"],
+        },
+        "content": f"メッセージ {i}",
+        "timestamp": "2025-09-13T12:34:56.789Z",
+        "edited_at": None,
+        "attachments": [],
+        "embeds": [],
+    }
+
+
+def measure(dumps, loads, messages, repeat: int = 3):
+    dumped = loaded = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = dumps(messages)
+        dumped = min(dumped, time.perf_counter() - started)
+        started = time.perf_counter()
+        loads(data)
+        loaded = min(loaded, time.perf_counter() - started)
+    return len(data), dumped, loaded
+
+
+def bench(count: int = 100_000):
+    users = UserIdentityMap()
+    shared = [Message.from_dict(make_message(i), users) for i in range(count)]
+    separate = [Message.from_dict(make_message(i)) for i in range(count)]
+
+    backend = "msgpack" if serialization._MSGPACK_AVAILABLE else "pure python"
+    print(f"{count:,} messages (janus.serialization: {backend})")
+    print(f"{'format':<32}{'size':>12}{'dump':>12}{'load':>12}")
+    for label, messages in (("authors shared", shared), ("authors separate", separate)):
+        for name, dumps, loads in (
+            ("pickle", lambda m: pickle.dumps(m, pickle.HIGHEST_PROTOCOL), pickle.loads),
+            ("dumps_many", serialization.dumps_many, serialization.loads_many),
+        ):
+            size, dumped, loaded = measure(dumps, loads, messages)
+            print(f"{name + ' (' + label + ')':<32}{size / 1024 ** 2:>9.2f} MB{dumped:>10.3f} s{loaded:>10.3f} s")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -19,9 +19,9 @@ client = janus.Client(
 )
 
 # ===== AIチャンネル確認/作成 =====
-channels = client.get_channels()
-ai_channel = next((c for c in channels if c.name == AI_CHANNEL_NAME), None)
-if not ai_channel:
+try:
+    ai_channel = client.get_channel_by_name(AI_CHANNEL_NAME, type="text")
+except janus.exceptions.ChannelNotFoundError:
     ai_channel = client.create_channel(
         name=AI_CHANNEL_NAME,
         type="text",
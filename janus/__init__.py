@@ -14,16 +14,33 @@ Janus SDK - Discord風チャットプラットフォームのPython SDK
     
     # メッセージ送信
     message = client.send_message(channels[0].id, "Hello!")
+    
+    # 非同期クライアント（aiohttp が必要）
+    async with janus.AsyncClient(host=..., token=...) as client:
+        channels = await client.get_channels()
 """
 
 from .client import Client
-from .models import Channel, Message, User, Member
+from .async_client import AsyncClient
+from .ratelimit import RateLimiter, TokenBucket, SQLiteTokenBucket, RouteRateLimiter
+from .retry import RetryPolicy
+from .http_cache import ResponseCache
+from .dispatch import SendDispatcher, PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BULK
+from .upload import UploadResult
+from .download import AttachmentCache
+from .members import MemberDirectory
+from .cache import TTLCache
+from .snapshot import Snapshot
+from .identity import UserIdentityMap
+from .batch import MessageBatch
+from .models import Channel, Message, LazyMessage, User, Member
 from .exceptions import (
     JanusAPIError,
     PermissionError,
     RateLimitError,
     ServerNotFoundError,
-    InvalidTokenError
+    InvalidTokenError,
+    UploadError
 )
 
 __version__ = "1.0.0"
@@ -32,13 +49,33 @@ __license__ = "MIT"
 
 __all__ = [
     "Client",
+    "AsyncClient",
     "Channel",
     "Message", 
+    "LazyMessage",
     "User",
     "Member",
+    "RateLimiter",
+    "TokenBucket",
+    "SQLiteTokenBucket",
+    "RouteRateLimiter",
+    "RetryPolicy",
+    "ResponseCache",
+    "SendDispatcher",
+    "PRIORITY_INTERACTIVE",
+    "PRIORITY_NORMAL",
+    "PRIORITY_BULK",
+    "UploadResult",
+    "AttachmentCache",
+    "MemberDirectory",
+    "TTLCache",
+    "Snapshot",
+    "UserIdentityMap",
+    "MessageBatch",
     "JanusAPIError",
     "PermissionError",
     "RateLimitError",
     "ServerNotFoundError",
-    "InvalidTokenError"
+    "InvalidTokenError",
+    "UploadError"
 ]
@@ -0,0 +1,1760 @@
+"""
+Janus SDK 非同期クライアント
+
+aiohttp のコネクションプール（Keep-Alive）上で動作する asyncio ネイティブなクライアントです。
+同期版 Client と同じメソッド群をコルーチンとして提供します。
+"""
+
+import asyncio
+import copy
+import os
+import random
+import time
+try:
+    import aiohttp
+    _AIOHTTP_AVAILABLE = True
+except Exception:
+    aiohttp = None
+    _AIOHTTP_AVAILABLE = False
+try:
+    import websockets
+    _WEBSOCKETS_AVAILABLE = True
+except Exception:
+    websockets = None
+    _WEBSOCKETS_AVAILABLE = False
+from typing import List, Optional, Dict, Any, AsyncIterator, Callable, Hashable, Iterable, Tuple, Union
+from urllib.parse import urljoin, urlparse
+
+from .client import (
+    _is_json,
+    _raise_for_status,
+    _upload_unsupported,
+    _download_target,
+    _deliver,
+    _parse_channels,
+    _raw_message_id,
+    _select_server,
+    _snapshot_matches
+)
+from .ratelimit import RateLimiter, TokenBucket, RouteRateLimiter, route_key, parse_retry_after
+from .retry import RetryPolicy
+from .codec import JSONCodec, get_codec
+from .http_cache import ResponseCache
+from .pagination import HistoryCursor
+from .batch import MessageBatch
+from .singleflight import AsyncSingleFlight
+from .upload import (
+    MultipartFileStream,
+    ResumableUpload,
+    UploadResult,
+    ProgressCallback,
+    BatchProgressCallback,
+    DEFAULT_RESUMABLE_CHUNK_SIZE
+)
+from .download import (
+    AttachmentCache,
+    RangeNotSupported,
+    DOWNLOAD_CHUNK_SIZE,
+    parse_content_range,
+    plan_segments,
+    range_header
+)
+from .cache import TTLCache, ChannelCache
+from .members import MemberDirectory
+from .snapshot import Snapshot
+from .identity import UserIdentityMap
+from .models import Channel, Message, LazyMessage, User, Member, Server, Attachment
+from .exceptions import (
+    InvalidTokenError,
+    ServerNotFoundError,
+    ChannelNotFoundError,
+    UserNotFoundError,
+    ConnectionError,
+    JanusAPIError,
+    UploadError
+)
+
+
+def _client_timeout(seconds: float) -> "aiohttp.ClientTimeout":
+    """
+    接続と受信待ちのタイムアウト（同期版の requests と同じ意味）
+
+    転送全体の時間は制限しないので、大きなファイルのアップロード・ダウンロードが
+    途中で打ち切られることはありません。
+    """
+    return aiohttp.ClientTimeout(total=None, sock_connect=seconds, sock_read=seconds)
+
+
+def _open_at(path: str, position: int):
+    """ファイルを書き込み用に開いて position に移動"""
+    f = open(path, "r+b")
+    f.seek(position)
+    return f
+
+
+class AsyncClient:
+    """
+    Janus SDKの非同期クライアントクラス
+
+    使用例:
+        async with AsyncClient(
+            host="https://your-janus-server.com",
+            token="janus_your_server_token_here"
+        ) as client:
+            channels = await client.get_channels()
+            message = await client.send_message(channels[0].id, "Hello!")
+    """
+
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        use_server_token: bool = False,
+        timeout: int = 30,
+        retry_attempts: int = 3,
+        rate_limit_per_minute: int = 60,
+        auto_reconnect: bool = True,
+        debug: bool = False,
+        user_agent: str = "Janus-SDK/1.0",
+        max_connections: int = 100,
+        max_connections_per_host: int = 0,
+        keepalive_timeout: float = 30.0,
+        rate_limiter: Optional[RateLimiter] = None,
+        route_limiter: Optional[RouteRateLimiter] = None,
+        max_retry_after: float = 60.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        coalesce_requests: bool = False,
+        response_cache: Union[bool, ResponseCache] = False,
+        json_codec: Union[str, JSONCodec] = "auto",
+        attachment_cache: Union[bool, AttachmentCache] = False,
+        member_ttl: Optional[float] = 300.0,
+        cache_size: int = 1024,
+        cache_ttl: Optional[float] = 300.0,
+        snapshot: Union[str, Snapshot, None] = None,
+        server_id: Optional[int] = None,
+        lazy_messages: bool = False,
+        identity_map: Union[bool, UserIdentityMap] = False
+    ):
+        """
+        クライアント初期化
+
+        ネットワーク通信は行いません。`async with` / `await client.connect()`、
+        もしくは最初のAPI呼び出し時にセッションを作成してサーバー情報を取得します。
+
+        Args:
+            host: JanusサーバーのURL (例: "https://your-janus-server.com")
+            token: サーバーAPIトークン (例: "janus_abc123...")
+            use_server_token: サーバートークン認証を使用
+            timeout: リクエストタイムアウト（秒）
+            retry_attempts: 最大試行回数（retry_policy 省略時に使用）
+            rate_limit_per_minute: 分あたりリクエスト制限
+            auto_reconnect: WebSocket自動再接続
+            debug: デバッグモード
+            user_agent: ユーザーエージェント
+            max_connections: コネクションプールの最大同時接続数（0で無制限）
+            max_connections_per_host: ホストあたりの最大同時接続数（0で無制限）
+            keepalive_timeout: アイドル接続を保持する秒数
+            rate_limiter: 共有レートリミッター（省略時は rate_limit_per_minute のトークンバケット）
+            route_limiter: ルート別レートリミッター（省略時はクライアント専用のものを作成）
+            max_retry_after: 429 を自動再試行する Retry-After の上限秒数（超えると RateLimitError）
+            retry_policy: 再試行ポリシー（バックオフ・再試行予算・5xx の扱い）
+            coalesce_requests: 同時に発行された同一の GET を1回のリクエストにまとめる
+            response_cache: ETag / Last-Modified による条件付きリクエストキャッシュ
+                            （True で既定設定、ResponseCache インスタンスでサイズ指定）
+            json_codec: JSONコーデック（"auto" で orjson / msgspec / ujson / json から自動選択）
+            attachment_cache: 添付ファイルのディスクキャッシュ
+                              （True で ~/.cache/janus/attachments、AttachmentCache インスタンスで場所・上限を指定）
+            member_ttl: メンバーディレクトリを再取得するまでの秒数（Noneで member_join イベントによる更新のみ）
+            cache_size: チャンネル・ユーザープロフィールのキャッシュの最大エントリ数
+            cache_ttl: チャンネル・ユーザープロフィールのキャッシュの有効期限（秒、Noneで WebSocket イベントによる更新のみ）
+            snapshot: ウォームスタート用スナップショット（ファイルパスまたは Snapshot インスタンス）。
+                      保存済みならサーバー情報・チャンネル・メンバーを読み込んで起動し、バックグラウンドで再検証
+            server_id: 接続するサーバーのID（指定すると GET /servers によるサーバー探索を行わない）
+            lazy_messages: 履歴・WebSocket イベントのメッセージを LazyMessage（参照したフィールドだけをデコード）で返す
+            identity_map: 同じユーザーIDの User を1つのインスタンスで共有する
+                          （True で新規作成、UserIdentityMap インスタンスで複数クライアント間で共有）
+        """
+        if not _AIOHTTP_AVAILABLE:
+            raise ImportError(
+                "AsyncClient を利用するには aiohttp が必要です: pip install janus-sdk[async]"
+            )
+
+        self.host = host.rstrip('/')
+        self.token = token
+        self.timeout = timeout
+        self.retry_attempts = retry_attempts
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.auto_reconnect = auto_reconnect
+        self.debug = debug
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.json_codec = get_codec(json_codec)
+
+        # APIエンドポイント
+        self.api_base = f"{self.host}/api/v1"
+
+        # 認証ヘッダー（同期版 Client と同じ方式）
+        if use_server_token:
+            self.headers = {
+                "X-Server-Token": token,
+                "Authorization": f"Token {token}",
+                "User-Agent": user_agent
+            }
+        else:
+            self.headers = {
+                "Authorization": f"Bearer {token}",
+                "User-Agent": user_agent
+            }
+
+        # HTTPセッション（イベントループ上で遅延生成）
+        self.session: Optional["aiohttp.ClientSession"] = None
+        # API サーバー以外のホスト用（認証ヘッダーなし、コネクションプールは共有）
+        self._public_session: Optional["aiohttp.ClientSession"] = None
+        self.user_agent = user_agent
+
+        # レート制限管理（複数クライアント・スレッド間で共有可能）
+        self.rate_limiter = rate_limiter or TokenBucket(rate_limit_per_minute, per=60.0)
+        # ルート別レート制限（サーバーの 429 / X-RateLimit-* から学習）
+        self.route_limiter = route_limiter or RouteRateLimiter()
+        self.max_retry_after = max_retry_after
+        # 再試行ポリシー（ジッター付きバックオフ・再試行予算）
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=retry_attempts)
+        # 同一 GET の合流（シングルフライト）
+        self._singleflight = AsyncSingleFlight() if coalesce_requests else None
+        # 条件付きリクエストキャッシュ（304 でパース済みモデルを再利用）
+        if response_cache is True:
+            response_cache = ResponseCache()
+        self.response_cache = response_cache if isinstance(response_cache, ResponseCache) else None
+
+        # 再開可能アップロードへのサーバー対応（None: 未確認）
+        self._resumable_uploads: Optional[bool] = None
+
+        # 添付ファイルのディスクキャッシュ
+        if attachment_cache is True:
+            attachment_cache = AttachmentCache()
+        self.attachment_cache = attachment_cache if isinstance(attachment_cache, AttachmentCache) else None
+
+        # WebSocket接続
+        self._ws = None
+        self._event_handlers = {}
+        self._running = False
+
+        # 履歴・イベントのメッセージのデコード方法
+        self._message_type = LazyMessage if lazy_messages else Message
+        # User の共有（メッセージの author・メンバー・プロフィールで同じインスタンスを使う）
+        if identity_map is True:
+            identity_map = UserIdentityMap()
+        self.identity_map = identity_map if isinstance(identity_map, UserIdentityMap) else None
+
+        # キャッシュ（LRU + TTL、WebSocket イベントで更新・無効化）
+        self.channel_cache = ChannelCache(maxsize=cache_size, ttl=cache_ttl)
+        self.user_cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        # メンバーの索引（get_user / has_permission / is_admin はネットワークなしで解決）
+        self.member_directory = MemberDirectory(ttl=member_ttl)
+        if self.identity_map is not None:
+            self.identity_map.attach(self.member_directory)
+        self._members_lock = None  # イベントループ上で遅延生成
+
+        # ウォームスタート用スナップショット
+        if isinstance(snapshot, str):
+            snapshot = Snapshot(snapshot)
+        self.snapshot = snapshot if isinstance(snapshot, Snapshot) else None
+        self._snapshot_key = Snapshot.key_for(self.host, token, server_id)
+        self._revalidate_task: Optional[asyncio.Task] = None
+
+        self._server_id = server_id
+        self._server_info = None
+        self._init_lock = None  # イベントループ上で遅延生成
+        # トークンでアクセスできるサーバー（ID → Server）と、サーバーごとのクライアント
+        self._servers: Dict[int, Server] = {}
+        self._parent: Optional["AsyncClient"] = None
+        self._children: Dict[int, "AsyncClient"] = {}
+
+    async def __aenter__(self) -> "AsyncClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Keep-Alive なコネクションプールを持つセッションを取得（なければ作成）"""
+        if self._parent is not None:
+            # サーバーごとのクライアントは作成元のセッションを共有
+            return self._parent._get_session()
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=_client_timeout(self.timeout)
+            )
+            if self.debug:
+                print(f"[Janus SDK] api_base={self.api_base}")
+                print(f"[Janus SDK] headers={self.headers}")
+        return self.session
+
+    async def close(self):
+        """セッションを閉じてプール内の接続を解放（サーバーごとのクライアントも閉じる）"""
+        self._running = False
+        if self._revalidate_task is not None and not self._revalidate_task.done():
+            self._revalidate_task.cancel()
+        self._revalidate_task = None
+        if self._ws:
+            await self._ws.close()
+            self._ws = None
+        for child in list(self._children.values()):
+            await child.close()
+        if self._parent is not None:
+            # セッションは作成元が所有
+            return
+        if self._public_session is not None and not self._public_session.closed:
+            await self._public_session.close()
+        self._public_session = None
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def connect(self) -> Server:
+        """
+        サーバー情報を取得（未取得の場合のみ。同時に呼ばれても初期化は1回だけ実行）
+
+        Returns:
+            接続中のサーバー情報
+        """
+        server = self._server_info
+        if server is not None:
+            return server
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if self._server_info is None:
+                await self._initialize()
+            return self._server_info
+
+    async def _initialize(self):
+        """初期化処理（スナップショットがあれば読み込み、再検証はバックグラウンドで行う）"""
+        kinds = await self._load_snapshot()
+        if kinds:
+            self._revalidate_task = asyncio.ensure_future(self._revalidate_snapshot(kinds))
+            return
+        if self._server_id is not None:
+            # サーバーIDが分かっていれば探索しない（一覧を取得済みでなければ名前などは未取得）
+            self._server_info = self._servers.get(self._server_id) or Server(id=self._server_id, name="")
+            return
+        await self._fetch_server()
+
+    async def _fetch_server(self):
+        """トークンの検証とサーバー情報取得"""
+        try:
+            response = await self._make_request("GET", "/servers")
+            if not response or len(response) == 0:
+                raise InvalidTokenError("無効なトークンまたはサーバーアクセス権限がありません")
+            self._remember_servers(response)
+            self._server_info = _select_server(response, self._server_id)
+            if self.debug:
+                print(f"[Janus SDK] 接続成功: {self._server_info.name}")
+        except Exception as e:
+            if self.debug:
+                print(f"[Janus SDK] 初期化エラー: {e}")
+            raise
+        await self._save_snapshot("server", self._server_info)
+
+    def _remember_servers(self, response: List[Dict[str, Any]]):
+        """GET /servers のレスポンスをサーバー一覧に反映（サーバーごとのクライアントと共有）"""
+        servers = {server.id: server for server in map(Server.from_dict, response)}
+        self._servers.clear()
+        self._servers.update(servers)
+
+    def _decode_messages(self, response: List[Dict[str, Any]]) -> List[Message]:
+        return [self._message_type.from_dict(msg, self.identity_map) for msg in response]
+
+    def _decode_members(self, response: List[Dict[str, Any]]) -> List[Member]:
+        return [Member.from_dict(member, self.identity_map) for member in response]
+
+    def _decode_user(self, response: Dict[str, Any]) -> User:
+        if self.identity_map is not None:
+            return self.identity_map.intern(response)
+        return User.from_dict(response)
+
+    async def _load_snapshot(self) -> List[str]:
+        """
+        スナップショットからサーバー情報・チャンネル・メンバーを復元（SQLite の読み込みはスレッドプールで実行）
+
+        Returns:
+            復元した項目（スナップショットがなければ空リスト）
+        """
+        if self.snapshot is None:
+            return []
+        loop = asyncio.get_running_loop()
+        try:
+            state = await loop.run_in_executor(None, self.snapshot.load, self._snapshot_key)
+            if state is None or not _snapshot_matches(state, self._server_id):
+                return []
+            self._server_info = Server.from_dict(state["server"])
+            if "channels" in state:
+                self.channel_cache.replace(_parse_channels(state["channels"]))
+            if "members" in state:
+                self.member_directory.replace(self._decode_members(state["members"]))
+        except Exception as e:
+            # 壊れたスナップショットは無視して通常どおり初期化
+            if self.debug:
+                print(f"[Janus SDK] スナップショット読み込みエラー: {e}")
+            self._server_info = None
+            self.channel_cache.invalidate()
+            self.member_directory.invalidate()
+            return []
+        if self.debug:
+            print(f"[Janus SDK] スナップショットから起動: {self._server_info.name} ({', '.join(state)})")
+        return list(state)
+
+    async def _save_snapshot(self, kind: str, data: Any):
+        """スナップショットを更新（失敗しても API 呼び出しには影響させない）"""
+        if self.snapshot is None:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self.snapshot.save, self._snapshot_key, kind, data)
+        except Exception as e:
+            if self.debug:
+                print(f"[Janus SDK] スナップショット保存エラー: {e}")
+
+    async def _revalidate_snapshot(self, kinds: List[str]):
+        """スナップショットから復元した項目を再取得（複数プロセスの同時起動で集中しないよう開始をずらす）"""
+        await asyncio.sleep(random.uniform(0, self.snapshot.revalidate_jitter))
+        try:
+            await self._fetch_server()
+            if "channels" in kinds:
+                await self.get_channels(force_refresh=True)
+            if "members" in kinds:
+                await self.get_members()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if self.debug:
+                print(f"[Janus SDK] スナップショット再検証エラー: {e}")
+
+    async def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Dict[str, Any] = None,
+        params: Dict[str, Any] = None,
+        body: Union[bytes, MultipartFileStream] = None,
+        headers: Dict[str, str] = None,
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+        cache_key: Hashable = None
+    ) -> Any:
+        """
+        API リクエスト実行
+
+        Args:
+            method: HTTPメソッド
+            endpoint: APIエンドポイント
+            data: リクエストボディ（JSON）
+            params: クエリパラメータ
+            body: 生のリクエストボディ（MultipartFileStream は再試行のたびに先頭から送り直す）
+            headers: 追加のリクエストヘッダー
+            timeout: このリクエストのタイムアウト秒数（省略時はクライアントの timeout）
+            idempotency_key: 冪等キー（指定時は POST も安全に再試行）
+            cache_key: 条件付きリクエストキャッシュのキー（GET のみ）
+
+        Returns:
+            APIレスポンス
+
+        Raises:
+            JanusAPIError: API エラー
+        """
+        # URLを正しく構築
+        if endpoint.startswith('/'):
+            endpoint = endpoint[1:]  # 先頭の/を削除
+        url = f"{self.api_base}/{endpoint}"
+        route = route_key(method, endpoint)
+        session = self._get_session()
+        policy = self.retry_policy
+        policy.stats.record_request()
+        started = time.monotonic()
+        delay = 0.0
+        attempt = 0
+        # JSONボディは再試行に備えて一度だけエンコード
+        json_body = self.json_codec.dumps(data) if data and body is None else None
+        cache_entry = None
+        if cache_key is not None and self.response_cache is not None:
+            cache_entry = self.response_cache.get(cache_key)
+        else:
+            cache_key = None
+
+        if params:
+            # aiohttp は None 値を受け付けないため除外
+            params = {k: v for k, v in params.items() if v is not None}
+
+        while True:
+            # レート制限チェック（グローバル枠 → ルート別枠）
+            await self._check_rate_limit()
+            await self._wait_for_route(route)
+            try:
+                if self.debug:
+                    print(f"[Janus SDK] {method} {url}")
+
+                kwargs = {"params": params}
+                if timeout is not None:
+                    kwargs["timeout"] = _client_timeout(timeout)
+                request_headers = dict(headers) if headers else {}
+                if idempotency_key:
+                    request_headers["Idempotency-Key"] = idempotency_key
+                if cache_key is not None:
+                    request_headers.update(self.response_cache.conditional_headers(cache_entry))
+                if isinstance(body, MultipartFileStream):
+                    # Content-Length 付きでチャンクごとに送信（ファイル全体をメモリに載せない）
+                    kwargs["data"] = body.aiter()
+                    request_headers["Content-Type"] = body.content_type
+                    request_headers["Content-Length"] = str(len(body))
+                elif body is not None:
+                    kwargs["data"] = body
+                elif json_body is not None:
+                    kwargs["data"] = json_body
+                    request_headers["Content-Type"] = self.json_codec.content_type
+                if request_headers:
+                    kwargs["headers"] = request_headers
+
+                async with session.request(method, url, **kwargs) as response:
+                    payload = await response.read()
+
+                    if self.debug:
+                        print(f"[Janus SDK] response status: {response.status}")
+                        print(f"[Janus SDK] response body: {payload[:500].decode('utf-8', 'replace')}")
+
+                    self.route_limiter.update(route, response.headers)
+                    if response.status == 429 and self._defer_rate_limited(route, response.headers, attempt):
+                        attempt += 1
+                        continue
+
+                    if policy.is_retryable_status(response.status):
+                        retry_delay = policy.backoff(
+                            method, attempt, started, delay, f"status_{response.status}",
+                            has_idempotency_key=bool(idempotency_key)
+                        )
+                        if retry_delay is not None:
+                            delay = retry_delay
+                            attempt += 1
+                            if self.debug:
+                                print(f"[Janus SDK] {response.status}: {delay:.2f}秒後に再試行")
+                            await asyncio.sleep(delay)
+                            continue
+
+                    if response.status == 304 and cache_entry is not None:
+                        return self.response_cache.not_modified(cache_key, cache_entry)
+
+                    _raise_for_status(
+                        response.status,
+                        response.headers,
+                        lambda: self.json_codec.loads(payload) if _is_json(response.headers) else {}
+                    )
+
+                    # 成功レスポンス
+                    result = self.json_codec.loads(payload) if _is_json(response.headers) else payload
+                    if cache_key is not None:
+                        self.response_cache.store(cache_key, response.headers, result, len(payload))
+                    return result
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                timed_out = isinstance(e, asyncio.TimeoutError)
+                request_sent = not isinstance(e, aiohttp.ClientConnectorError)
+                retry_delay = policy.backoff(
+                    method, attempt, started, delay,
+                    "timeout" if timed_out else ("connection" if request_sent else "connect"),
+                    request_sent=request_sent,
+                    has_idempotency_key=bool(idempotency_key)
+                )
+                if retry_delay is None:
+                    if timed_out:
+                        raise ConnectionError("リクエストがタイムアウトしました") from e
+                    raise ConnectionError(f"サーバーに接続できません: {self.host}") from e
+                delay = retry_delay
+                attempt += 1
+                if self.debug:
+                    print(f"[Janus SDK] 通信エラー ({e.__class__.__name__}): {delay:.2f}秒後に再試行")
+                await asyncio.sleep(delay)
+
+    async def _check_rate_limit(self):
+        """レート制限チェック（トークンが補充されるまで待機）"""
+        if self.debug:
+            wait = self.rate_limiter.time_until_available()
+            if wait > 0:
+                print(f"[Janus SDK] レート制限により {wait:.1f}秒待機")
+        await self.rate_limiter.acquire_async()
+
+    async def _wait_for_route(self, route: str):
+        """ルート別レート制限が解除されるまで待機"""
+        wait = self.route_limiter.wait_time(route)
+        if wait > 0:
+            if self.debug:
+                print(f"[Janus SDK] {route} はレート制限中のため {wait:.1f}秒待機")
+            await asyncio.sleep(wait)
+
+    def _defer_rate_limited(self, route: str, headers, attempt: int) -> bool:
+        """
+        429 レスポンスをルートに記録し、再試行するか判定
+
+        Args:
+            route: ルートキー
+            headers: レスポンスヘッダー
+            attempt: 現在の試行回数
+
+        Returns:
+            Retry-After 経過後に再試行する場合 True
+        """
+        retry_after = parse_retry_after(headers)
+        is_global = headers.get("X-RateLimit-Global", "").lower() == "true"
+        self.route_limiter.block(route, retry_after, is_global=is_global)
+        if attempt < self.retry_policy.max_attempts - 1 and retry_after <= self.max_retry_after:
+            if self.debug:
+                print(f"[Janus SDK] 429: {route} を {retry_after:.1f}秒後に再試行")
+            self.retry_policy.stats.record_retry("rate_limit")
+            return True
+        self.retry_policy.stats.record_give_up()
+        return False
+
+    async def _require_server(self) -> Server:
+        """接続中のサーバー情報を取得（未初期化なら初期化、取得できなければエラー）"""
+        server = await self.connect()
+        if not server:
+            raise ServerNotFoundError("サーバー情報が取得できません")
+        return server
+
+    async def _fetch(self, endpoint: str, parse: Callable[[Any], Any], params: Dict[str, Any] = None) -> Any:
+        """
+        GET リクエストを実行してレスポンスをパース
+
+        coalesce_requests が有効な場合、同時に発行された同一の GET（エンドポイント＋パラメータ）は
+        1回の HTTP リクエストとパース結果を共有します。response_cache が有効な場合は
+        条件付きリクエストを送り、304 なら前回のパース結果をそのまま返します。
+
+        Args:
+            endpoint: APIエンドポイント
+            parse: レスポンスをモデルに変換する関数
+            params: クエリパラメータ
+
+        Returns:
+            パース結果
+        """
+        key = ResponseCache.make_key(endpoint, params)
+
+        async def fetch():
+            if self.response_cache is None:
+                return parse(await self._make_request("GET", endpoint, params=params))
+            body = await self._make_request("GET", endpoint, params=params, cache_key=key)
+            return self.response_cache.parsed(key, body, parse)
+
+        if self._singleflight is None:
+            return await fetch()
+        return await self._singleflight.do(key, fetch)
+
+    # サーバー操作
+    async def get_servers(self, force_refresh: bool = False) -> List[Server]:
+        """
+        トークンでアクセスできるサーバー一覧取得
+
+        Args:
+            force_refresh: キャッシュを無視して最新データを取得
+
+        Returns:
+            サーバーリスト
+        """
+        if force_refresh or not self._servers:
+            response = await self._make_request("GET", "/servers")
+            self._remember_servers(response or [])
+        return list(self._servers.values())
+
+    def for_server(self, server_id: int) -> "AsyncClient":
+        """
+        指定サーバーを操作するクライアントを取得
+
+        返されるクライアントはこのクライアントと HTTP セッション（コネクションプール）・レートリミッター・
+        再試行ポリシー・ユーザープロフィールのキャッシュ・イベントハンドラーを共有し、チャンネルのキャッシュと
+        メンバーディレクトリだけをサーバーごとに持ちます。start() では全サーバーの WebSocket を同時に受信します。
+
+        Args:
+            server_id: サーバーID
+
+        Returns:
+            サーバー用のクライアント（このクライアントのサーバーなら自身）
+        """
+        if self._parent is not None:
+            return self._parent.for_server(server_id)
+        own_id = self._server_info.id if self._server_info else self._server_id
+        if server_id == own_id:
+            return self
+        # 未初期化で自身のサーバーが分からない場合、同じサーバーの子クライアントは start() で外す
+        child = self._children.get(server_id)
+        if child is None:
+            child = self._spawn(server_id)
+            self._children[server_id] = child
+        return child
+
+    async def for_all_servers(self) -> List["AsyncClient"]:
+        """アクセスできる全サーバーのクライアントを取得（サーバー一覧が未取得なら取得）"""
+        return [self.for_server(server.id) for server in await self.get_servers()]
+
+    def _spawn(self, server_id: int) -> "AsyncClient":
+        """接続・制限・共有キャッシュを引き継ぎ、サーバーごとの状態だけを作り直したクライアントを作成"""
+        child = copy.copy(self)
+        child._parent = self
+        child._children = {}
+        child.session = None
+        child._public_session = None
+        child._server_id = server_id
+        child._server_info = None
+        child._init_lock = None
+        child._snapshot_key = Snapshot.key_for(self.host, self.token, server_id)
+        child._revalidate_task = None
+        child.channel_cache = ChannelCache(maxsize=self.channel_cache.entries.maxsize, ttl=self.channel_cache.ttl)
+        child.member_directory = MemberDirectory(ttl=self.member_directory.ttl)
+        if child.identity_map is not None:
+            child.identity_map.attach(child.member_directory)
+        child._members_lock = None
+        child._ws = None
+        child._running = False
+        return child
+
+    # チャンネル操作
+    async def get_channels(self, force_refresh: bool = False) -> List[Channel]:
+        """
+        チャンネル一覧取得
+
+        Args:
+            force_refresh: キャッシュを無視して最新データを取得
+
+        Returns:
+            チャンネルリスト
+        """
+        if not force_refresh:
+            cached = self.channel_cache.all()
+            if cached is not None:
+                return cached
+
+        server = await self._require_server()
+        channels = list(await self._fetch(f"/servers/{server.id}/channels", _parse_channels))
+
+        # キャッシュ更新
+        self.channel_cache.replace(channels)
+        await self._save_snapshot("channels", channels)
+
+        return channels
+
+    async def get_channel(self, channel_id: int) -> Channel:
+        """
+        チャンネル情報取得
+
+        Args:
+            channel_id: チャンネルID
+
+        Returns:
+            チャンネル情報
+        """
+        # キャッシュから検索
+        channel = self.channel_cache.get(channel_id)
+        if channel is not None:
+            return channel
+
+        # 期限内の一覧になければ存在しない。一覧が古い場合のみ再取得
+        if not self.channel_cache.known_missing(channel_id):
+            channels = await self.get_channels(force_refresh=True)
+            channel = next((ch for ch in channels if ch.id == channel_id), None)
+
+        if not channel:
+            raise ChannelNotFoundError(f"チャンネル ID {channel_id} が見つかりません")
+
+        return channel
+
+    async def get_channel_by_name(self, name: str, type: Optional[str] = None) -> Channel:
+        """
+        チャンネル名からチャンネルを取得
+
+        名前の索引（大文字小文字を区別しない。完全一致を優先）から引くため、キャッシュが有効な間は
+        ネットワークアクセスなしで解決します。見つからない場合は、キャッシュ後に作成・改名された
+        チャンネルの可能性があるため一覧を1回だけ再取得してから探し直します。
+
+        Args:
+            name: チャンネル名
+            type: チャンネルタイプで絞り込む（"text", "voice", "forum"）
+
+        Returns:
+            チャンネル情報
+
+        Raises:
+            ChannelNotFoundError: チャンネルが存在しない
+        """
+        channel = self.channel_cache.find_by_name(name, type)
+        if channel is None:
+            await self.get_channels(force_refresh=True)
+            channel = self.channel_cache.find_by_name(name, type)
+
+        if channel is None:
+            raise ChannelNotFoundError(f"チャンネル '{name}' が見つかりません")
+
+        return channel
+
+    async def create_channel(
+        self,
+        name: str,
+        description: str = "",
+        type: str = "text"
+    ) -> Channel:
+        """
+        チャンネル作成
+
+        Args:
+            name: チャンネル名
+            description: チャンネル説明
+            type: チャンネルタイプ ("text", "voice", "forum")
+
+        Returns:
+            作成されたチャンネル
+        """
+        server = await self._require_server()
+        data = {
+            "name": name,
+            "description": description,
+            "type": type
+        }
+
+        response = await self._make_request(
+            "POST",
+            f"/servers/{server.id}/channels",
+            data=data
+        )
+
+        channel = Channel.from_dict(response)
+        # キャッシュ更新
+        self.channel_cache.add(channel)
+
+        return channel
+
+    async def delete_channel(self, channel_id: int) -> bool:
+        """
+        チャンネル削除
+
+        Args:
+            channel_id: チャンネルID
+
+        Returns:
+            削除成功フラグ
+        """
+        server = await self._require_server()
+        await self._make_request("DELETE", f"/servers/{server.id}/channels/{channel_id}")
+
+        # キャッシュから削除
+        self.channel_cache.remove(channel_id)
+
+        return True
+
+    # メッセージ操作
+    async def send_message(
+        self,
+        channel_id: int,
+        content: str,
+        embeds: List[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Message:
+        """
+        メッセージ送信
+
+        Args:
+            channel_id: チャンネルID
+            content: メッセージ内容
+            embeds: 埋め込みコンテンツ
+            idempotency_key: 冪等キー（指定すると通信エラー時も二重投稿せずに再試行可能）
+
+        Returns:
+            送信されたメッセージ
+        """
+        server = await self._require_server()
+        data = {
+            "content": content
+        }
+        if embeds:
+            data["embeds"] = embeds
+
+        response = await self._make_request(
+            "POST",
+            f"/servers/{server.id}/channels/{channel_id}/messages",
+            data=data,
+            idempotency_key=idempotency_key
+        )
+
+        return Message.from_dict(response, self.identity_map)
+
+    async def get_messages(
+        self,
+        channel_id: int,
+        limit: int = 50,
+        before: Optional[int] = None,
+        after: Optional[int] = None
+    ) -> List[Message]:
+        """
+        メッセージ履歴取得
+
+        Args:
+            channel_id: チャンネルID
+            limit: 取得件数
+            before: 指定メッセージより前
+            after: 指定メッセージより後
+
+        Returns:
+            メッセージリスト
+        """
+        server = await self._require_server()
+        params = {"limit": limit}
+        if before:
+            params["before"] = before
+        if after:
+            params["after"] = after
+
+        return list(await self._fetch(
+            f"/servers/{server.id}/channels/{channel_id}/messages",
+            self._decode_messages,
+            params=params
+        ))
+
+    async def iter_messages(
+        self,
+        channel_id: int,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+        page_size: int = 100,
+        limit: Optional[int] = None,
+        prefetch: bool = True
+    ) -> AsyncIterator[Message]:
+        """
+        メッセージ履歴をページ単位で辿る非同期イテレーター
+
+        呼び出し元が現在のページを処理している間に、次のページをタスクとして先読みします。
+        メモリに保持するのは最大2ページです。
+
+        使用例:
+            async for msg in client.iter_messages(channel_id, limit=10000):
+                print(msg.content)
+
+        Args:
+            channel_id: チャンネルID
+            before: このIDより前のメッセージから取得（省略時は最新から）
+            after: このIDより後のメッセージまで取得（before 省略時は古い順に取得）
+            page_size: 1リクエストあたりの取得件数
+            limit: 取得する最大件数（Noneで全件）
+            prefetch: 次のページを先読みする
+
+        Yields:
+            メッセージ（after のみ指定時は古い順、それ以外は新しい順）
+        """
+        cursor = HistoryCursor(before=before, after=after, page_size=page_size, limit=limit)
+        if cursor.done:
+            return
+
+        pending = None
+        try:
+            page = await self.get_messages(channel_id, **cursor.params())
+            while True:
+                messages = cursor.advance(page)
+                if not cursor.done:
+                    params = cursor.params()
+                    if prefetch:
+                        pending = asyncio.ensure_future(self.get_messages(channel_id, **params))
+
+                for message in messages:
+                    yield message
+
+                if cursor.done:
+                    return
+                if pending is not None:
+                    page = await pending
+                    pending = None
+                else:
+                    page = await self.get_messages(channel_id, **params)
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+
+    async def get_message_batch(
+        self,
+        channel_id: int,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+        page_size: int = 100,
+        limit: Optional[int] = None
+    ) -> MessageBatch:
+        """
+        メッセージ履歴を列指向の MessageBatch として取得
+
+        iter_messages と同じカーソルで履歴を辿りますが、各ページを Message に変換せず
+        API のデータから直接バッチに追加します。大量の履歴の集計・分析向けです。
+
+        使用例:
+            batch = await client.get_message_batch(channel_id, limit=100000)
+            print(batch.count_by_author(by="name"))
+
+        Args:
+            channel_id: チャンネルID
+            before: このIDより前のメッセージから取得（省略時は最新から）
+            after: このIDより後のメッセージまで取得（before 省略時は古い順に取得）
+            page_size: 1リクエストあたりの取得件数
+            limit: 取得する最大件数（Noneで全件）
+
+        Returns:
+            MessageBatch（after のみ指定時は古い順、それ以外は新しい順）
+        """
+        cursor = HistoryCursor(before=before, after=after, page_size=page_size, limit=limit)
+        batch = MessageBatch()
+        if cursor.done:
+            return batch
+
+        server = await self._require_server()
+        endpoint = f"/servers/{server.id}/channels/{channel_id}/messages"
+        while not cursor.done:
+            page = await self._fetch(endpoint, list, params=cursor.params())
+            batch.extend(cursor.advance(page, key=_raw_message_id))
+        return batch
+
+    async def iter_channel_histories(
+        self,
+        channel_ids: Iterable[int],
+        limit: Optional[int] = 100,
+        page_size: int = 100,
+        concurrency: int = 8,
+        return_exceptions: bool = False
+    ) -> AsyncIterator[Tuple[int, Union[List[Message], Exception]]]:
+        """
+        複数チャンネルの履歴を並列に取得し、完了した順に返す
+
+        チャンネルごとにタスクを作成し、セマフォで同時実行数を制限します。
+        リクエストはすべてクライアントのレートリミッターを通ります。
+
+        使用例:
+            async for channel_id, messages in client.iter_channel_histories([1, 2, 3]):
+                print(channel_id, len(messages))
+
+        Args:
+            channel_ids: チャンネルIDのリスト
+            limit: チャンネルごとの最大取得件数（Noneで全件）
+            page_size: 1リクエストあたりの取得件数
+            concurrency: 同時に取得するチャンネル数
+            return_exceptions: True の場合、失敗したチャンネルは例外を結果として返す
+                               （False の場合は最初の例外を送出）
+
+        Yields:
+            (チャンネルID, メッセージリスト または 例外)
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(channel_id: int):
+            async with semaphore:
+                try:
+                    messages = [
+                        message async for message in self.iter_messages(
+                            channel_id, limit=limit, page_size=page_size, prefetch=False
+                        )
+                    ]
+                except Exception as e:
+                    return channel_id, e
+                return channel_id, messages
+
+        tasks = [asyncio.ensure_future(fetch(channel_id)) for channel_id in channel_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                channel_id, result = await next_done
+                if isinstance(result, Exception) and not return_exceptions:
+                    raise result
+                yield channel_id, result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # ファイル操作
+    async def send_file(
+        self,
+        channel_id: int,
+        file_path: str,
+        message: str = "",
+        progress: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
+        resumable: Optional[bool] = None,
+        chunk_size: int = DEFAULT_RESUMABLE_CHUNK_SIZE,
+        upload_id: Optional[str] = None
+    ) -> Message:
+        """
+        ファイル送信
+
+        ファイルはチャンクごとに読み込みながらストリーミング送信するため、
+        ファイルサイズに関係なくメモリ使用量は一定です。
+
+        Args:
+            channel_id: チャンネルID
+            file_path: ファイルパス
+            message: 追加メッセージ
+            progress: 進捗コールバック（送信済みバイト数, ファイルサイズ）
+            timeout: アップロードリクエストのタイムアウト秒数（省略時はクライアントの timeout）
+            resumable: チャンク単位で再開できるアップロードを使う。None の場合は
+                chunk_size 以上のファイルでサーバーが対応していれば使用
+            chunk_size: 再開可能アップロードのチャンクサイズ
+            upload_id: 失敗したアップロード（UploadError.upload_id）を再開する場合のID
+
+        Returns:
+            送信されたメッセージ
+
+        Raises:
+            UploadError: 再開可能アップロードが途中で失敗した
+        """
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
+
+        server = await self._require_server()
+
+        if resumable is None:
+            resumable = upload_id is not None or (
+                self._resumable_uploads is not False and os.path.getsize(file_path) >= chunk_size
+            )
+        if resumable and os.path.getsize(file_path) > 0:
+            upload = ResumableUpload(file_path, message, chunk_size, progress, upload_id)
+            response = await self._send_file_resumable(server.id, channel_id, upload, timeout)
+            if response is not None:
+                return Message.from_dict(response, self.identity_map)
+
+        fields = {"message": message} if message else None
+        body = MultipartFileStream(file_path, fields=fields, progress=progress)
+        response = await self._make_request(
+            "POST",
+            f"/servers/{server.id}/channels/{channel_id}/files",
+            body=body,
+            timeout=timeout
+        )
+
+        return Message.from_dict(response, self.identity_map)
+
+    async def _send_file_resumable(
+        self,
+        server_id: int,
+        channel_id: int,
+        upload: ResumableUpload,
+        timeout: Optional[float] = None,
+        max_resumes: int = 5
+    ) -> Optional[Dict[str, Any]]:
+        """
+        チャンク単位の再開可能アップロード
+
+        チャンクの送信に失敗した場合はサーバーが受信済みの位置を問い合わせ、そこから再開します。
+
+        Returns:
+            送信されたメッセージ（サーバーが非対応なら None）
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            if upload.upload_id is None:
+                status = await self._make_request(
+                    "POST", ResumableUpload.create_endpoint(server_id, channel_id),
+                    data=upload.create_payload(), timeout=timeout
+                )
+                upload.begin(status)
+            else:
+                status = await self._make_request("GET", upload.session_endpoint(server_id), timeout=timeout)
+                upload.sync(status)
+        except JanusAPIError as e:
+            if not _upload_unsupported(e):
+                raise
+            if self.debug:
+                print("[Janus SDK] サーバーが再開可能アップロードに非対応のため通常の送信に切り替えます")
+            self._resumable_uploads = False
+            return None
+        self._resumable_uploads = True
+
+        resumes = 0
+        with open(upload.file_path, "rb") as f:
+            while True:
+                if upload.done:
+                    # 最後のチャンクの応答を受け取る前に切断された
+                    return upload.completed(status)
+                chunk, headers = await loop.run_in_executor(None, upload.read_chunk, f)
+                try:
+                    response = await self._make_request(
+                        "PUT", upload.session_endpoint(server_id),
+                        body=chunk, headers=headers, timeout=timeout
+                    )
+                except (ConnectionError, JanusAPIError) as e:
+                    # 409 / 416 は offset の不一致、それ以外は通信エラーのみ再開を試みる
+                    resumable_error = isinstance(e, ConnectionError) or e.status_code in (409, 416)
+                    if not resumable_error or resumes >= max_resumes:
+                        raise UploadError(
+                            f"アップロードに失敗しました ({upload.offset}/{upload.size} バイト送信済み)",
+                            upload.upload_id, upload.offset
+                        ) from e
+                    resumes += 1
+                    if self.debug:
+                        print(f"[Janus SDK] アップロード中断: {upload.offset}/{upload.size} から再開します")
+                    try:
+                        status = await self._make_request("GET", upload.session_endpoint(server_id), timeout=timeout)
+                        upload.sync(status)
+                    except JanusAPIError as sync_error:
+                        raise UploadError(
+                            "アップロードの再開位置を取得できません", upload.upload_id, upload.offset
+                        ) from sync_error
+                    continue
+                result = upload.advance(response, len(chunk))
+                if result is not None:
+                    return result
+
+    async def send_image(
+        self,
+        channel_id: int,
+        image_path: str,
+        message: str = ""
+    ) -> Message:
+        """
+        画像送信
+
+        Args:
+            channel_id: チャンネルID
+            image_path: 画像ファイルパス
+            message: 追加メッセージ
+
+        Returns:
+            送信されたメッセージ
+        """
+        return await self.send_file(channel_id, image_path, message)
+
+    async def send_files(
+        self,
+        channel_id: int,
+        paths: Iterable[str],
+        message: str = "",
+        concurrency: int = 4,
+        progress: Optional[BatchProgressCallback] = None,
+        timeout: Optional[float] = None
+    ) -> List[UploadResult]:
+        """
+        複数ファイルを並列に送信
+
+        ファイルごとにタスクを作成し、セマフォで同時実行数を制限します。各ファイルはディスクから
+        ストリーミング送信され、リクエストはすべてクライアントのレートリミッターを通ります。
+        一部のファイルが失敗しても残りの送信は続行します。
+
+        使用例:
+            results = await client.send_files(channel_id, glob.glob("logs/*.log"), concurrency=4)
+            failed = [r for r in results if not r.ok]
+
+        Args:
+            channel_id: チャンネルID
+            paths: ファイルパスのリスト
+            message: 各ファイルに付ける追加メッセージ
+            concurrency: 同時に送信するファイル数
+            progress: 進捗コールバック（ファイルパス, 送信済みバイト数, ファイルサイズ）
+            timeout: 各アップロードリクエストのタイムアウト秒数
+
+        Returns:
+            paths と同じ順序の UploadResult リスト
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upload(path: str) -> UploadResult:
+            file_progress = None
+            if progress:
+                file_progress = lambda sent, total: progress(path, sent, total)
+            async with semaphore:
+                try:
+                    sent = await self.send_file(channel_id, path, message, progress=file_progress, timeout=timeout)
+                except Exception as e:
+                    if self.debug:
+                        print(f"[Janus SDK] ファイル送信エラー ({path}): {e}")
+                    return UploadResult(path, error=e)
+                return UploadResult(path, message=sent)
+
+        return list(await asyncio.gather(*(upload(path) for path in paths)))
+
+    # 添付ファイル
+    async def download_attachment(
+        self,
+        attachment: Attachment,
+        dest: Optional[str] = None,
+        segments: int = 1,
+        progress: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True
+    ) -> str:
+        """
+        添付ファイルをダウンロード
+
+        ディスクにストリーミングで書き込み、通信が途切れた場合は Range リクエストで続きから再開します。
+        attachment_cache が有効な場合は添付ファイルIDでキャッシュし、2回目以降はダウンロードしません。
+
+        Args:
+            attachment: 添付ファイル
+            dest: 保存先のパス（省略時はキャッシュ内のパス、キャッシュ無効ならカレントディレクトリ）
+            segments: 大きなファイルを分割して並列にダウンロードする数（サーバーが Range 非対応なら1本で取得）
+            progress: 進捗コールバック（受信済みバイト数, ファイルサイズ）
+            timeout: 各リクエストのタイムアウト秒数（省略時はクライアントの timeout）
+            use_cache: attachment_cache を使う
+
+        Returns:
+            ダウンロードしたファイルのパス
+        """
+        loop = asyncio.get_running_loop()
+        cache = self.attachment_cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(attachment.id)
+            if cached is not None:
+                return await loop.run_in_executor(None, _deliver, cached, dest)
+            part = cache.partial_path(attachment.id)
+        else:
+            dest = _download_target(attachment, dest)
+            part = dest + ".part"
+
+        url = urljoin(self.host + "/", attachment.url)
+        size = attachment.size or None
+        received = [0]
+
+        def on_bytes(n: int):
+            received[0] += n
+            if progress:
+                progress(received[0], size or received[0])
+
+        ranges = plan_segments(size, segments) if size and segments > 1 else []
+        if len(ranges) < 2 or not await self._download_segments(url, part, size, ranges, on_bytes, timeout):
+            received[0] = os.path.getsize(part) if os.path.exists(part) else 0
+            await self._download_range(url, part, None, size, on_bytes, timeout)
+
+        if cache is not None:
+            # ハッシュ計算とファイル移動はイベントループを塞がないようスレッドで実行
+            path = await loop.run_in_executor(None, cache.put, attachment.id, part)
+            return await loop.run_in_executor(None, _deliver, path, dest)
+        os.replace(part, dest)
+        return dest
+
+    def _get_download_session(self, url: str) -> "aiohttp.ClientSession":
+        """API サーバー以外のホストには認証ヘッダーを付けないセッションを使う"""
+        if self._parent is not None:
+            return self._parent._get_download_session(url)
+        session = self._get_session()
+        if urlparse(url).netloc == urlparse(self.host).netloc:
+            return session
+        if self._public_session is None or self._public_session.closed:
+            self._public_session = aiohttp.ClientSession(
+                connector=session.connector,
+                connector_owner=False,
+                headers={"User-Agent": self.user_agent},
+                timeout=_client_timeout(self.timeout)
+            )
+        return self._public_session
+
+    async def _download_segments(
+        self,
+        url: str,
+        part: str,
+        size: int,
+        ranges: List[Tuple[int, int]],
+        on_bytes: Callable[[int], None],
+        timeout: Optional[float]
+    ) -> bool:
+        """
+        範囲ごとにタスクを分けて並列ダウンロード
+
+        Returns:
+            成功した場合 True（サーバーが Range 非対応なら False）
+        """
+        segmented = part + ".segments"
+        with open(segmented, "wb") as f:
+            f.truncate(size)
+        tasks = [
+            asyncio.ensure_future(self._download_range(url, segmented, start, size, on_bytes, timeout, end))
+            for start, end in ranges
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except RangeNotSupported:
+            if self.debug:
+                print("[Janus SDK] サーバーが Range リクエストに非対応のため1本でダウンロードします")
+            await asyncio.gather(*tasks, return_exceptions=True)
+            os.remove(segmented)
+            return False
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            os.remove(segmented)
+            raise
+        os.replace(segmented, part)
+        return True
+
+    async def _download_range(
+        self,
+        url: str,
+        path: str,
+        start: Optional[int],
+        size: Optional[int],
+        on_bytes: Callable[[int], None],
+        timeout: Optional[float],
+        end: Optional[int] = None
+    ):
+        """
+        url の内容を path に書き込む（通信が途切れたら受信済みの位置から Range で再開）
+
+        Args:
+            url: ダウンロードURL
+            path: 書き込み先ファイル
+            start: 書き込み開始位置（None の場合は path の末尾から再開し、最後まで取得）
+            size: ファイル全体のサイズ（不明なら None）
+            on_bytes: 受信したバイト数を通知するコールバック
+            timeout: 各リクエストのタイムアウト秒数
+            end: 取得する範囲の終了位置（含む）。指定時はサーバーが 206 を返さなければ RangeNotSupported
+        """
+        segment = end is not None
+        if start is None:
+            if not os.path.exists(path):
+                open(path, "wb").close()
+            start = os.path.getsize(path)
+        position = start
+        session = self._get_download_session(url)
+        same_host = session is self._get_session()
+        policy = self.retry_policy
+        started = time.monotonic()
+        delay = 0.0
+        attempt = 0
+
+        while True:
+            if (segment and position > end) or (not segment and size is not None and position >= size):
+                return
+            headers = {}
+            if position > 0 or segment:
+                headers["Range"] = range_header(position, end)
+            if same_host:
+                await self._check_rate_limit()
+            kwargs = {"headers": headers}
+            if timeout is not None:
+                kwargs["timeout"] = _client_timeout(timeout)
+            try:
+                if self.debug:
+                    print(f"[Janus SDK] GET {url} Range={headers.get('Range')}")
+                async with session.get(url, **kwargs) as response:
+                    if response.status == 416 and not segment and position > 0:
+                        # 受信済みのファイルが既に完全
+                        return
+                    if policy.is_retryable_status(response.status):
+                        retry_delay = policy.backoff("GET", attempt, started, delay, f"status_{response.status}")
+                        if retry_delay is not None:
+                            delay = retry_delay
+                            attempt += 1
+                            await asyncio.sleep(delay)
+                            continue
+                    _raise_for_status(response.status, response.headers, lambda: {})
+
+                    if "Range" in headers and response.status != 206:
+                        if segment:
+                            raise RangeNotSupported(url)
+                        # Range を無視して全体が返ってきたので最初から書き直す
+                        on_bytes(-position)
+                        position = 0
+                        open(path, "wb").close()
+                    if size is None:
+                        content_range = parse_content_range(response.headers.get("Content-Range"))
+                        if content_range is not None:
+                            size = content_range[2]
+                        elif response.content_length is not None:
+                            size = position + response.content_length
+
+                    # ディスクへの書き込みはスレッドで行い、書き込み中に次のチャンクを受信する
+                    # （並列の分割ダウンロードでもイベントループを塞がない）
+                    loop = asyncio.get_running_loop()
+                    f = await loop.run_in_executor(None, _open_at, path, position)
+                    writing = None
+                    try:
+                        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            if segment:
+                                chunk = chunk[:end + 1 - position]
+                            if writing is not None:
+                                await writing
+                            writing = loop.run_in_executor(None, f.write, chunk)
+                            position += len(chunk)
+                            on_bytes(len(chunk))
+                            if segment and position > end:
+                                break
+                        if writing is not None:
+                            await writing
+                    finally:
+                        if writing is not None and not writing.done():
+                            await asyncio.wait({writing})
+                        await loop.run_in_executor(None, f.close)
+
+                    expected = end + 1 if segment else size
+                    if expected is not None and position < expected:
+                        raise aiohttp.ClientPayloadError(f"受信が途中で終了しました ({position}/{expected})")
+                    return
+
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                timed_out = isinstance(e, asyncio.TimeoutError)
+                retry_delay = policy.backoff(
+                    "GET", attempt, started, delay,
+                    "timeout" if timed_out else "connection",
+                    request_sent=not isinstance(e, aiohttp.ClientConnectorError)
+                )
+                if retry_delay is None:
+                    if timed_out:
+                        raise ConnectionError("ダウンロードがタイムアウトしました") from e
+                    raise ConnectionError(f"ダウンロードが中断されました: {url}") from e
+                delay = retry_delay
+                attempt += 1
+                if self.debug:
+                    print(f"[Janus SDK] ダウンロード中断 ({position} バイト受信済み): {delay:.2f}秒後に再開")
+                await asyncio.sleep(delay)
+
+    # ユーザー・メンバー操作
+    async def get_user_profile(self, user_id: str) -> User:
+        """
+        UserProfile（表示名・アイコン）を取得
+
+        Args:
+            user_id: Auth0 ID
+
+        Returns:
+            User（display_name, avatar_url含む）
+        """
+        user = self.user_cache.get(user_id)
+        if user is None:
+            user = await self._fetch("/users/profile", self._decode_user, params={"auth0_id": user_id})
+            self.user_cache.set(user_id, user)
+        return user
+
+    async def get_members(self) -> List[Member]:
+        """
+        サーバーメンバー一覧取得（メンバーディレクトリも更新）
+
+        Returns:
+            メンバーリスト
+        """
+        server = await self._require_server()
+        members = list(await self._fetch(f"/servers/{server.id}/members", self._decode_members))
+        self.member_directory.replace(members)
+        await self._save_snapshot("members", members)
+        return members
+
+    async def get_member_directory(self) -> MemberDirectory:
+        """
+        メンバーディレクトリを取得（未読み込み・TTL 切れの場合のみメンバー一覧を再取得）
+
+        Returns:
+            MemberDirectory
+        """
+        directory = self.member_directory
+        if directory.stale:
+            if self._members_lock is None:
+                self._members_lock = asyncio.Lock()
+            async with self._members_lock:
+                if directory.stale:
+                    await self.get_members()
+        return directory
+
+    async def get_user(self, user_id: str) -> User:
+        """
+        ユーザー情報取得
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            ユーザー情報
+        """
+        member = (await self.get_member_directory()).get(user_id)
+        if member is None:
+            raise UserNotFoundError(f"ユーザー ID {user_id} が見つかりません")
+        return member.user
+
+    async def get_online_members(self) -> List[Member]:
+        """
+        オンラインメンバー取得
+
+        ステータスはメンバーディレクトリの読み込み時点のものです（最大 member_ttl 秒前）。
+
+        Returns:
+            オンラインメンバーリスト
+        """
+        return (await self.get_member_directory()).online()
+
+    # 権限管理
+    async def has_permission(self, user_id: str, permission: str, channel_id: int = None) -> bool:
+        """
+        権限チェック
+
+        Args:
+            user_id: ユーザーID
+            permission: 権限名
+            channel_id: チャンネルID (チャンネル固有権限の場合)
+
+        Returns:
+            権限有無
+        """
+        try:
+            return (await self.get_member_directory()).has_permission(user_id, permission)
+        except Exception:
+            return False
+
+    async def is_admin(self, user_id: str) -> bool:
+        """
+        管理者権限チェック
+
+        Args:
+            user_id: ユーザーID
+
+        Returns:
+            管理者権限有無
+        """
+        try:
+            return (await self.get_member_directory()).is_admin(user_id)
+        except Exception:
+            return False
+
+    # イベント処理
+    def event(self, func: Callable):
+        """
+        イベントハンドラーデコレータ
+
+        使用例:
+            @client.event
+            async def on_message(message):
+                print(f"新しいメッセージ: {message.content}")
+        """
+        event_name = func.__name__
+        self._event_handlers[event_name] = func
+        return func
+
+    async def _handle_websocket_message(self, message: str):
+        """WebSocketメッセージハンドラー"""
+        try:
+            data = self.json_codec.loads(message)
+            event_type = data.get("type")
+
+            if event_type == "message" and "on_message" in self._event_handlers:
+                message_obj = self._message_type.from_dict(data.get("data", {}), self.identity_map)
+                await self._event_handlers["on_message"](message_obj)
+            elif event_type == "member_join":
+                member_obj = Member.from_dict(data.get("data", {}), self.identity_map)
+                self.member_directory.add(member_obj)
+                self.user_cache.invalidate(member_obj.user.id)
+                if "on_member_join" in self._event_handlers:
+                    await self._event_handlers["on_member_join"](member_obj)
+            elif event_type == "member_leave":
+                member_data = data.get("data", {})
+                self.member_directory.remove(member_data.get("user", {}).get("id") or member_data.get("user_id"))
+            elif event_type == "channel_create":
+                channel_obj = Channel.from_dict(data.get("data", {}))
+                self.channel_cache.add(channel_obj)
+                if "on_channel_create" in self._event_handlers:
+                    await self._event_handlers["on_channel_create"](channel_obj)
+            elif event_type == "channel_update":
+                self.channel_cache.add(Channel.from_dict(data.get("data", {})))
+            elif event_type == "channel_delete":
+                channel_data = data.get("data", {})
+                self.channel_cache.remove(channel_data.get("id") or channel_data.get("channel_id"))
+            elif event_type == "user_update":
+                user_data = data.get("data", {})
+                self.user_cache.invalidate(user_data.get("id"))
+                if self.identity_map is not None:
+                    self.identity_map.refresh(user_data)
+
+        except Exception as e:
+            if self.debug:
+                print(f"[Janus SDK] WebSocketメッセージ処理エラー: {e}")
+
+    async def start(self):
+        """
+        WebSocket接続を開始してリアルタイムイベントを受信
+
+        既に動いているイベントループ上で `await client.start()` として利用します。
+        for_server で作成した他のサーバーのクライアントも同時に受信します。
+        """
+        await self.connect()
+        # 初期化前に for_server で自身のサーバーを指定した場合は子クライアントができているので、
+        # 同じサーバーの WebSocket を重複して開かないよう外す
+        self._children.pop(self._server_info.id, None)
+        clients = [self, *self._children.values()]
+        for client in clients[1:]:
+            await client.connect()
+        await asyncio.gather(*(client._websocket_connection() for client in clients))
+
+    async def _websocket_connection(self):
+        """WebSocket接続処理"""
+        if not _WEBSOCKETS_AVAILABLE:
+            if self.debug:
+                print("[Janus SDK] websockets ライブラリが見つかりません。WebSocketは無効化されます。")
+            return
+
+        # WebSocket URL構築
+        ws_url = self.host.replace("http://", "ws://").replace("https://", "wss://")
+        ws_url += f"/ws/servers/{self._server_info.id}?token={self.token}"
+
+        self._running = True
+        while self._running:
+            try:
+                if self.debug:
+                    print(f"[Janus SDK] WebSocket接続中: {ws_url}")
+
+                async with websockets.connect(ws_url) as websocket:
+                    self._ws = websocket
+
+                    # 準備完了イベント
+                    if "on_ready" in self._event_handlers:
+                        await self._event_handlers["on_ready"]()
+
+                    # メッセージ受信ループ
+                    async for message in websocket:
+                        await self._handle_websocket_message(message)
+
+            except Exception as e:
+                if self.debug:
+                    print(f"[Janus SDK] WebSocket エラー: {e}")
+
+                if self.auto_reconnect and self._running:
+                    await asyncio.sleep(5)  # 5秒後に再接続
+                else:
+                    break
+
+    def run(self):
+        """
+        イベントループ開始
+
+        新しいイベントループで `start()` を実行し、終了時にセッションを閉じます。
+        """
+        async def runner():
+            try:
+                await self.start()
+            finally:
+                await self.close()
+
+        try:
+            asyncio.run(runner())
+        except KeyboardInterrupt:
+            if self.debug:
+                print("[Janus SDK] 中断されました")
+        finally:
+            self._running = False
+
+    # プロパティ
+    @property
+    def server(self) -> Optional[Server]:
+        """接続中のサーバー情報（connect 前は None）"""
+        return self._server_info
+
+    @property
+    def retry_stats(self) -> Dict[str, Any]:
+        """再試行の統計（リクエスト数・再試行回数・理由別内訳）"""
+        return self.retry_policy.stats.as_dict()
+
+    @property
+    def cache_stats(self) -> Dict[str, Any]:
+        """チャンネル・ユーザープロフィールのキャッシュ統計（ヒット率・破棄数など）"""
+        return {"channels": self.channel_cache.stats(), "users": self.user_cache.stats()}
+
+    def __repr__(self):
+        return f"<AsyncClient host='{self.host}' server='{self._server_info.name if self._server_info else 'Unknown'}'>"
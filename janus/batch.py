@@ -0,0 +1,429 @@
+"""
+Janus SDK 列指向のメッセージバッチ
+
+メッセージ履歴を Message オブジェクトのリストではなく、列ごとの配列として保持します。
+
+- id / channel_id: int64 配列
+- timestamp: UNIX 時間（秒、float64 配列。不明な場合は NaN）
+- author: 投稿者ごとのコード（int32 配列）と、コード → ユーザーID・表示名の辞書
+- content: UTF-8 のバイト列を1つのバッファに連結し、各メッセージの開始位置（int64 配列）で区切る
+
+API のレスポンス（辞書）から Message を作らずに直接追加でき、フィルター・集計は配列全体に対して行います。
+numpy / pyarrow がインストールされていれば to_numpy() / to_arrow() でコピーをほとんど行わずに変換できます
+（pip install janus-sdk[analytics]）。添付ファイル・埋め込みは保持しません。
+
+使用例:
+    batch = client.get_message_batch(channel_id, limit=1_000_000)
+    alice = batch.filter(batch.author_mask(display_name="Alice"))
+    print(alice.count_by_day())
+    table = batch.to_arrow()
+"""
+
+import math
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import compress
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .models import Message, User
+from .timestamps import parse_epoch_us, to_epoch_us
+
+try:
+    import numpy as np
+    _NUMPY_AVAILABLE = True
+except Exception:
+    np = None
+    _NUMPY_AVAILABLE = False
+try:
+    import pyarrow as pa
+    _PYARROW_AVAILABLE = True
+except Exception:
+    pa = None
+    _PYARROW_AVAILABLE = False
+
+
+def _epoch(value: Any) -> float:
+    """ISO 8601 文字列を UNIX 時間に変換（タイムゾーンなしは UTC とみなす）"""
+    if not value or not isinstance(value, str):
+        return math.nan
+    return parse_epoch_us(value, memoize=False) / 1e6
+
+
+def _to_epoch(value: Optional[datetime]) -> float:
+    if value is None:
+        return math.nan
+    return to_epoch_us(value) / 1e6
+
+
+class MessageBatch:
+    """
+    列指向のメッセージ集合
+
+    行の追加は extend / append_dict / append_message、行の選択は filter / take で行い、
+    選択結果は新しい MessageBatch として返します（元のバッチは変更しません）。
+    """
+
+    def __init__(self):
+        self.ids = array("q")
+        self.channel_ids = array("q")
+        self.timestamps = array("d")
+        self.author_codes = array("i")
+        self.content_offsets = array("q", [0])
+        self.content_buffer = bytearray()
+        # 投稿者の辞書（コード → ユーザーID・表示名）
+        self.author_ids: List[str] = []
+        self.author_names: List[str] = []
+        self._author_index: Dict[str, int] = {}
+        self._authors: Dict[int, User] = {}
+
+    # 追加
+    def _author_code(self, user_id: str, display_name: Optional[str]) -> int:
+        code = self._author_index.get(user_id)
+        if code is None:
+            code = len(self.author_ids)
+            self._author_index[user_id] = code
+            self.author_ids.append(user_id)
+            self.author_names.append(display_name or user_id)
+        elif display_name and display_name != self.author_names[code]:
+            # 新しいデータの表示名を優先
+            self.author_names[code] = display_name
+            self._authors.pop(code, None)
+        return code
+
+    def _append(self, message_id: int, channel_id: int, timestamp: float, author_code: int, content: str):
+        self.ids.append(message_id)
+        self.channel_ids.append(channel_id)
+        self.timestamps.append(timestamp)
+        self.author_codes.append(author_code)
+        self.content_buffer += content.encode("utf-8")
+        self.content_offsets.append(len(self.content_buffer))
+
+    def append_dict(self, data: Dict[str, Any]):
+        """API のメッセージデータ（辞書）を1件追加"""
+        author = data.get("author", {})
+        if isinstance(author, dict):
+            user_id = author.get("id", "")
+            code = self._author_code(user_id, author.get("display_name") or author.get("name"))
+        else:
+            user_id = author if isinstance(author, str) else "unknown"
+            code = self._author_code(user_id, None)
+        self._append(
+            data.get("id", 0),
+            data.get("channel_id") or data.get("channelId", 0),
+            _epoch(data.get("timestamp") or data.get("createdAt")),
+            code,
+            data.get("content") or ""
+        )
+
+    def append_message(self, message: Message):
+        """Message を1件追加"""
+        author = message.author
+        code = self._author_code(author.id, author.display_name or author.name)
+        self._append(message.id, message.channel_id, _to_epoch(message.timestamp), code, message.content or "")
+
+    def extend(self, page: Iterable[Any]):
+        """メッセージデータ（辞書）または Message をまとめて追加"""
+        for item in page:
+            if isinstance(item, dict):
+                self.append_dict(item)
+            else:
+                self.append_message(item)
+
+    @classmethod
+    def from_dicts(cls, page: Iterable[Dict[str, Any]]) -> "MessageBatch":
+        """API のメッセージデータから作成"""
+        batch = cls()
+        batch.extend(page)
+        return batch
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[Message]) -> "MessageBatch":
+        """Message のリストから作成"""
+        batch = cls()
+        batch.extend(messages)
+        return batch
+
+    @classmethod
+    def concat(cls, batches: Iterable["MessageBatch"]) -> "MessageBatch":
+        """複数のバッチを連結（チャンネルごとに取得したバッチをまとめるなど）"""
+        result = cls()
+        for batch in batches:
+            codes = [result._author_code(user_id, name) for user_id, name in zip(batch.author_ids, batch.author_names)]
+            base = len(result.content_buffer)
+            result.ids.extend(batch.ids)
+            result.channel_ids.extend(batch.channel_ids)
+            result.timestamps.extend(batch.timestamps)
+            result.author_codes.extend(codes[code] for code in batch.author_codes)
+            result.content_buffer += batch.content_buffer
+            result.content_offsets.extend(base + offset for offset in batch.content_offsets[1:])
+        return result
+
+    # 参照
+    def __len__(self):
+        return len(self.ids)
+
+    def content(self, index: int) -> str:
+        """index 行目の本文"""
+        start, end = self.content_offsets[index], self.content_offsets[index + 1]
+        return self.content_buffer[start:end].decode("utf-8")
+
+    def contents(self) -> Iterator[str]:
+        """本文を順に返す"""
+        buffer = memoryview(self.content_buffer)
+        offsets = self.content_offsets
+        for i in range(len(self.ids)):
+            yield str(buffer[offsets[i]:offsets[i + 1]], "utf-8")
+
+    def author(self, code: int) -> User:
+        """投稿者コードの User（コードごとに1インスタンスを共有）"""
+        user = self._authors.get(code)
+        if user is None:
+            user = User(id=self.author_ids[code], name=self.author_names[code], display_name=self.author_names[code])
+            self._authors[code] = user
+        return user
+
+    def message(self, index: int) -> Message:
+        """index 行目を Message に変換"""
+        timestamp = self.timestamps[index]
+        return Message(
+            id=self.ids[index],
+            channel_id=self.channel_ids[index],
+            author=self.author(self.author_codes[index]),
+            content=self.content(index),
+            timestamp=None if math.isnan(timestamp) else datetime.fromtimestamp(timestamp, timezone.utc)
+        )
+
+    def __getitem__(self, index: int) -> Message:
+        if index < 0:
+            index += len(self.ids)
+        if not 0 <= index < len(self.ids):
+            raise IndexError("MessageBatch index out of range")
+        return self.message(index)
+
+    def __iter__(self) -> Iterator[Message]:
+        for i in range(len(self.ids)):
+            yield self.message(i)
+
+    # 行の選択
+    def _with_authors(self) -> "MessageBatch":
+        """投稿者の辞書だけを引き継いだ空のバッチ"""
+        result = MessageBatch()
+        result.author_ids = list(self.author_ids)
+        result.author_names = list(self.author_names)
+        result._author_index = dict(self._author_index)
+        return result
+
+    def _select(self, rows: "np.ndarray", content: "np.ndarray", lengths: "np.ndarray") -> "MessageBatch":
+        """numpy で選択した行（rows）・本文のバイト列・各行の本文の長さからバッチを作成"""
+        result = self._with_authors()
+        for name in ("ids", "channel_ids", "timestamps", "author_codes"):
+            column = getattr(self, name)
+            getattr(result, name).frombytes(np.frombuffer(column, dtype=column.typecode)[rows].tobytes())
+        result.content_offsets.frombytes(np.cumsum(lengths, dtype=np.int64).tobytes())
+        result.content_buffer = bytearray(content.tobytes())
+        return result
+
+    def take(self, indices: Iterable[int]) -> "MessageBatch":
+        """指定した行だけを持つバッチを作成（投稿者の辞書は引き継ぐ）"""
+        if _NUMPY_AVAILABLE:
+            rows = np.asarray(indices if isinstance(indices, np.ndarray) else list(indices), dtype=np.int64)
+            count = len(self.ids)
+            if rows.size and (rows.min() < -count or rows.max() >= count):
+                raise IndexError("MessageBatch index out of range")
+            rows = np.where(rows < 0, rows + count, rows)
+            offsets = np.frombuffer(self.content_offsets, dtype=np.int64)
+            starts = offsets[rows]
+            lengths = offsets[rows + 1] - starts
+            ends = np.cumsum(lengths)
+            # 各行の本文を連結した位置 → 元のバッファ上の位置
+            positions = np.repeat(starts - (ends - lengths), lengths) + np.arange(ends[-1] if rows.size else 0)
+            return self._select(rows, np.frombuffer(self.content_buffer, dtype=np.uint8)[positions], lengths)
+
+        result = self._with_authors()
+        offsets = self.content_offsets
+        buffer = self.content_buffer
+        count = len(self.ids)
+        for i in indices:
+            i = int(i)
+            if not -count <= i < count:
+                raise IndexError("MessageBatch index out of range")
+            if i < 0:
+                i += count
+            result.ids.append(self.ids[i])
+            result.channel_ids.append(self.channel_ids[i])
+            result.timestamps.append(self.timestamps[i])
+            result.author_codes.append(self.author_codes[i])
+            result.content_buffer += buffer[offsets[i]:offsets[i + 1]]
+            result.content_offsets.append(len(result.content_buffer))
+        return result
+
+    def filter(self, mask: Sequence[bool]) -> "MessageBatch":
+        """
+        マスクが真の行だけを持つバッチを作成
+
+        Args:
+            mask: 行数と同じ長さの真偽値の列（author_mask / contains / time_mask の結果や numpy の bool 配列）
+        """
+        if _NUMPY_AVAILABLE:
+            mask = np.asarray(mask, dtype=bool)
+            if mask.shape != (len(self.ids),):
+                raise ValueError("マスクの長さが行数と一致しません")
+            lengths = np.diff(np.frombuffer(self.content_offsets, dtype=np.int64))
+            content = np.frombuffer(self.content_buffer, dtype=np.uint8)[np.repeat(mask, lengths)]
+            return self._select(np.flatnonzero(mask), content, lengths[mask])
+        return self.take(compress(range(len(self.ids)), mask))
+
+    # マスク
+    def _mask(self, codes: set, column: array) -> Sequence[bool]:
+        if _NUMPY_AVAILABLE:
+            return np.isin(np.frombuffer(column, dtype=np.int64 if column.typecode == "q" else np.int32), list(codes))
+        return [value in codes for value in column]
+
+    def author_mask(self, user_id: Optional[str] = None, display_name: Optional[str] = None) -> Sequence[bool]:
+        """
+        投稿者で絞り込むマスク
+
+        Args:
+            user_id: ユーザーID
+            display_name: 表示名（完全一致）
+        """
+        codes = set()
+        if user_id is not None and user_id in self._author_index:
+            codes.add(self._author_index[user_id])
+        if display_name is not None:
+            codes.update(code for code, name in enumerate(self.author_names) if name == display_name)
+        return self._mask(codes, self.author_codes)
+
+    def channel_mask(self, channel_ids: Iterable[int]) -> Sequence[bool]:
+        """チャンネルで絞り込むマスク"""
+        return self._mask(set(channel_ids), self.channel_ids)
+
+    def time_mask(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Sequence[bool]:
+        """
+        投稿日時で絞り込むマスク（start 以上 end 未満。タイムゾーンなしは UTC とみなす）
+        """
+        low = -math.inf if start is None else _to_epoch(start)
+        high = math.inf if end is None else _to_epoch(end)
+        if _NUMPY_AVAILABLE:
+            timestamps = np.frombuffer(self.timestamps, dtype=np.float64)
+            return (timestamps >= low) & (timestamps < high)
+        return [low <= ts < high for ts in self.timestamps]
+
+    def contains(self, text: str) -> Sequence[bool]:
+        """
+        本文に text を含む行のマスク（大文字小文字を区別）
+
+        各行を文字列に戻さず、連結したバッファを先頭から検索して一致位置を行に対応付けます。
+        """
+        needle = text.encode("utf-8")
+        if not needle:
+            return [True] * len(self.ids)
+        mask = [False] * len(self.ids)
+        buffer = self.content_buffer
+        offsets = self.content_offsets
+        position = buffer.find(needle)
+        while position != -1:
+            row = bisect_right(offsets, position) - 1
+            row_end = offsets[row + 1]
+            # 行の境界をまたぐ一致は数えない。どちらの場合も次の行の先頭から探し直す
+            if position + len(needle) <= row_end:
+                mask[row] = True
+            position = buffer.find(needle, row_end)
+        return mask
+
+    # 集計
+    def count_by_author(self, by: str = "id") -> Dict[str, int]:
+        """
+        投稿者ごとの件数
+
+        Args:
+            by: "id"（ユーザーID）または "name"（表示名）
+        """
+        names = self.author_ids if by == "id" else self.author_names
+        if _NUMPY_AVAILABLE:
+            codes = np.frombuffer(self.author_codes, dtype=np.int32)
+            per_code = enumerate(np.bincount(codes, minlength=len(names)).tolist())
+        else:
+            per_code = Counter(self.author_codes).items()
+        counts: Dict[str, int] = {}
+        for code, count in per_code:
+            if count:
+                counts[names[code]] = counts.get(names[code], 0) + count
+        return counts
+
+    def count_by_channel(self) -> Dict[int, int]:
+        """チャンネルごとの件数"""
+        if _NUMPY_AVAILABLE:
+            channels, counts = np.unique(np.frombuffer(self.channel_ids, dtype=np.int64), return_counts=True)
+            return dict(zip(channels.tolist(), counts.tolist()))
+        return dict(Counter(self.channel_ids))
+
+    def count_by_day(self) -> Dict[str, int]:
+        """日付（UTC、YYYY-MM-DD）ごとの件数（日時が不明な行は除外）"""
+        if _NUMPY_AVAILABLE:
+            timestamps = np.frombuffer(self.timestamps, dtype=np.float64)
+            days, counts = np.unique(
+                np.floor_divide(timestamps[~np.isnan(timestamps)], 86400).astype(np.int64), return_counts=True
+            )
+            per_day = zip(days.tolist(), counts.tolist())
+        else:
+            per_day = sorted(Counter(int(ts // 86400) for ts in self.timestamps if not math.isnan(ts)).items())
+        return {
+            datetime.fromtimestamp(day * 86400, timezone.utc).strftime("%Y-%m-%d"): count
+            for day, count in per_day
+        }
+
+    # エクスポート
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        numpy 配列に変換（数値列はバッファを共有）
+
+        返した配列を保持している間は、バッチに行を追加できません（BufferError）。
+
+        Returns:
+            {"id", "channel_id", "timestamp"(datetime64[us]), "author_code", "author_id", "author_name", "content"}
+        """
+        if not _NUMPY_AVAILABLE:
+            raise ImportError("to_numpy を利用するには numpy が必要です: pip install janus-sdk[analytics]")
+        timestamps = np.frombuffer(self.timestamps, dtype=np.float64)
+        micros = np.where(np.isnan(timestamps), np.iinfo(np.int64).min, np.round(timestamps * 1e6)).astype(np.int64)
+        return {
+            "id": np.frombuffer(self.ids, dtype=np.int64),
+            "channel_id": np.frombuffer(self.channel_ids, dtype=np.int64),
+            "timestamp": micros.view("datetime64[us]"),
+            "author_code": np.frombuffer(self.author_codes, dtype=np.int32),
+            "author_id": np.array(self.author_ids, dtype=object),
+            "author_name": np.array(self.author_names, dtype=object),
+            "content": np.array(list(self.contents()), dtype=object),
+        }
+
+    def to_arrow(self) -> "pa.Table":
+        """
+        pyarrow の Table に変換（本文はバッファと開始位置からそのまま作成）
+
+        列: id, channel_id, timestamp(timestamp[us, UTC]), author(dictionary), author_name(dictionary), content(large_string)
+        """
+        if not _PYARROW_AVAILABLE:
+            raise ImportError("to_arrow を利用するには pyarrow が必要です: pip install janus-sdk[analytics]")
+        count = len(self.ids)
+        timestamps = pa.array(
+            [None if math.isnan(ts) else int(round(ts * 1e6)) for ts in self.timestamps],
+            type=pa.int64()
+        ).cast(pa.timestamp("us", tz="UTC"))
+        codes = pa.array(self.author_codes, type=pa.int32())
+        content = pa.LargeStringArray.from_buffers(
+            count, pa.py_buffer(self.content_offsets), pa.py_buffer(bytes(self.content_buffer))
+        )
+        return pa.table({
+            "id": pa.array(self.ids, type=pa.int64()),
+            "channel_id": pa.array(self.channel_ids, type=pa.int64()),
+            "timestamp": timestamps,
+            "author": pa.DictionaryArray.from_arrays(codes, pa.array(self.author_ids, type=pa.string())),
+            "author_name": pa.DictionaryArray.from_arrays(codes, pa.array(self.author_names, type=pa.string())),
+            "content": content,
+        })
+
+    def __repr__(self):
+        return f"<MessageBatch messages={len(self.ids)} authors={len(self.author_ids)} bytes={len(self.content_buffer)}>"
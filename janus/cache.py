@@ -0,0 +1,305 @@
+"""
+Janus SDK キャッシュ
+
+エントリ数の上限（LRU）とエントリごとの有効期限（TTL）を持つ、スレッドセーフなキャッシュです。
+クライアントのチャンネル・ユーザープロフィールのキャッシュに使われ、
+WebSocket イベント（channel_create / channel_update / channel_delete など）で更新・無効化されます。
+
+使用例:
+    cache = TTLCache(maxsize=1024, ttl=300)
+    cache.set(channel.id, channel)
+    channel = cache.get(channel_id)
+    print(cache.stats())
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    LRU + TTL キャッシュ
+
+    - 上限を超えると最も長く使われていないエントリから破棄
+    - 期限切れのエントリは参照時に破棄（ヒットとして扱わない）
+    - ヒット・ミス・破棄の回数を記録
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: 最大エントリ数
+            ttl: 既定の有効期限（秒）。Noneで期限なし
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize は1以上である必要があります")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0     # 上限超過による破棄
+        self.expirations = 0   # 期限切れによる破棄
+
+    def _expired(self, expires_at: Optional[float], now: float) -> bool:
+        return expires_at is not None and now >= expires_at
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        値を取得（最近使用したものとして扱う）
+
+        Args:
+            key: キー
+            default: 見つからない・期限切れの場合の値
+
+        Returns:
+            キャッシュされた値
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if self._expired(expires_at, time.monotonic()):
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """統計と LRU の順序を変えずに値を取得"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING or self._expired(entry[1], time.monotonic()):
+                return default
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = _MISSING):
+        """
+        値を保存
+
+        Args:
+            key: キー
+            value: 値
+            ttl: このエントリの有効期限（秒）。省略時は既定の ttl、Noneで期限なし
+        """
+        if ttl is _MISSING:
+            ttl = self.ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def set_many(self, items: Iterable[Tuple[Hashable, Any]], ttl: Optional[float] = _MISSING):
+        """複数の値を保存"""
+        for key, value in items:
+            self.set(key, value, ttl)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """エントリを削除して値を返す"""
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[0]
+
+    def invalidate(self, key: Hashable = _MISSING):
+        """エントリを削除（key 省略時は全削除）"""
+        with self._lock:
+            if key is _MISSING:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """期限内のエントリ一覧（古い順）"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for key, (value, expires_at) in self._entries.items()
+                if not self._expired(expires_at, now)
+            ]
+
+    def values(self) -> List[Any]:
+        """期限内の値の一覧"""
+        return [value for _, value in self.items()]
+
+    def stats(self) -> Dict[str, Any]:
+        """統計情報"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return (
+            f"<TTLCache size={len(self._entries)}/{self.maxsize} ttl={self.ttl} "
+            f"hits={self.hits} misses={self.misses}>"
+        )
+
+
+class ChannelCache:
+    """
+    チャンネルのキャッシュ
+
+    ID ごとのエントリ（TTLCache）に加えて、最後に取得した一覧の ID と、
+    チャンネル名（大文字小文字を区別しない）→ ID の索引を保持します。
+    一覧が期限内かつ全エントリが残っていれば get_channels をネットワークなしで返し、
+    一覧に含まれない ID・名前は再取得せずに「存在しない」と判断できます。
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: 最大チャンネル数（サーバーのチャンネル数より大きくすること）
+            ttl: 有効期限（秒）。Noneで期限なし（イベントによる更新のみ）
+        """
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._listed_ids: Optional[Dict[int, None]] = None   # 一覧の ID（順序付き）
+        self._listed_at: Optional[float] = None
+        self._by_name: Dict[str, Dict[int, None]] = {}   # 名前（casefold）→ ID（順序付き）
+        self._names: Dict[int, str] = {}                 # ID → 索引に登録した名前
+
+    def _listing_fresh(self) -> bool:
+        if self._listed_ids is None:
+            return False
+        return self.ttl is None or time.monotonic() - self._listed_at < self.ttl
+
+    def replace(self, channels: Iterable[Any]):
+        """取得したチャンネル一覧でキャッシュを作り直す"""
+        channels = list(channels)
+        with self._lock:
+            self.entries.invalidate()
+            self.entries.set_many((channel.id, channel) for channel in channels)
+            self._listed_ids = dict.fromkeys(channel.id for channel in channels)
+            self._listed_at = time.monotonic()
+            self._by_name = {}
+            self._names = {}
+            for channel in channels:
+                self._index_name(channel)
+
+    def _index_name(self, channel: Any):
+        """名前の索引を更新（ロック内で呼び出す）"""
+        self._unindex_name(channel.id)
+        key = channel.name.casefold()
+        self._by_name.setdefault(key, {})[channel.id] = None
+        self._names[channel.id] = key
+
+    def _unindex_name(self, channel_id: int):
+        key = self._names.pop(channel_id, None)
+        if key is None:
+            return
+        ids = self._by_name.get(key)
+        if ids is not None:
+            ids.pop(channel_id, None)
+            if not ids:
+                del self._by_name[key]
+
+    def all(self) -> Optional[List[Any]]:
+        """
+        キャッシュされた一覧を取得
+
+        Returns:
+            チャンネル一覧（一覧が期限切れ、または一部が破棄されていれば None）
+        """
+        with self._lock:
+            if not self._listing_fresh():
+                return None
+            ids = list(self._listed_ids)
+        channels = [self.entries.peek(channel_id) for channel_id in ids]
+        if any(channel is None for channel in channels):
+            return None
+        return channels
+
+    def get(self, channel_id: int) -> Optional[Any]:
+        """ID でチャンネルを取得"""
+        return self.entries.get(channel_id)
+
+    def find_by_name(self, name: str, type: Optional[str] = None) -> Optional[Any]:
+        """
+        名前でチャンネルを取得（大文字小文字を区別しない。完全一致するものを優先）
+
+        Args:
+            name: チャンネル名
+            type: チャンネルタイプで絞り込む（"text", "voice", "forum"）
+
+        Returns:
+            チャンネル（見つからない・キャッシュから破棄されていれば None）
+        """
+        with self._lock:
+            ids = list(self._by_name.get(name.casefold(), ()))
+        found = None
+        for channel_id in ids:
+            channel = self.entries.peek(channel_id)
+            if channel is None or (type is not None and channel.type != type):
+                continue
+            if channel.name == name:
+                return channel
+            if found is None:
+                found = channel
+        return found
+
+    def known_missing(self, channel_id: int) -> bool:
+        """期限内の一覧に含まれていない（存在しないと判断できる）か"""
+        with self._lock:
+            return self._listing_fresh() and channel_id not in self._listed_ids
+
+    def add(self, channel: Any):
+        """チャンネルを追加・更新（作成・channel_create / channel_update イベント）"""
+        with self._lock:
+            self.entries.set(channel.id, channel)
+            self._index_name(channel)
+            if self._listed_ids is not None:
+                self._listed_ids[channel.id] = None
+
+    def remove(self, channel_id: int):
+        """チャンネルを削除（削除・channel_delete イベント）"""
+        with self._lock:
+            self.entries.pop(channel_id)
+            self._unindex_name(channel_id)
+            if self._listed_ids is not None:
+                self._listed_ids.pop(channel_id, None)
+
+    def invalidate(self):
+        """キャッシュをすべて破棄"""
+        with self._lock:
+            self.entries.invalidate()
+            self._listed_ids = None
+            self._listed_at = None
+            self._by_name = {}
+            self._names = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """統計情報"""
+        return self.entries.stats()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"<ChannelCache {self.entries!r}>"
@@ -3,7 +3,15 @@ Janus SDK メインクライアント
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from urllib3.exceptions import NewConnectionError
+import copy
+import os
+import shutil
+import random
 import time
+import threading
 import asyncio
 try:
     import websockets
@@ -11,11 +19,38 @@ try:
 except Exception:
     websockets = None
     _WEBSOCKETS_AVAILABLE = False
-import json
-from typing import List, Optional, Dict, Any, Callable, Union
+from typing import List, Optional, Dict, Any, Callable, Hashable, Iterable, Iterator, Tuple, Union
 from urllib.parse import urljoin, urlparse
 
-from .models import Channel, Message, User, Member, Server, Attachment
+from .ratelimit import RateLimiter, TokenBucket, RouteRateLimiter, route_key, parse_retry_after
+from .retry import RetryPolicy
+from .codec import JSONCodec, get_codec
+from .http_cache import ResponseCache
+from .pagination import HistoryCursor
+from .batch import MessageBatch
+from .dispatch import SendDispatcher, PRIORITY_NORMAL
+from .singleflight import SingleFlight
+from .upload import (
+    MultipartFileStream,
+    ResumableUpload,
+    UploadResult,
+    ProgressCallback,
+    BatchProgressCallback,
+    DEFAULT_RESUMABLE_CHUNK_SIZE
+)
+from .download import (
+    AttachmentCache,
+    RangeNotSupported,
+    DOWNLOAD_CHUNK_SIZE,
+    parse_content_range,
+    plan_segments,
+    range_header
+)
+from .cache import TTLCache, ChannelCache
+from .members import MemberDirectory
+from .snapshot import Snapshot
+from .identity import UserIdentityMap
+from .models import Channel, Message, LazyMessage, User, Member, Server, Attachment
 from .exceptions import (
     JanusAPIError,
     PermissionError,
@@ -25,10 +60,98 @@ from .exceptions import (
     ChannelNotFoundError,
     MessageNotFoundError,
     UserNotFoundError,
-    ConnectionError
+    ConnectionError,
+    UploadError
 )
 
 
+def _is_json(headers) -> bool:
+    """レスポンスヘッダーがJSONを示しているか"""
+    return headers.get("content-type", "").startswith("application/json")
+
+
+def _raise_for_status(status_code: int, headers, load_error_data: Callable[[], Any]):
+    """
+    HTTPステータスコードを SDK の例外に変換
+    
+    同期・非同期クライアントで共通のエラーマッピングです。
+    
+    Args:
+        status_code: HTTPステータスコード
+        headers: レスポンスヘッダー
+        load_error_data: エラー時のレスポンスボディを返す関数
+        
+    Raises:
+        JanusAPIError: API エラー
+    """
+    if status_code == 401:
+        raise InvalidTokenError("認証に失敗しました。トークンを確認してください")
+    elif status_code == 403:
+        raise PermissionError("この操作を実行する権限がありません")
+    elif status_code == 404:
+        raise ServerNotFoundError("指定されたリソースが見つかりません")
+    elif status_code == 429:
+        raise RateLimitError("レート制限に達しました", parse_retry_after(headers))
+    elif status_code >= 400:
+        raise JanusAPIError(
+            f"API エラー: {status_code}",
+            status_code,
+            load_error_data()
+        )
+
+
+def _is_connect_error(exc: Exception) -> bool:
+    """
+    接続確立前の失敗か（リクエストがサーバーに届いていないことが確実か）
+    """
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+def _parse_channels(response: List[Dict[str, Any]]) -> List[Channel]:
+    return [Channel.from_dict(ch) for ch in response]
+
+
+def _raw_message_id(data: Dict[str, Any]) -> int:
+    """API のメッセージデータのID（HistoryCursor.advance の key）"""
+    return data.get("id", 0)
+
+
+def _select_server(response: List[Dict[str, Any]], server_id: Optional[int] = None) -> Server:
+    """GET /servers のレスポンスから接続するサーバーを選ぶ（server_id 省略時は先頭）"""
+    if server_id is None:
+        return Server.from_dict(response[0])
+    for data in response:
+        if data.get("id") == server_id:
+            return Server.from_dict(data)
+    raise ServerNotFoundError(f"サーバー {server_id} へのアクセス権限がありません")
+
+
+def _snapshot_matches(state: Dict[str, Any], server_id: Optional[int]) -> bool:
+    """スナップショットが指定されたサーバーのものか"""
+    return server_id is None or state["server"].get("id") == server_id
+
+
+def _download_target(attachment: Attachment, dest: Optional[str]) -> str:
+    """保存先が省略された場合はカレントディレクトリに添付ファイル名で保存"""
+    return dest or os.path.basename(attachment.filename) or str(attachment.id)
+
+
+def _deliver(path: str, dest: Optional[str]) -> str:
+    """キャッシュ内のファイルを保存先にコピー（保存先の指定がなければキャッシュのパスを返す）"""
+    if dest is None or os.path.abspath(dest) == path:
+        return path
+    shutil.copyfile(path, dest)
+    return dest
+
+
+def _upload_unsupported(exc: JanusAPIError) -> bool:
+    """再開可能アップロードのエンドポイントがサーバーに存在しないことを示すエラーか"""
+    return isinstance(exc, ServerNotFoundError) or exc.status_code in (405, 501)
+
+
 class Client:
     def get_user_profile(self, user_id: str) -> User:
         """
@@ -38,8 +161,11 @@ class Client:
         Returns:
             User（display_name, avatar_url含む）
         """
-        response = self._make_request("GET", f"/users/profile", params={"auth0_id": user_id})
-        return User.from_dict(response)
+        user = self.user_cache.get(user_id)
+        if user is None:
+            user = self._fetch("/users/profile", self._decode_user, params={"auth0_id": user_id})
+            self.user_cache.set(user_id, user)
+        return user
     """
     Janus SDKのメインクライアントクラス
     
@@ -64,7 +190,24 @@ class Client:
         rate_limit_per_minute: int = 60,
         auto_reconnect: bool = True,
         debug: bool = False,
-        user_agent: str = "Janus-SDK/1.0"
+        user_agent: str = "Janus-SDK/1.0",
+        rate_limiter: Optional[RateLimiter] = None,
+        route_limiter: Optional[RouteRateLimiter] = None,
+        max_retry_after: float = 60.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        coalesce_requests: bool = False,
+        response_cache: Union[bool, ResponseCache] = False,
+        json_codec: Union[str, JSONCodec] = "auto",
+        max_connections: int = 10,
+        send_workers: int = 4,
+        attachment_cache: Union[bool, AttachmentCache] = False,
+        member_ttl: Optional[float] = 300.0,
+        cache_size: int = 1024,
+        cache_ttl: Optional[float] = 300.0,
+        snapshot: Union[str, Snapshot, None] = None,
+        server_id: Optional[int] = None,
+        lazy_messages: bool = False,
+        identity_map: Union[bool, UserIdentityMap] = False
     ):
         """
         クライアント初期化
@@ -72,12 +215,35 @@ class Client:
         Args:
             host: JanusサーバーのURL (例: "https://your-janus-server.com")
             token: サーバーAPIトークン (例: "janus_abc123...")
+            use_server_token: サーバートークン認証を使用
+            skip_initialization: サーバー情報の取得を最初のAPI呼び出しまで遅延（コンストラクタで通信しない）
             timeout: リクエストタイムアウト（秒）
-            retry_attempts: 再試行回数
+            retry_attempts: 最大試行回数（retry_policy 省略時に使用）
             rate_limit_per_minute: 分あたりリクエスト制限
             auto_reconnect: WebSocket自動再接続
             debug: デバッグモード
             user_agent: ユーザーエージェント
+            rate_limiter: 共有レートリミッター（省略時は rate_limit_per_minute のトークンバケット）
+            route_limiter: ルート別レートリミッター（省略時はクライアント専用のものを作成）
+            max_retry_after: 429 を自動再試行する Retry-After の上限秒数（超えると RateLimitError）
+            retry_policy: 再試行ポリシー（バックオフ・再試行予算・5xx の扱い）
+            coalesce_requests: 同時に発行された同一の GET を1回のリクエストにまとめる
+            response_cache: ETag / Last-Modified による条件付きリクエストキャッシュ
+                            （True で既定設定、ResponseCache インスタンスでサイズ指定）
+            json_codec: JSONコーデック（"auto" で orjson / msgspec / ujson / json から自動選択）
+            max_connections: コネクションプールに保持する Keep-Alive 接続数（並列取得のスレッド数以上を推奨）
+            send_workers: 送信キュー（enqueue_message）のワーカースレッド数
+            attachment_cache: 添付ファイルのディスクキャッシュ
+                              （True で ~/.cache/janus/attachments、AttachmentCache インスタンスで場所・上限を指定）
+            member_ttl: メンバーディレクトリを再取得するまでの秒数（Noneで member_join イベントによる更新のみ）
+            cache_size: チャンネル・ユーザープロフィールのキャッシュの最大エントリ数
+            cache_ttl: チャンネル・ユーザープロフィールのキャッシュの有効期限（秒、Noneで WebSocket イベントによる更新のみ）
+            snapshot: ウォームスタート用スナップショット（ファイルパスまたは Snapshot インスタンス）。
+                      保存済みならサーバー情報・チャンネル・メンバーを読み込んで起動し、バックグラウンドで再検証
+            server_id: 接続するサーバーのID（指定すると GET /servers によるサーバー探索を行わない）
+            lazy_messages: 履歴・WebSocket イベントのメッセージを LazyMessage（参照したフィールドだけをデコード）で返す
+            identity_map: 同じユーザーIDの User を1つのインスタンスで共有する
+                          （True で新規作成、UserIdentityMap インスタンスで複数クライアント間で共有）
         """
         self.host = host.rstrip('/')
         self.token = token
@@ -86,12 +252,16 @@ class Client:
         self.rate_limit_per_minute = rate_limit_per_minute
         self.auto_reconnect = auto_reconnect
         self.debug = debug
+        self.json_codec = get_codec(json_codec)
         
         # APIエンドポイント
         self.api_base = f"{self.host}/api/v1"
 
-        # HTTPセッション
+        # HTTPセッション（スレッド間で共有する Keep-Alive コネクションプール）
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         # 認証方式: デフォルトは Auth0 の Bearer JWT を想定
         if use_server_token:
             # サーバー向けのシンプルなトークンヘッダーを追加（バックエンド側で受け付けるよう実装されている場合）
@@ -99,51 +269,207 @@ class Client:
             self.session.headers.update({
                 "X-Server-Token": token,
                 "Authorization": f"Token {token}",
-                "User-Agent": user_agent,
-                "Content-Type": "application/json"
+                "User-Agent": user_agent
             })
         else:
             self.session.headers.update({
                 "Authorization": f"Bearer {token}",
-                "User-Agent": user_agent,
-                "Content-Type": "application/json"
+                "User-Agent": user_agent
             })
         
         if self.debug:
             print(f"[Janus SDK] api_base={self.api_base}")
             print(f"[Janus SDK] headers={dict(self.session.headers)}")
         
-        # レート制限管理
-        self._request_times = []
+        # レート制限管理（複数クライアント・スレッド間で共有可能）
+        self.rate_limiter = rate_limiter or TokenBucket(rate_limit_per_minute, per=60.0)
+        # ルート別レート制限（サーバーの 429 / X-RateLimit-* から学習）
+        self.route_limiter = route_limiter or RouteRateLimiter()
+        self.max_retry_after = max_retry_after
+        # 再試行ポリシー（ジッター付きバックオフ・再試行予算）
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=retry_attempts)
+        # 同一 GET の合流（シングルフライト）
+        self._singleflight = SingleFlight() if coalesce_requests else None
+        # 条件付きリクエストキャッシュ（304 でパース済みモデルを再利用）
+        if response_cache is True:
+            response_cache = ResponseCache()
+        self.response_cache = response_cache if isinstance(response_cache, ResponseCache) else None
+        
+        # 送信キュー（enqueue_message の初回呼び出し時に起動）
+        self.send_workers = send_workers
+        self._dispatcher = None
+        self._dispatcher_lock = threading.Lock()
+        
+        # 再開可能アップロードへのサーバー対応（None: 未確認）
+        self._resumable_uploads: Optional[bool] = None
+        
+        # 添付ファイルのディスクキャッシュ
+        if attachment_cache is True:
+            attachment_cache = AttachmentCache()
+        self.attachment_cache = attachment_cache if isinstance(attachment_cache, AttachmentCache) else None
         
         # WebSocket接続
         self._ws = None
         self._event_handlers = {}
         self._running = False
         
-        # キャッシュ
-        self._channels_cache = {}
-        self._users_cache = {}
+        # 履歴・イベントのメッセージのデコード方法
+        self._message_type = LazyMessage if lazy_messages else Message
+        # User の共有（メッセージの author・メンバー・プロフィールで同じインスタンスを使う）
+        if identity_map is True:
+            identity_map = UserIdentityMap()
+        self.identity_map = identity_map if isinstance(identity_map, UserIdentityMap) else None
+        
+        # キャッシュ（LRU + TTL、WebSocket イベントで更新・無効化）
+        self.channel_cache = ChannelCache(maxsize=cache_size, ttl=cache_ttl)
+        self.user_cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        # メンバーの索引（get_user / has_permission / is_admin はネットワークなしで解決）
+        self.member_directory = MemberDirectory(ttl=member_ttl)
+        if self.identity_map is not None:
+            self.identity_map.attach(self.member_directory)
+        self._members_lock = threading.Lock()
+        
+        # ウォームスタート用スナップショット
+        if isinstance(snapshot, str):
+            snapshot = Snapshot(snapshot)
+        self.snapshot = snapshot if isinstance(snapshot, Snapshot) else None
+        self._snapshot_key = Snapshot.key_for(self.host, token, server_id)
+        self._revalidate_thread = None
+        
+        self._server_id = server_id
         self._server_info = None
-        # 初期化時にサーバー情報取得（必要に応じてスキップ可能）
+        self._init_lock = threading.Lock()
+        # トークンでアクセスできるサーバー（ID → Server）と、サーバーごとのクライアント
+        self._servers: Dict[int, Server] = {}
+        self._parent: Optional["Client"] = None
+        self._children: Dict[int, "Client"] = {}
+        self._children_lock = threading.Lock()
+        # 初期化時にサーバー情報取得（スキップした場合は最初のAPI呼び出し時に取得）
         if not skip_initialization:
-            self._initialize()
+            self._ensure_server()
+    
+    def _ensure_server(self) -> Server:
+        """
+        サーバー情報を取得（未取得の場合のみ初期化。複数スレッドから呼ばれても1回だけ実行）
+        
+        Returns:
+            接続中のサーバー情報
+        """
+        server = self._server_info
+        if server is not None:
+            return server
+        with self._init_lock:
+            if self._server_info is None:
+                self._initialize()
+            return self._server_info
+    
+    def _require_server(self) -> Server:
+        """接続中のサーバー情報を取得（未初期化なら初期化、取得できなければエラー）"""
+        server = self._ensure_server()
+        if not server:
+            raise ServerNotFoundError("サーバー情報が取得できません")
+        return server
     
     def _initialize(self):
-        """初期化処理"""
+        """初期化処理（スナップショットがあれば読み込み、再検証はバックグラウンドで行う）"""
+        kinds = self._load_snapshot()
+        if kinds:
+            self._revalidate_thread = threading.Thread(
+                target=self._revalidate_snapshot, args=(kinds,), name="janus-revalidate", daemon=True
+            )
+            self._revalidate_thread.start()
+            return
+        if self._server_id is not None:
+            # サーバーIDが分かっていれば探索しない（一覧を取得済みでなければ名前などは未取得）
+            self._server_info = self._servers.get(self._server_id) or Server(id=self._server_id, name="")
+            return
+        self._fetch_server()
+    
+    def _fetch_server(self):
+        """トークンの検証とサーバー情報取得"""
         try:
-            # トークンの検証とサーバー情報取得
             response = self._make_request("GET", "/servers")
-            if response and len(response) > 0:
-                self._server_info = Server.from_dict(response[0])
-                if self.debug:
-                    print(f"[Janus SDK] 接続成功: {self._server_info.name}")
-            else:
+            if not response or len(response) == 0:
                 raise InvalidTokenError("無効なトークンまたはサーバーアクセス権限がありません")
+            self._remember_servers(response)
+            self._server_info = _select_server(response, self._server_id)
+            if self.debug:
+                print(f"[Janus SDK] 接続成功: {self._server_info.name}")
         except Exception as e:
             if self.debug:
                 print(f"[Janus SDK] 初期化エラー: {e}")
             raise
+        self._save_snapshot("server", self._server_info)
+    
+    def _remember_servers(self, response: List[Dict[str, Any]]):
+        """GET /servers のレスポンスをサーバー一覧に反映（サーバーごとのクライアントと共有）"""
+        servers = {server.id: server for server in map(Server.from_dict, response)}
+        self._servers.clear()
+        self._servers.update(servers)
+    
+    def _decode_messages(self, response: List[Dict[str, Any]]) -> List[Message]:
+        return [self._message_type.from_dict(msg, self.identity_map) for msg in response]
+    
+    def _decode_members(self, response: List[Dict[str, Any]]) -> List[Member]:
+        return [Member.from_dict(member, self.identity_map) for member in response]
+    
+    def _decode_user(self, response: Dict[str, Any]) -> User:
+        if self.identity_map is not None:
+            return self.identity_map.intern(response)
+        return User.from_dict(response)
+    
+    def _load_snapshot(self) -> List[str]:
+        """
+        スナップショットからサーバー情報・チャンネル・メンバーを復元
+        
+        Returns:
+            復元した項目（スナップショットがなければ空リスト）
+        """
+        if self.snapshot is None:
+            return []
+        try:
+            state = self.snapshot.load(self._snapshot_key)
+            if state is None or not _snapshot_matches(state, self._server_id):
+                return []
+            self._server_info = Server.from_dict(state["server"])
+            if "channels" in state:
+                self.channel_cache.replace(_parse_channels(state["channels"]))
+            if "members" in state:
+                self.member_directory.replace(self._decode_members(state["members"]))
+        except Exception as e:
+            # 壊れたスナップショットは無視して通常どおり初期化
+            if self.debug:
+                print(f"[Janus SDK] スナップショット読み込みエラー: {e}")
+            self._server_info = None
+            self.channel_cache.invalidate()
+            self.member_directory.invalidate()
+            return []
+        if self.debug:
+            print(f"[Janus SDK] スナップショットから起動: {self._server_info.name} ({', '.join(state)})")
+        return list(state)
+    
+    def _save_snapshot(self, kind: str, data: Any):
+        """スナップショットを更新（失敗しても API 呼び出しには影響させない）"""
+        if self.snapshot is None:
+            return
+        try:
+            self.snapshot.save(self._snapshot_key, kind, data)
+        except Exception as e:
+            if self.debug:
+                print(f"[Janus SDK] スナップショット保存エラー: {e}")
+    
+    def _revalidate_snapshot(self, kinds: List[str]):
+        """スナップショットから復元した項目を再取得（複数プロセスの同時起動で集中しないよう開始をずらす）"""
+        time.sleep(random.uniform(0, self.snapshot.revalidate_jitter))
+        try:
+            self._fetch_server()
+            if "channels" in kinds:
+                self.get_channels(force_refresh=True)
+            if "members" in kinds:
+                self.get_members()
+        except Exception as e:
+            if self.debug:
+                print(f"[Janus SDK] スナップショット再検証エラー: {e}")
     
     def _make_request(
         self, 
@@ -151,7 +477,11 @@ class Client:
         endpoint: str, 
         data: Dict[str, Any] = None,
         params: Dict[str, Any] = None,
-        files: Dict[str, Any] = None
+        body: Union[bytes, MultipartFileStream] = None,
+        headers: Dict[str, str] = None,
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+        cache_key: Hashable = None
     ) -> Any:
         """
         API リクエスト実行
@@ -161,7 +491,11 @@ class Client:
             endpoint: APIエンドポイント
             data: リクエストボディ
             params: クエリパラメータ
-            files: ファイルアップロード
+            body: 生のリクエストボディ（MultipartFileStream は再試行のたびに先頭から送り直す）
+            headers: 追加のリクエストヘッダー
+            timeout: このリクエストのタイムアウト秒数（省略時はクライアントの timeout）
+            idempotency_key: 冪等キー（指定時は POST も安全に再試行）
+            cache_key: 条件付きリクエストキャッシュのキー（GET のみ）
             
         Returns:
             APIレスポンス
@@ -169,32 +503,55 @@ class Client:
         Raises:
             JanusAPIError: API エラー
         """
-        # レート制限チェック
-        self._check_rate_limit()
-        
         # URLを正しく構築
         if endpoint.startswith('/'):
             endpoint = endpoint[1:]  # 先頭の/を削除
         url = f"{self.api_base}/{endpoint}"
+        route = route_key(method, endpoint)
+        policy = self.retry_policy
+        policy.stats.record_request()
+        started = time.monotonic()
+        delay = 0.0
+        attempt = 0
+        # JSONボディは再試行に備えて一度だけエンコード
+        json_body = self.json_codec.dumps(data) if data and body is None else None
+        cache_entry = None
+        if cache_key is not None and self.response_cache is not None:
+            cache_entry = self.response_cache.get(cache_key)
+        else:
+            cache_key = None
         
-        for attempt in range(self.retry_attempts):
+        while True:
+            # レート制限チェック（グローバル枠 → ルート別枠）
+            self._check_rate_limit()
+            self._wait_for_route(route)
             try:
                 if self.debug:
                     print(f"[Janus SDK] {method} {url}")
                     print(f"[Janus SDK] headers={dict(self.session.headers)}")
                 
                 kwargs = {
-                    "timeout": self.timeout,
+                    "timeout": self.timeout if timeout is None else timeout,
                     "params": params
                 }
+                request_headers = dict(headers) if headers else {}
+                if idempotency_key:
+                    request_headers["Idempotency-Key"] = idempotency_key
+                if cache_key is not None:
+                    request_headers.update(self.response_cache.conditional_headers(cache_entry))
                 
-                if files:
-                    kwargs["files"] = files
-                    if data:
-                        kwargs["data"] = data
-                else:
-                    if data:
-                        kwargs["json"] = data
+                if isinstance(body, MultipartFileStream):
+                    # Content-Length 付きでチャンクごとに送信（ファイル全体をメモリに載せない）
+                    kwargs["data"] = body
+                    request_headers["Content-Type"] = body.content_type
+                    request_headers["Content-Length"] = str(len(body))
+                elif body is not None:
+                    kwargs["data"] = body
+                elif json_body is not None:
+                    kwargs["data"] = json_body
+                    request_headers["Content-Type"] = self.json_codec.content_type
+                if request_headers:
+                    kwargs["headers"] = request_headers
                 
                 response = self.session.request(method, url, **kwargs)
                 
@@ -205,52 +562,189 @@ class Client:
                     except:
                         print(f"[Janus SDK] response body: <unable to decode>")
                 
-                # レート制限記録
-                self._request_times.append(time.time())
+                self.route_limiter.update(route, response.headers)
+                if response.status_code == 429 and self._defer_rate_limited(route, response.headers, attempt):
+                    attempt += 1
+                    continue
                 
-                if response.status_code == 401:
-                    raise InvalidTokenError("認証に失敗しました。トークンを確認してください")
-                elif response.status_code == 403:
-                    raise PermissionError("この操作を実行する権限がありません")
-                elif response.status_code == 404:
-                    raise ServerNotFoundError("指定されたリソースが見つかりません")
-                elif response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", 60))
-                    raise RateLimitError("レート制限に達しました", retry_after)
-                elif response.status_code >= 400:
-                    error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
-                    raise JanusAPIError(
-                        f"API エラー: {response.status_code}",
-                        response.status_code,
-                        error_data
+                if policy.is_retryable_status(response.status_code):
+                    retry_delay = policy.backoff(
+                        method, attempt, started, delay, f"status_{response.status_code}",
+                        has_idempotency_key=bool(idempotency_key)
                     )
+                    if retry_delay is not None:
+                        delay = retry_delay
+                        attempt += 1
+                        if self.debug:
+                            print(f"[Janus SDK] {response.status_code}: {delay:.2f}秒後に再試行")
+                        time.sleep(delay)
+                        continue
+                
+                if response.status_code == 304 and cache_entry is not None:
+                    return self.response_cache.not_modified(cache_key, cache_entry)
+                
+                _raise_for_status(
+                    response.status_code,
+                    response.headers,
+                    lambda: self.json_codec.loads(response.content) if _is_json(response.headers) else {}
+                )
                 
                 # 成功レスポンス
-                if response.headers.get("content-type", "").startswith("application/json"):
-                    return response.json()
-                else:
-                    return response.content
+                result = self.json_codec.loads(response.content) if _is_json(response.headers) else response.content
+                if cache_key is not None:
+                    self.response_cache.store(cache_key, response.headers, result, len(response.content))
+                return result
                     
-            except requests.exceptions.ConnectionError:
-                if attempt == self.retry_attempts - 1:
-                    raise ConnectionError(f"サーバーに接続できません: {self.host}")
-                time.sleep(2 ** attempt)  # 指数バックオフ
-            except requests.exceptions.Timeout:
-                if attempt == self.retry_attempts - 1:
-                    raise ConnectionError("リクエストがタイムアウトしました")
-                time.sleep(2 ** attempt)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                timed_out = isinstance(e, requests.exceptions.Timeout)
+                request_sent = not _is_connect_error(e)
+                retry_delay = policy.backoff(
+                    method, attempt, started, delay,
+                    "timeout" if timed_out else ("connection" if request_sent else "connect"),
+                    request_sent=request_sent,
+                    has_idempotency_key=bool(idempotency_key)
+                )
+                if retry_delay is None:
+                    if timed_out:
+                        raise ConnectionError("リクエストがタイムアウトしました") from e
+                    raise ConnectionError(f"サーバーに接続できません: {self.host}") from e
+                delay = retry_delay
+                attempt += 1
+                if self.debug:
+                    print(f"[Janus SDK] 通信エラー ({e.__class__.__name__}): {delay:.2f}秒後に再試行")
+                time.sleep(delay)
     
     def _check_rate_limit(self):
-        """レート制限チェック"""
-        now = time.time()
-        # 1分以内のリクエストを数える
-        self._request_times = [t for t in self._request_times if now - t < 60]
+        """レート制限チェック（トークンが補充されるまで待機）"""
+        if self.debug:
+            wait = self.rate_limiter.time_until_available()
+            if wait > 0:
+                print(f"[Janus SDK] レート制限により {wait:.1f}秒待機")
+        self.rate_limiter.acquire()
+    
+    def _wait_for_route(self, route: str):
+        """ルート別レート制限が解除されるまで待機"""
+        wait = self.route_limiter.wait_time(route)
+        if wait > 0:
+            if self.debug:
+                print(f"[Janus SDK] {route} はレート制限中のため {wait:.1f}秒待機")
+            time.sleep(wait)
+    
+    def _defer_rate_limited(self, route: str, headers, attempt: int) -> bool:
+        """
+        429 レスポンスをルートに記録し、再試行するか判定
         
-        if len(self._request_times) >= self.rate_limit_per_minute:
-            sleep_time = 60 - (now - self._request_times[0])
+        Returns:
+            Retry-After 経過後に再試行する場合 True
+        """
+        retry_after = parse_retry_after(headers)
+        is_global = headers.get("X-RateLimit-Global", "").lower() == "true"
+        self.route_limiter.block(route, retry_after, is_global=is_global)
+        if attempt < self.retry_policy.max_attempts - 1 and retry_after <= self.max_retry_after:
             if self.debug:
-                print(f"[Janus SDK] レート制限により {sleep_time:.1f}秒待機")
-            time.sleep(sleep_time)
+                print(f"[Janus SDK] 429: {route} を {retry_after:.1f}秒後に再試行")
+            self.retry_policy.stats.record_retry("rate_limit")
+            return True
+        self.retry_policy.stats.record_give_up()
+        return False
+    
+    def _fetch(self, endpoint: str, parse: Callable[[Any], Any], params: Dict[str, Any] = None) -> Any:
+        """
+        GET リクエストを実行してレスポンスをパース
+        
+        coalesce_requests が有効な場合、同時に発行された同一の GET（エンドポイント＋パラメータ）は
+        1回の HTTP リクエストとパース結果を共有します。response_cache が有効な場合は
+        条件付きリクエストを送り、304 なら前回のパース結果をそのまま返します。
+        
+        Args:
+            endpoint: APIエンドポイント
+            parse: レスポンスをモデルに変換する関数
+            params: クエリパラメータ
+            
+        Returns:
+            パース結果
+        """
+        key = ResponseCache.make_key(endpoint, params)
+        
+        def fetch():
+            if self.response_cache is None:
+                return parse(self._make_request("GET", endpoint, params=params))
+            body = self._make_request("GET", endpoint, params=params, cache_key=key)
+            return self.response_cache.parsed(key, body, parse)
+        
+        if self._singleflight is None:
+            return fetch()
+        return self._singleflight.do(key, fetch)
+    
+    # サーバー操作
+    def get_servers(self, force_refresh: bool = False) -> List[Server]:
+        """
+        トークンでアクセスできるサーバー一覧取得
+        
+        Args:
+            force_refresh: キャッシュを無視して最新データを取得
+            
+        Returns:
+            サーバーリスト
+        """
+        if force_refresh or not self._servers:
+            response = self._make_request("GET", "/servers")
+            self._remember_servers(response or [])
+        return list(self._servers.values())
+    
+    def for_server(self, server_id: int) -> "Client":
+        """
+        指定サーバーを操作するクライアントを取得
+        
+        返されるクライアントはこのクライアントと HTTP セッション（コネクションプール）・レートリミッター・
+        再試行ポリシー・ユーザープロフィールのキャッシュ・イベントハンドラーを共有し、チャンネルのキャッシュと
+        メンバーディレクトリだけをサーバーごとに持ちます。run() では全サーバーの WebSocket を1つのイベントループで受信します。
+        
+        Args:
+            server_id: サーバーID
+            
+        Returns:
+            サーバー用のクライアント（このクライアントのサーバーなら自身）
+        """
+        if self._parent is not None:
+            return self._parent.for_server(server_id)
+        own_id = self._server_info.id if self._server_info else self._server_id
+        if own_id is None:
+            # 未初期化で自身のサーバーが分からないと、同じサーバーのクライアントを重複して作ってしまう
+            own_id = self._require_server().id
+        if server_id == own_id:
+            return self
+        with self._children_lock:
+            child = self._children.get(server_id)
+            if child is None:
+                child = self._spawn(server_id)
+                self._children[server_id] = child
+            return child
+    
+    def for_all_servers(self) -> List["Client"]:
+        """アクセスできる全サーバーのクライアントを取得（サーバー一覧が未取得なら取得）"""
+        return [self.for_server(server.id) for server in self.get_servers()]
+    
+    def _spawn(self, server_id: int) -> "Client":
+        """接続・制限・共有キャッシュを引き継ぎ、サーバーごとの状態だけを作り直したクライアントを作成"""
+        child = copy.copy(self)
+        child._parent = self
+        child._children = {}
+        child._server_id = server_id
+        child._server_info = None
+        child._init_lock = threading.Lock()
+        child._snapshot_key = Snapshot.key_for(self.host, self.token, server_id)
+        child._revalidate_thread = None
+        child.channel_cache = ChannelCache(maxsize=self.channel_cache.entries.maxsize, ttl=self.channel_cache.ttl)
+        child.member_directory = MemberDirectory(ttl=self.member_directory.ttl)
+        if child.identity_map is not None:
+            child.identity_map.attach(child.member_directory)
+        child._members_lock = threading.Lock()
+        child._dispatcher = None
+        child._dispatcher_lock = threading.Lock()
+        child._ws = None
+        child._running = False
+        return child
     
     # チャンネル操作
     def get_channels(self, force_refresh: bool = False) -> List[Channel]:
@@ -263,17 +757,18 @@ class Client:
         Returns:
             チャンネルリスト
         """
-        if not force_refresh and self._channels_cache:
-            return list(self._channels_cache.values())
+        if not force_refresh:
+            cached = self.channel_cache.all()
+            if cached is not None:
+                return cached
         
-        if not self._server_info:
-            raise ServerNotFoundError("サーバー情報が取得できません")
+        server = self._require_server()
         
-        response = self._make_request("GET", f"/servers/{self._server_info.id}/channels")
-        channels = [Channel.from_dict(ch) for ch in response]
+        channels = list(self._fetch(f"/servers/{server.id}/channels", _parse_channels))
         
         # キャッシュ更新
-        self._channels_cache = {ch.id: ch for ch in channels}
+        self.channel_cache.replace(channels)
+        self._save_snapshot("channels", channels)
         
         return channels
     
@@ -288,18 +783,48 @@ class Client:
             チャンネル情報
         """
         # キャッシュから検索
-        if channel_id in self._channels_cache:
-            return self._channels_cache[channel_id]
+        channel = self.channel_cache.get(channel_id)
+        if channel is not None:
+            return channel
         
-        # キャッシュになければ一覧を更新
-        channels = self.get_channels(force_refresh=True)
-        channel = next((ch for ch in channels if ch.id == channel_id), None)
+        # 期限内の一覧になければ存在しない。一覧が古い場合のみ再取得
+        if not self.channel_cache.known_missing(channel_id):
+            channels = self.get_channels(force_refresh=True)
+            channel = next((ch for ch in channels if ch.id == channel_id), None)
         
         if not channel:
             raise ChannelNotFoundError(f"チャンネル ID {channel_id} が見つかりません")
         
         return channel
     
+    def get_channel_by_name(self, name: str, type: Optional[str] = None) -> Channel:
+        """
+        チャンネル名からチャンネルを取得
+        
+        名前の索引（大文字小文字を区別しない。完全一致を優先）から引くため、キャッシュが有効な間は
+        ネットワークアクセスなしで解決します。見つからない場合は、キャッシュ後に作成・改名された
+        チャンネルの可能性があるため一覧を1回だけ再取得してから探し直します。
+        
+        Args:
+            name: チャンネル名
+            type: チャンネルタイプで絞り込む（"text", "voice", "forum"）
+        
+        Returns:
+            チャンネル情報
+        
+        Raises:
+            ChannelNotFoundError: チャンネルが存在しない
+        """
+        channel = self.channel_cache.find_by_name(name, type)
+        if channel is None:
+            self.get_channels(force_refresh=True)
+            channel = self.channel_cache.find_by_name(name, type)
+        
+        if channel is None:
+            raise ChannelNotFoundError(f"チャンネル '{name}' が見つかりません")
+        
+        return channel
+    
     def create_channel(
         self, 
         name: str, 
@@ -317,8 +842,7 @@ class Client:
         Returns:
             作成されたチャンネル
         """
-        if not self._server_info:
-            raise ServerNotFoundError("サーバー情報が取得できません")
+        server = self._require_server()
         
         data = {
             "name": name,
@@ -328,13 +852,13 @@ class Client:
         
         response = self._make_request(
             "POST", 
-            f"/servers/{self._server_info.id}/channels", 
+            f"/servers/{server.id}/channels", 
             data=data
         )
         
         channel = Channel.from_dict(response)
         # キャッシュ更新
-        self._channels_cache[channel.id] = channel
+        self.channel_cache.add(channel)
         
         return channel
     
@@ -348,13 +872,12 @@ class Client:
         Returns:
             削除成功フラグ
         """
-        if not self._server_info:
-            raise ServerNotFoundError("サーバー情報が取得できません")
+        server = self._require_server()
         
-        self._make_request("DELETE", f"/servers/{self._server_info.id}/channels/{channel_id}")
+        self._make_request("DELETE", f"/servers/{server.id}/channels/{channel_id}")
         
         # キャッシュから削除
-        self._channels_cache.pop(channel_id, None)
+        self.channel_cache.remove(channel_id)
         
         return True
     
@@ -363,7 +886,8 @@ class Client:
         self, 
         channel_id: int, 
         content: str,
-        embeds: List[Dict[str, Any]] = None
+        embeds: List[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None
     ) -> Message:
         """
         メッセージ送信
@@ -372,12 +896,12 @@ class Client:
             channel_id: チャンネルID
             content: メッセージ内容
             embeds: 埋め込みコンテンツ
+            idempotency_key: 冪等キー（指定すると通信エラー時も二重投稿せずに再試行可能）
             
         Returns:
             送信されたメッセージ
         """
-        if not self._server_info:
-            raise ServerNotFoundError("サーバー情報が取得できません")
+        server = self._require_server()
         
         data = {
             "content": content
@@ -387,11 +911,48 @@ class Client:
         
         response = self._make_request(
             "POST",
-            f"/servers/{self._server_info.id}/channels/{channel_id}/messages",
-            data=data
+            f"/servers/{server.id}/channels/{channel_id}/messages",
+            data=data,
+            idempotency_key=idempotency_key
         )
         
-        return Message.from_dict(response)
+        return Message.from_dict(response, self.identity_map)
+    
+    def enqueue_message(
+        self,
+        channel_id: int,
+        content: str,
+        embeds: List[Dict[str, Any]] = None,
+        priority: int = PRIORITY_NORMAL
+    ) -> "Future[Message]":
+        """
+        メッセージ送信をキューに積み、すぐに Future を返す
+        
+        同じチャンネルへの送信は投入順に送られ、異なるチャンネルは並行して送信されます。
+        優先度の小さい（PRIORITY_INTERACTIVE）送信が一斉送信（PRIORITY_BULK）より先に処理されます。
+        
+        使用例:
+            future = client.enqueue_message(channel_id, "了解！", priority=janus.PRIORITY_INTERACTIVE)
+            message = future.result()
+        
+        Args:
+            channel_id: チャンネルID
+            content: メッセージ内容
+            embeds: 埋め込みコンテンツ
+            priority: 優先度（小さいほど先に送信）
+            
+        Returns:
+            送信された Message を結果に持つ Future
+        """
+        return self.dispatcher.submit(channel_id, content, embeds=embeds, priority=priority)
+    
+    @property
+    def dispatcher(self) -> SendDispatcher:
+        """送信キュー（初回アクセス時に作成）"""
+        with self._dispatcher_lock:
+            if self._dispatcher is None:
+                self._dispatcher = SendDispatcher(self, workers=self.send_workers)
+            return self._dispatcher
     
     def get_messages(
         self,
@@ -412,8 +973,7 @@ class Client:
         Returns:
             メッセージリスト
         """
-        if not self._server_info:
-            raise ServerNotFoundError("サーバー情報が取得できません")
+        server = self._require_server()
         
         params = {"limit": limit}
         if before:
@@ -421,13 +981,166 @@ class Client:
         if after:
             params["after"] = after
         
-        response = self._make_request(
-            "GET",
-            f"/servers/{self._server_info.id}/channels/{channel_id}/messages",
+        return list(self._fetch(
+            f"/servers/{server.id}/channels/{channel_id}/messages",
+            self._decode_messages,
             params=params
-        )
+        ))
+    
+    def iter_messages(
+        self,
+        channel_id: int,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+        page_size: int = 100,
+        limit: Optional[int] = None,
+        prefetch: bool = True
+    ) -> Iterator[Message]:
+        """
+        メッセージ履歴をページ単位で辿るジェネレーター
+        
+        `before` / `after` カーソルで履歴を遡り、呼び出し元が現在のページを処理している間に
+        次のページをバックグラウンドで先読みします。メモリに保持するのは最大2ページです。
         
-        return [Message.from_dict(msg) for msg in response]
+        使用例:
+            for msg in client.iter_messages(channel_id, limit=10000):
+                print(msg.content)
+        
+        Args:
+            channel_id: チャンネルID
+            before: このIDより前のメッセージから取得（省略時は最新から）
+            after: このIDより後のメッセージまで取得（before 省略時は古い順に取得）
+            page_size: 1リクエストあたりの取得件数
+            limit: 取得する最大件数（Noneで全件）
+            prefetch: 次のページを先読みする
+            
+        Yields:
+            メッセージ（after のみ指定時は古い順、それ以外は新しい順）
+        """
+        cursor = HistoryCursor(before=before, after=after, page_size=page_size, limit=limit)
+        if cursor.done:
+            return
+        
+        def fetch(params: Dict[str, Any]) -> List[Message]:
+            return self.get_messages(channel_id, **params)
+        
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        pending = None
+        try:
+            page = fetch(cursor.params())
+            while True:
+                messages = cursor.advance(page)
+                if not cursor.done:
+                    params = cursor.params()
+                    if executor is not None:
+                        pending = executor.submit(fetch, params)
+                
+                for message in messages:
+                    yield message
+                
+                if cursor.done:
+                    return
+                if pending is not None:
+                    page = pending.result()
+                    pending = None
+                else:
+                    page = fetch(params)
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+    
+    def get_message_batch(
+        self,
+        channel_id: int,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+        page_size: int = 100,
+        limit: Optional[int] = None
+    ) -> MessageBatch:
+        """
+        メッセージ履歴を列指向の MessageBatch として取得
+        
+        iter_messages と同じカーソルで履歴を辿りますが、各ページを Message に変換せず
+        API のデータから直接バッチに追加します。大量の履歴の集計・分析向けです。
+        
+        使用例:
+            batch = client.get_message_batch(channel_id, limit=100000)
+            print(batch.count_by_author(by="name"))
+        
+        Args:
+            channel_id: チャンネルID
+            before: このIDより前のメッセージから取得（省略時は最新から）
+            after: このIDより後のメッセージまで取得（before 省略時は古い順に取得）
+            page_size: 1リクエストあたりの取得件数
+            limit: 取得する最大件数（Noneで全件）
+            
+        Returns:
+            MessageBatch（after のみ指定時は古い順、それ以外は新しい順）
+        """
+        cursor = HistoryCursor(before=before, after=after, page_size=page_size, limit=limit)
+        batch = MessageBatch()
+        if cursor.done:
+            return batch
+        
+        server = self._require_server()
+        endpoint = f"/servers/{server.id}/channels/{channel_id}/messages"
+        while not cursor.done:
+            page = self._fetch(endpoint, list, params=cursor.params())
+            batch.extend(cursor.advance(page, key=_raw_message_id))
+        return batch
+    
+    def iter_channel_histories(
+        self,
+        channel_ids: Iterable[int],
+        limit: Optional[int] = 100,
+        page_size: int = 100,
+        concurrency: int = 8,
+        return_exceptions: bool = False
+    ) -> Iterator[Tuple[int, Union[List[Message], Exception]]]:
+        """
+        複数チャンネルの履歴を並列に取得し、完了した順に返す
+        
+        スレッドプールで各チャンネルの iter_messages を同時に実行します。
+        リクエストはすべてクライアントのレートリミッターを通るため、並列でも制限を超えません。
+        
+        使用例:
+            for channel_id, messages in client.iter_channel_histories([1, 2, 3], limit=500):
+                print(channel_id, len(messages))
+        
+        Args:
+            channel_ids: チャンネルIDのリスト
+            limit: チャンネルごとの最大取得件数（Noneで全件）
+            page_size: 1リクエストあたりの取得件数
+            concurrency: 同時に取得するチャンネル数
+            return_exceptions: True の場合、失敗したチャンネルは例外を結果として返す
+                               （False の場合は最初の例外を送出）
+            
+        Yields:
+            (チャンネルID, メッセージリスト または 例外)
+        """
+        def fetch(channel_id: int) -> List[Message]:
+            return list(self.iter_messages(channel_id, limit=limit, page_size=page_size, prefetch=False))
+        
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures = {}
+        try:
+            futures = {executor.submit(fetch, channel_id): channel_id for channel_id in channel_ids}
+            for future in as_completed(futures):
+                channel_id = futures[future]
+                try:
+                    messages = future.result()
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    yield channel_id, e
+                    continue
+                yield channel_id, messages
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
     
     def edit_message(self, message_id: int, content: str) -> Message:
         """
@@ -461,43 +1174,131 @@ class Client:
         self,
         channel_id: int,
         file_path: str,
-        message: str = ""
+        message: str = "",
+        progress: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
+        resumable: Optional[bool] = None,
+        chunk_size: int = DEFAULT_RESUMABLE_CHUNK_SIZE,
+        upload_id: Optional[str] = None
     ) -> Message:
         """
         ファイル送信
         
+        ファイルはチャンクごとに読み込みながらストリーミング送信するため、
+        ファイルサイズに関係なくメモリ使用量は一定です。
+        
         Args:
             channel_id: チャンネルID
             file_path: ファイルパス
             message: 追加メッセージ
+            progress: 進捗コールバック（送信済みバイト数, ファイルサイズ）
+            timeout: アップロードリクエストのタイムアウト秒数（省略時はクライアントの timeout）
+            resumable: チャンク単位で再開できるアップロードを使う。None の場合は
+                chunk_size 以上のファイルでサーバーが対応していれば使用
+            chunk_size: 再開可能アップロードのチャンクサイズ
+            upload_id: 失敗したアップロード（UploadError.upload_id）を再開する場合のID
             
         Returns:
             送信されたメッセージ
+            
+        Raises:
+            UploadError: 再開可能アップロードが途中で失敗した
         """
-        import os
-        
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"ファイルが見つかりません: {file_path}")
         
-        if not self._server_info:
-            raise ServerNotFoundError("サーバー情報が取得できません")
+        server = self._require_server()
         
-        with open(file_path, 'rb') as f:
-            files = {
-                'file': (os.path.basename(file_path), f, 'application/octet-stream')
-            }
-            data = {}
-            if message:
-                data['message'] = message
-            
-            response = self._make_request(
-                "POST",
-                f"/servers/{self._server_info.id}/channels/{channel_id}/files",
-                data=data,
-                files=files
+        if resumable is None:
+            resumable = upload_id is not None or (
+                self._resumable_uploads is not False and os.path.getsize(file_path) >= chunk_size
             )
+        if resumable and os.path.getsize(file_path) > 0:
+            upload = ResumableUpload(file_path, message, chunk_size, progress, upload_id)
+            response = self._send_file_resumable(channel_id, upload, timeout)
+            if response is not None:
+                return Message.from_dict(response, self.identity_map)
         
-        return Message.from_dict(response)
+        fields = {"message": message} if message else None
+        body = MultipartFileStream(file_path, fields=fields, progress=progress)
+        response = self._make_request(
+            "POST",
+            f"/servers/{server.id}/channels/{channel_id}/files",
+            body=body,
+            timeout=timeout
+        )
+        
+        return Message.from_dict(response, self.identity_map)
+    
+    def _send_file_resumable(
+        self,
+        channel_id: int,
+        upload: ResumableUpload,
+        timeout: Optional[float] = None,
+        max_resumes: int = 5
+    ) -> Optional[Dict[str, Any]]:
+        """
+        チャンク単位の再開可能アップロード
+        
+        チャンクの送信に失敗した場合はサーバーが受信済みの位置を問い合わせ、そこから再開します。
+        
+        Returns:
+            送信されたメッセージ（サーバーが非対応なら None）
+        """
+        server_id = self._require_server().id
+        try:
+            if upload.upload_id is None:
+                status = self._make_request(
+                    "POST", ResumableUpload.create_endpoint(server_id, channel_id),
+                    data=upload.create_payload(), timeout=timeout
+                )
+                upload.begin(status)
+            else:
+                status = self._make_request("GET", upload.session_endpoint(server_id), timeout=timeout)
+                upload.sync(status)
+        except JanusAPIError as e:
+            if not _upload_unsupported(e):
+                raise
+            if self.debug:
+                print("[Janus SDK] サーバーが再開可能アップロードに非対応のため通常の送信に切り替えます")
+            self._resumable_uploads = False
+            return None
+        self._resumable_uploads = True
+        
+        resumes = 0
+        with open(upload.file_path, "rb") as f:
+            while True:
+                if upload.done:
+                    # 最後のチャンクの応答を受け取る前に切断された
+                    return upload.completed(status)
+                chunk, headers = upload.read_chunk(f)
+                try:
+                    response = self._make_request(
+                        "PUT", upload.session_endpoint(server_id),
+                        body=chunk, headers=headers, timeout=timeout
+                    )
+                except (ConnectionError, JanusAPIError) as e:
+                    # 409 / 416 は offset の不一致、それ以外は通信エラーのみ再開を試みる
+                    resumable_error = isinstance(e, ConnectionError) or e.status_code in (409, 416)
+                    if not resumable_error or resumes >= max_resumes:
+                        raise UploadError(
+                            f"アップロードに失敗しました ({upload.offset}/{upload.size} バイト送信済み)",
+                            upload.upload_id, upload.offset
+                        ) from e
+                    resumes += 1
+                    if self.debug:
+                        print(f"[Janus SDK] アップロード中断: {upload.offset}/{upload.size} から再開します")
+                    try:
+                        status = self._make_request("GET", upload.session_endpoint(server_id), timeout=timeout)
+                        upload.sync(status)
+                    except JanusAPIError as sync_error:
+                        raise UploadError(
+                            "アップロードの再開位置を取得できません", upload.upload_id, upload.offset
+                        ) from sync_error
+                    continue
+                result = upload.advance(response, len(chunk))
+                if result is not None:
+                    return result
     
     def send_image(
         self,
@@ -518,19 +1319,300 @@ class Client:
         """
         return self.send_file(channel_id, image_path, message)
     
+    def send_files(
+        self,
+        channel_id: int,
+        paths: Iterable[str],
+        message: str = "",
+        concurrency: int = 4,
+        progress: Optional[BatchProgressCallback] = None,
+        timeout: Optional[float] = None
+    ) -> List[UploadResult]:
+        """
+        複数ファイルを並列に送信
+        
+        スレッドプールで send_file を同時に実行します。各ファイルはディスクからストリーミング送信され、
+        リクエストはすべてクライアントのレートリミッターとコネクションプールを通ります。
+        一部のファイルが失敗しても残りの送信は続行します。
+        
+        使用例:
+            results = client.send_files(channel_id, glob.glob("logs/*.log"), concurrency=4)
+            failed = [r for r in results if not r.ok]
+        
+        Args:
+            channel_id: チャンネルID
+            paths: ファイルパスのリスト
+            message: 各ファイルに付ける追加メッセージ
+            concurrency: 同時に送信するファイル数（max_connections 以下を推奨）
+            progress: 進捗コールバック（ファイルパス, 送信済みバイト数, ファイルサイズ）
+            timeout: 各アップロードリクエストのタイムアウト秒数
+            
+        Returns:
+            paths と同じ順序の UploadResult リスト
+        """
+        paths = list(paths)
+        
+        def upload(path: str) -> Message:
+            file_progress = None
+            if progress:
+                file_progress = lambda sent, total: progress(path, sent, total)
+            return self.send_file(channel_id, path, message, progress=file_progress, timeout=timeout)
+        
+        results = [UploadResult(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {executor.submit(upload, path): i for i, path in enumerate(paths)}
+            for future in as_completed(futures):
+                result = results[futures[future]]
+                try:
+                    result.message = future.result()
+                except Exception as e:
+                    if self.debug:
+                        print(f"[Janus SDK] ファイル送信エラー ({result.path}): {e}")
+                    result.error = e
+        return results
+    
+    # 添付ファイル
+    def download_attachment(
+        self,
+        attachment: Attachment,
+        dest: Optional[str] = None,
+        segments: int = 1,
+        progress: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
+        use_cache: bool = True
+    ) -> str:
+        """
+        添付ファイルをダウンロード
+        
+        ディスクにストリーミングで書き込み、通信が途切れた場合は Range リクエストで続きから再開します。
+        attachment_cache が有効な場合は添付ファイルIDでキャッシュし、2回目以降はダウンロードしません。
+        
+        Args:
+            attachment: 添付ファイル
+            dest: 保存先のパス（省略時はキャッシュ内のパス、キャッシュ無効ならカレントディレクトリ）
+            segments: 大きなファイルを分割して並列にダウンロードする数（サーバーが Range 非対応なら1本で取得）
+            progress: 進捗コールバック（受信済みバイト数, ファイルサイズ）
+            timeout: 各リクエストのタイムアウト秒数（省略時はクライアントの timeout）
+            use_cache: attachment_cache を使う
+            
+        Returns:
+            ダウンロードしたファイルのパス
+        """
+        cache = self.attachment_cache if use_cache else None
+        if cache is not None:
+            cached = cache.get(attachment.id)
+            if cached is not None:
+                return _deliver(cached, dest)
+            part = cache.partial_path(attachment.id)
+        else:
+            dest = _download_target(attachment, dest)
+            part = dest + ".part"
+        
+        url = urljoin(self.host + "/", attachment.url)
+        size = attachment.size or None
+        received = [0]
+        lock = threading.Lock()
+        
+        def on_bytes(n: int):
+            with lock:
+                received[0] += n
+                if progress:
+                    progress(received[0], size or received[0])
+        
+        ranges = plan_segments(size, segments) if size and segments > 1 else []
+        if len(ranges) < 2 or not self._download_segments(url, part, size, ranges, on_bytes, timeout):
+            received[0] = os.path.getsize(part) if os.path.exists(part) else 0
+            self._download_range(url, part, None, size, on_bytes, timeout)
+        
+        if cache is not None:
+            return _deliver(cache.put(attachment.id, part), dest)
+        os.replace(part, dest)
+        return dest
+    
+    def _download_headers(self, url: str) -> Dict[str, Optional[str]]:
+        """API サーバー以外のホストには認証ヘッダーを送らない"""
+        if urlparse(url).netloc == urlparse(self.host).netloc:
+            return {}
+        return {"Authorization": None, "X-Server-Token": None}
+    
+    def _download_segments(
+        self,
+        url: str,
+        part: str,
+        size: int,
+        ranges: List[Tuple[int, int]],
+        on_bytes: Callable[[int], None],
+        timeout: Optional[float]
+    ) -> bool:
+        """
+        範囲ごとにスレッドを分けて並列ダウンロード
+        
+        Returns:
+            成功した場合 True（サーバーが Range 非対応なら False）
+        """
+        segmented = part + ".segments"
+        with open(segmented, "wb") as f:
+            f.truncate(size)
+        try:
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [
+                    executor.submit(self._download_range, url, segmented, start, size, on_bytes, timeout, end)
+                    for start, end in ranges
+                ]
+                for future in as_completed(futures):
+                    future.result()
+        except RangeNotSupported:
+            if self.debug:
+                print("[Janus SDK] サーバーが Range リクエストに非対応のため1本でダウンロードします")
+            os.remove(segmented)
+            return False
+        except BaseException:
+            os.remove(segmented)
+            raise
+        os.replace(segmented, part)
+        return True
+    
+    def _download_range(
+        self,
+        url: str,
+        path: str,
+        start: Optional[int],
+        size: Optional[int],
+        on_bytes: Callable[[int], None],
+        timeout: Optional[float],
+        end: Optional[int] = None
+    ):
+        """
+        url の内容を path に書き込む（通信が途切れたら受信済みの位置から Range で再開）
+        
+        Args:
+            url: ダウンロードURL
+            path: 書き込み先ファイル
+            start: 書き込み開始位置（None の場合は path の末尾から再開し、最後まで取得）
+            size: ファイル全体のサイズ（不明なら None）
+            on_bytes: 受信したバイト数を通知するコールバック
+            timeout: 各リクエストのタイムアウト秒数
+            end: 取得する範囲の終了位置（含む）。指定時はサーバーが 206 を返さなければ RangeNotSupported
+        """
+        segment = end is not None
+        if start is None:
+            if not os.path.exists(path):
+                open(path, "wb").close()
+            start = os.path.getsize(path)
+        position = start
+        base_headers = self._download_headers(url)
+        same_host = not base_headers
+        policy = self.retry_policy
+        started = time.monotonic()
+        delay = 0.0
+        attempt = 0
+        
+        while True:
+            if (segment and position > end) or (not segment and size is not None and position >= size):
+                return
+            headers = dict(base_headers)
+            if position > 0 or segment:
+                headers["Range"] = range_header(position, end)
+            if same_host:
+                self._check_rate_limit()
+            try:
+                if self.debug:
+                    print(f"[Janus SDK] GET {url} Range={headers.get('Range')}")
+                with self.session.get(
+                    url, headers=headers, stream=True,
+                    timeout=self.timeout if timeout is None else timeout
+                ) as response:
+                    if response.status_code == 416 and not segment and position > 0:
+                        # 受信済みのファイルが既に完全
+                        return
+                    if policy.is_retryable_status(response.status_code):
+                        retry_delay = policy.backoff("GET", attempt, started, delay, f"status_{response.status_code}")
+                        if retry_delay is not None:
+                            delay = retry_delay
+                            attempt += 1
+                            time.sleep(delay)
+                            continue
+                    _raise_for_status(response.status_code, response.headers, lambda: {})
+                    
+                    if "Range" in headers and response.status_code != 206:
+                        if segment:
+                            raise RangeNotSupported(url)
+                        # Range を無視して全体が返ってきたので最初から書き直す
+                        on_bytes(-position)
+                        position = 0
+                        open(path, "wb").close()
+                    if size is None:
+                        content_range = parse_content_range(response.headers.get("Content-Range"))
+                        if content_range is not None:
+                            size = content_range[2]
+                        elif response.headers.get("Content-Length"):
+                            size = position + int(response.headers["Content-Length"])
+                    
+                    with open(path, "r+b") as f:
+                        f.seek(position)
+                        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                            if segment:
+                                chunk = chunk[:end + 1 - position]
+                            f.write(chunk)
+                            position += len(chunk)
+                            on_bytes(len(chunk))
+                            if segment and position > end:
+                                break
+                    
+                    expected = end + 1 if segment else size
+                    if expected is not None and position < expected:
+                        raise requests.exceptions.ChunkedEncodingError(
+                            f"受信が途中で終了しました ({position}/{expected})"
+                        )
+                    return
+            
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                timed_out = isinstance(e, requests.exceptions.Timeout)
+                retry_delay = policy.backoff(
+                    "GET", attempt, started, delay,
+                    "timeout" if timed_out else "connection",
+                    request_sent=not _is_connect_error(e)
+                )
+                if retry_delay is None:
+                    if timed_out:
+                        raise ConnectionError("ダウンロードがタイムアウトしました") from e
+                    raise ConnectionError(f"ダウンロードが中断されました: {url}") from e
+                delay = retry_delay
+                attempt += 1
+                if self.debug:
+                    print(f"[Janus SDK] ダウンロード中断 ({position} バイト受信済み): {delay:.2f}秒後に再開")
+                time.sleep(delay)
+    
     # ユーザー・メンバー操作
     def get_members(self) -> List[Member]:
         """
-        サーバーメンバー一覧取得
+        サーバーメンバー一覧取得（メンバーディレクトリも更新）
         
         Returns:
             メンバーリスト
         """
-        if not self._server_info:
-            raise ServerNotFoundError("サーバー情報が取得できません")
+        server = self._require_server()
         
-        response = self._make_request("GET", f"/servers/{self._server_info.id}/members")
-        return [Member.from_dict(member) for member in response]
+        members = list(self._fetch(f"/servers/{server.id}/members", self._decode_members))
+        self.member_directory.replace(members)
+        self._save_snapshot("members", members)
+        return members
+    
+    def get_member_directory(self) -> MemberDirectory:
+        """
+        メンバーディレクトリを取得（未読み込み・TTL 切れの場合のみメンバー一覧を再取得）
+        
+        Returns:
+            MemberDirectory
+        """
+        directory = self.member_directory
+        if directory.stale:
+            with self._members_lock:
+                if directory.stale:
+                    self.get_members()
+        return directory
     
     def get_user(self, user_id: str) -> User:
         """
@@ -542,31 +1624,21 @@ class Client:
         Returns:
             ユーザー情報
         """
-        # キャッシュから検索
-        if user_id in self._users_cache:
-            return self._users_cache[user_id]
-        
-        # メンバー一覧から検索
-        members = self.get_members()
-        user = next((member.user for member in members if member.user.id == user_id), None)
-        
-        if not user:
+        member = self.get_member_directory().get(user_id)
+        if member is None:
             raise UserNotFoundError(f"ユーザー ID {user_id} が見つかりません")
-        
-        # キャッシュ更新
-        self._users_cache[user_id] = user
-        
-        return user
+        return member.user
     
     def get_online_members(self) -> List[Member]:
         """
         オンラインメンバー取得
         
+        ステータスはメンバーディレクトリの読み込み時点のものです（最大 member_ttl 秒前）。
+        
         Returns:
             オンラインメンバーリスト
         """
-        members = self.get_members()
-        return [member for member in members if member.user.status == "online"]
+        return self.get_member_directory().online()
     
     # 権限管理
     def has_permission(self, user_id: str, permission: str, channel_id: int = None) -> bool:
@@ -582,28 +1654,7 @@ class Client:
             権限有無
         """
         try:
-            members = self.get_members()
-            member = next((m for m in members if m.user.id == user_id), None)
-            
-            if not member:
-                return False
-            
-            # オーナーは全権限あり
-            if member.role == "owner":
-                return True
-            
-            # 基本的な権限マッピング
-            permission_map = {
-                "SEND_MESSAGES": ["owner", "admin", "member"],
-                "DELETE_MESSAGES": ["owner", "admin"],
-                "MANAGE_CHANNELS": ["owner", "admin"],
-                "MANAGE_SERVER": ["owner"],
-                "INVITE_USERS": ["owner", "admin", "member"]
-            }
-            
-            allowed_roles = permission_map.get(permission, [])
-            return member.role in allowed_roles
-            
+            return self.get_member_directory().has_permission(user_id, permission)
         except Exception:
             return False
     
@@ -618,9 +1669,7 @@ class Client:
             管理者権限有無
         """
         try:
-            members = self.get_members()
-            member = next((m for m in members if m.user.id == user_id), None)
-            return member and member.role in ["owner", "admin"]
+            return self.get_member_directory().is_admin(user_id)
         except Exception:
             return False
     
@@ -655,18 +1704,36 @@ class Client:
     async def _handle_websocket_message(self, message: str):
         """WebSocketメッセージハンドラー"""
         try:
-            data = json.loads(message)
+            data = self.json_codec.loads(message)
             event_type = data.get("type")
             
             if event_type == "message" and "on_message" in self._event_handlers:
-                message_obj = Message.from_dict(data.get("data", {}))
+                message_obj = self._message_type.from_dict(data.get("data", {}), self.identity_map)
                 await self._event_handlers["on_message"](message_obj)
-            elif event_type == "member_join" and "on_member_join" in self._event_handlers:
-                member_obj = Member.from_dict(data.get("data", {}))
-                await self._event_handlers["on_member_join"](member_obj)
-            elif event_type == "channel_create" and "on_channel_create" in self._event_handlers:
+            elif event_type == "member_join":
+                member_obj = Member.from_dict(data.get("data", {}), self.identity_map)
+                self.member_directory.add(member_obj)
+                self.user_cache.invalidate(member_obj.user.id)
+                if "on_member_join" in self._event_handlers:
+                    await self._event_handlers["on_member_join"](member_obj)
+            elif event_type == "member_leave":
+                member_data = data.get("data", {})
+                self.member_directory.remove(member_data.get("user", {}).get("id") or member_data.get("user_id"))
+            elif event_type == "channel_create":
                 channel_obj = Channel.from_dict(data.get("data", {}))
-                await self._event_handlers["on_channel_create"](channel_obj)
+                self.channel_cache.add(channel_obj)
+                if "on_channel_create" in self._event_handlers:
+                    await self._event_handlers["on_channel_create"](channel_obj)
+            elif event_type == "channel_update":
+                self.channel_cache.add(Channel.from_dict(data.get("data", {})))
+            elif event_type == "channel_delete":
+                channel_data = data.get("data", {})
+                self.channel_cache.remove(channel_data.get("id") or channel_data.get("channel_id"))
+            elif event_type == "user_update":
+                user_data = data.get("data", {})
+                self.user_cache.invalidate(user_data.get("id"))
+                if self.identity_map is not None:
+                    self.identity_map.refresh(user_data)
                 
         except Exception as e:
             if self.debug:
@@ -715,31 +1782,42 @@ class Client:
         イベントループ開始
         
         WebSocket接続を開始してリアルタイムイベントを受信します。
+        for_server で作成した他のサーバーのクライアントも同じイベントループで受信します。
         """
         if not self._event_handlers:
             if self.debug:
                 print("[Janus SDK] イベントハンドラーが設定されていません")
             return
         
-        self._running = True
+        clients = [self, *self._children.values()]
+        for client in clients:
+            client._ensure_server()
+            client._running = True
         
         try:
             if self.debug:
                 print("[Janus SDK] イベントループ開始")
             
-            asyncio.run(self._websocket_connection())
+            # for_server で作成したサーバーの WebSocket も同じイベントループで受信
+            asyncio.run(self._websocket_connections(clients))
             
         except KeyboardInterrupt:
             if self.debug:
                 print("[Janus SDK] 中断されました")
         finally:
-            self._running = False
+            for client in clients:
+                client._running = False
+    
+    @staticmethod
+    async def _websocket_connections(clients: List["Client"]):
+        await asyncio.gather(*(client._websocket_connection() for client in clients))
     
     def stop(self):
         """イベントループ停止"""
-        self._running = False
-        if self._ws:
-            asyncio.create_task(self._ws.close())
+        for client in [self, *self._children.values()]:
+            client._running = False
+            if client._ws:
+                asyncio.create_task(client._ws.close())
     
     # プロパティ
     @property
@@ -750,8 +1828,18 @@ class Client:
     
     @property
     def server(self) -> Optional[Server]:
-        """接続中のサーバー情報"""
-        return self._server_info
+        """接続中のサーバー情報（未取得なら取得する）"""
+        return self._ensure_server()
+    
+    @property
+    def retry_stats(self) -> Dict[str, Any]:
+        """再試行の統計（リクエスト数・再試行回数・理由別内訳）"""
+        return self.retry_policy.stats.as_dict()
+    
+    @property
+    def cache_stats(self) -> Dict[str, Any]:
+        """チャンネル・ユーザープロフィールのキャッシュ統計（ヒット率・破棄数など）"""
+        return {"channels": self.channel_cache.stats(), "users": self.user_cache.stats()}
     
     def __repr__(self):
         return f"<Client host='{self.host}' server='{self._server_info.name if self._server_info else 'Unknown'}'>"
@@ -0,0 +1,166 @@
+"""
+Janus SDK JSONコーデック
+
+REST / WebSocket ペイロードのエンコード・デコードを差し替え可能にします。
+orjson・msgspec・ujson がインストールされていれば自動で利用し、
+なければ標準ライブラリの json にフォールバックします。
+
+使用例:
+    client = Client(host, token, json_codec="orjson")
+    client = Client(host, token, json_codec=get_codec("auto"))
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except Exception:
+    orjson = None
+    _ORJSON_AVAILABLE = False
+try:
+    import msgspec
+    _MSGSPEC_AVAILABLE = True
+except Exception:
+    msgspec = None
+    _MSGSPEC_AVAILABLE = False
+try:
+    import ujson
+    _UJSON_AVAILABLE = True
+except Exception:
+    ujson = None
+    _UJSON_AVAILABLE = False
+
+
+class JSONCodec:
+    """
+    JSONコーデック基底クラス
+
+    dumps はUTF-8のバイト列を返し、loads はバイト列・文字列のどちらも受け付けます。
+    レスポンスボディをテキストに変換せず、受信したバイト列から直接デコードできます。
+    """
+
+    name = "base"
+    content_type = "application/json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """オブジェクトをJSONバイト列にエンコード"""
+        raise NotImplementedError
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """JSONバイト列（または文字列）をデコード"""
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} name='{self.name}'>"
+
+
+class StdlibCodec(JSONCodec):
+    """標準ライブラリ json によるコーデック"""
+
+    name = "json"
+
+    def __init__(self):
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson によるコーデック"""
+
+    name = "orjson"
+
+    def __init__(self):
+        if not _ORJSON_AVAILABLE:
+            raise ImportError("orjson がインストールされていません: pip install orjson")
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """msgspec によるコーデック"""
+
+    name = "msgspec"
+
+    def __init__(self):
+        if not _MSGSPEC_AVAILABLE:
+            raise ImportError("msgspec がインストールされていません: pip install msgspec")
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._decoder.decode(data)
+
+
+class UjsonCodec(JSONCodec):
+    """ujson によるコーデック"""
+
+    name = "ujson"
+
+    def __init__(self):
+        if not _UJSON_AVAILABLE:
+            raise ImportError("ujson がインストールされていません: pip install ujson")
+
+    def dumps(self, obj: Any) -> bytes:
+        return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return ujson.loads(data)
+
+
+_CODECS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "ujson": UjsonCodec,
+    "json": StdlibCodec,
+}
+
+# "auto" で試す順番（高速なものから）
+_AUTO_ORDER = ("orjson", "msgspec", "ujson", "json")
+
+
+def available_codecs() -> list:
+    """インストール済みで利用可能なコーデック名の一覧"""
+    flags = {
+        "orjson": _ORJSON_AVAILABLE,
+        "msgspec": _MSGSPEC_AVAILABLE,
+        "ujson": _UJSON_AVAILABLE,
+        "json": True,
+    }
+    return [name for name in _AUTO_ORDER if flags[name]]
+
+
+def get_codec(codec: Union[str, JSONCodec, None] = "auto") -> JSONCodec:
+    """
+    コーデックを取得
+
+    Args:
+        codec: "auto" / "orjson" / "msgspec" / "ujson" / "json"、または JSONCodec インスタンス
+
+    Returns:
+        JSONCodec インスタンス
+
+    Raises:
+        ValueError: 不明なコーデック名
+        ImportError: 指定したライブラリがインストールされていない
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None or codec == "auto":
+        return _CODECS[available_codecs()[0]]()
+    if codec not in _CODECS:
+        raise ValueError(f"不明なJSONコーデックです: {codec}")
+    return _CODECS[codec]()
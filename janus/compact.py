@@ -0,0 +1,308 @@
+"""
+Janus SDK 省メモリなデータモデル
+
+janus.models と同じフィールドを持つ、__slots__ 付き（インスタンスごとの __dict__ なし）のモデルです。
+リストのフィールドはタプルで保持し、空のタプル・ロールの組み合わせ・ステータスなどの文字列は
+インスタンス間で共有するため、数百万件のメッセージを保持する集計処理などでメモリ使用量を大きく減らせます。
+
+- Compact*: 変更可能
+- Frozen*:  変更不可（ハッシュ可能。dict のキーや set に使える）
+
+使用例:
+    from janus.compact import CompactMessage
+    messages = [CompactMessage.from_dict(data) for data in page]
+    compact = CompactMessage.from_model(message)
+    message = compact.to_model()
+"""
+
+import dataclasses
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from . import models
+from .timestamps import parse_timestamp
+
+
+def slotted(cls):
+    """
+    dataclass を __slots__ 付きのクラスに作り直す（Python 3.10 以降の dataclass(slots=True) 相当）
+
+    Args:
+        cls: dataclass
+
+    Returns:
+        フィールドを __slots__ に持つ新しいクラス
+    """
+    names = tuple(f.name for f in dataclasses.fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    namespace["__slots__"] = names
+    # frozen でも pickle・copy できるよう状態の復元は object.__setattr__ で行う
+    namespace["__getstate__"] = _getstate
+    namespace["__setstate__"] = _setstate
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _getstate(self):
+    return tuple(getattr(self, name) for name in self.__slots__)
+
+
+def _setstate(self, state):
+    for name, value in zip(self.__slots__, state):
+        object.__setattr__(self, name, value)
+
+
+# 共有するタプル（ロールの組み合わせなど、値の種類が少ないもの）
+_TUPLES: Dict[Tuple, Tuple] = {}
+
+
+def _shared_tuple(values) -> Tuple:
+    if not values:
+        return ()
+    values = tuple(values)
+    try:
+        return _TUPLES.setdefault(values, values)
+    except TypeError:
+        # 辞書などハッシュできない要素は共有しない
+        return values
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _datetime(value: Any, memoize: bool = True) -> Optional[datetime]:
+    if not value or not isinstance(value, str):
+        return None
+    return parse_timestamp(value, memoize)
+
+
+class _Compact:
+    """Compact* / Frozen* の共通処理（janus.models との相互変換）"""
+    __slots__ = ()
+
+    # janus.models の対応するクラスと、ネストしたモデルのフィールド → クラス
+    _model: type = object
+    _nested: Dict[str, type] = {}
+
+    @classmethod
+    def from_model(cls, model: Any):
+        """janus.models のインスタンスから変換"""
+        values = {}
+        for f in dataclasses.fields(cls):
+            value = getattr(model, f.name)
+            nested = cls._nested.get(f.name)
+            if isinstance(value, (list, tuple)):
+                value = tuple(nested.from_model(v) for v in value) if nested else _shared_tuple(value)
+            elif nested is not None and value is not None:
+                value = nested.from_model(value)
+            values[f.name] = value
+        return cls(**values)
+
+    def to_model(self) -> Any:
+        """janus.models のインスタンスに変換"""
+        values = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, tuple):
+                value = [v.to_model() if isinstance(v, _Compact) else v for v in value]
+            elif isinstance(value, _Compact):
+                value = value.to_model()
+            values[name] = value
+        return self._model(**values)
+
+
+@slotted
+@dataclass
+class CompactUser(_Compact):
+    """ユーザー情報（省メモリ版）"""
+    id: str
+    name: str
+    display_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+    status: str = "offline"
+    roles: Tuple[str, ...] = ()
+
+    _model = models.User
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactUser":
+        return cls(
+            id=data.get("id", ""),
+            name=data.get("name", ""),
+            display_name=data.get("display_name", data.get("name", "")),
+            avatar_url=data.get("avatar_url"),
+            status=_intern(data.get("status", "offline")),
+            roles=_shared_tuple(data.get("roles"))
+        )
+
+
+@slotted
+@dataclass
+class CompactMember(_Compact):
+    """サーバーメンバー情報（省メモリ版）"""
+    id: int
+    user: CompactUser
+    role: str
+    joined_at: Optional[datetime] = None
+
+    _model = models.Member
+    _nested = {"user": CompactUser}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactMember":
+        return cls(
+            id=data.get("id", 0),
+            user=cls._nested["user"].from_dict(data.get("user", {})),
+            role=_intern(data.get("role", "member")),
+            joined_at=_datetime(data.get("joined_at"))
+        )
+
+
+@slotted
+@dataclass
+class CompactChannel(_Compact):
+    """チャンネル情報（省メモリ版）"""
+    id: int
+    name: str
+    description: str = ""
+    type: str = "text"
+    server_id: int = 0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    _model = models.Channel
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactChannel":
+        return cls(
+            id=data.get("id", 0),
+            name=data.get("name", ""),
+            description=data.get("description", ""),
+            type=_intern(data.get("type", "text")),
+            server_id=data.get("server_id", 0),
+            created_at=_datetime(data.get("created_at")),
+            updated_at=_datetime(data.get("updated_at"))
+        )
+
+
+@slotted
+@dataclass
+class CompactAttachment(_Compact):
+    """添付ファイル情報（省メモリ版）"""
+    id: int
+    filename: str
+    url: str
+    size: int
+    content_type: str
+
+    _model = models.Attachment
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactAttachment":
+        return cls(
+            id=data.get("id", 0),
+            filename=data.get("filename", ""),
+            url=data.get("url", ""),
+            size=data.get("size", 0),
+            content_type=_intern(data.get("content_type", ""))
+        )
+
+    def download(self, client, dest: Optional[str] = None, **kwargs):
+        """添付ファイルをダウンロード（client.download_attachment のショートカット）"""
+        return client.download_attachment(self, dest, **kwargs)
+
+
+@slotted
+@dataclass
+class CompactMessage(_Compact):
+    """メッセージ情報（省メモリ版）"""
+    id: int
+    channel_id: int
+    author: CompactUser
+    content: str
+    timestamp: Optional[datetime]
+    edited_at: Optional[datetime] = None
+    attachments: Tuple[CompactAttachment, ...] = ()
+    embeds: Tuple[Dict[str, Any], ...] = field(default=(), hash=False)
+
+    _model = models.Message
+    _nested = {"author": CompactUser, "attachments": CompactAttachment}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactMessage":
+        user_type = cls._nested["author"]
+        author_data = data.get("author", {})
+        if isinstance(author_data, str):
+            author = user_type(id=author_data, name=author_data, display_name=author_data)
+        elif isinstance(author_data, dict):
+            author = user_type.from_dict(author_data)
+        else:
+            author = user_type(id="unknown", name="Unknown", display_name="Unknown")
+
+        attachments = data.get("attachments")
+        return cls(
+            id=data.get("id", 0),
+            channel_id=data.get("channel_id") or data.get("channelId", 0),
+            author=author,
+            content=data.get("content", ""),
+            timestamp=_datetime(data.get("timestamp") or data.get("createdAt"), memoize=False),
+            edited_at=_datetime(data.get("edited_at"), memoize=False),
+            attachments=tuple(map(cls._nested["attachments"].from_dict, attachments)) if attachments else (),
+            embeds=tuple(data["embeds"]) if data.get("embeds") else ()
+        )
+
+
+@slotted
+@dataclass
+class CompactServer(_Compact):
+    """サーバー情報（省メモリ版）"""
+    id: int
+    name: str
+    icon_url: Optional[str] = None
+    invite_code: Optional[str] = None
+    api_token: Optional[str] = None
+    member_count: int = 0
+    created_at: Optional[datetime] = None
+
+    _model = models.Server
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactServer":
+        return cls(
+            id=data.get("id", 0),
+            name=data.get("name", ""),
+            icon_url=data.get("icon_url"),
+            invite_code=data.get("invite_code"),
+            api_token=data.get("api_token"),
+            member_count=data.get("member_count", 0),
+            created_at=_datetime(data.get("created_at"))
+        )
+
+
+def _frozen(cls: type, name: str, nested: Optional[Dict[str, type]] = None) -> type:
+    """Compact* クラスから同じフィールド・メソッドを持つ変更不可のクラスを作成"""
+    fields = []
+    for f in dataclasses.fields(cls):
+        if f.default is dataclasses.MISSING:
+            fields.append((f.name, f.type))
+        else:
+            fields.append((f.name, f.type, field(default=f.default, hash=f.hash)))
+    namespace = {
+        key: value for key, value in vars(cls).items()
+        if key in ("from_dict", "download", "_model", "__doc__")
+    }
+    namespace["__module__"] = __name__
+    namespace["_nested"] = nested or {}
+    return slotted(dataclasses.make_dataclass(name, fields, bases=(_Compact,), namespace=namespace, frozen=True))
+
+
+FrozenUser = _frozen(CompactUser, "FrozenUser")
+FrozenMember = _frozen(CompactMember, "FrozenMember", {"user": FrozenUser})
+FrozenChannel = _frozen(CompactChannel, "FrozenChannel")
+FrozenAttachment = _frozen(CompactAttachment, "FrozenAttachment")
+FrozenMessage = _frozen(CompactMessage, "FrozenMessage", {"author": FrozenUser, "attachments": FrozenAttachment})
+FrozenServer = _frozen(CompactServer, "FrozenServer")
@@ -0,0 +1,266 @@
+"""
+Janus SDK 送信キュー
+
+send_message をキューに積んで即座に Future を返し、ワーカースレッドが
+レート制限の残量を見ながら順に送信します。
+
+- 同じチャンネルへの送信は投入順に1件ずつ送信（順序を保証）
+- 異なるチャンネルは並行して送信
+- 優先度の高い送信（対話的な返信など）を一斉送信より先に処理
+- レート制限中のチャンネルは後回しにし、送信できる他のチャンネルを先に処理
+
+使用例:
+    future = client.enqueue_message(channel_id, "了解しました", priority=PRIORITY_INTERACTIVE)
+    for ch in channels:
+        client.enqueue_message(ch.id, "お知らせ", priority=PRIORITY_BULK)
+    message = future.result()
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .ratelimit import route_key
+
+
+# 優先度（小さいほど先に送信）
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 5
+PRIORITY_BULK = 10
+
+# _next_job が待機から戻ったことを示す（グローバル枠をロックの外で確認し直す）
+_AGAIN = object()
+
+
+class _SendJob:
+    """キューに積まれた送信"""
+
+    __slots__ = ("channel_id", "content", "embeds", "priority", "future")
+
+    def __init__(self, channel_id: int, content: str, embeds: Optional[List[Dict[str, Any]]], priority: int):
+        self.channel_id = channel_id
+        self.content = content
+        self.embeds = embeds
+        self.priority = priority
+        self.future: Future = Future()
+
+
+class SendDispatcher:
+    """
+    チャンネルごとの順序を保ちながら並行送信するディスパッチャー
+
+    チャンネルの優先度はキュー内で最も高い優先度になります。先頭が一斉送信でも、
+    後ろに対話的な返信が積まれたチャンネルは順序を保ったまま前倒しで処理されます。
+    """
+
+    def __init__(self, client, workers: int = 4):
+        """
+        Args:
+            client: 送信に使う Client
+            workers: 並行して送信するワーカースレッド数
+        """
+        self.client = client
+        self.workers = workers
+        self._cond = threading.Condition()
+        self._queues: Dict[int, Deque[_SendJob]] = {}
+        self._priority: Dict[int, int] = {}       # チャンネルの実効優先度
+        self._ready: List[Tuple[int, int, int]] = []     # (優先度, 順番, チャンネルID)
+        self._deferred: List[Tuple[float, int]] = []     # (送信可能時刻, チャンネルID)
+        self._in_flight = set()
+        self._pending = 0
+        self._seq = itertools.count()
+        self._closed = False
+        self._threads: List[threading.Thread] = []
+
+    def _start(self):
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"janus-send-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(
+        self,
+        channel_id: int,
+        content: str,
+        embeds: List[Dict[str, Any]] = None,
+        priority: int = PRIORITY_NORMAL
+    ) -> Future:
+        """
+        送信をキューに積む
+
+        Args:
+            channel_id: チャンネルID
+            content: メッセージ内容
+            embeds: 埋め込みコンテンツ
+            priority: 優先度（PRIORITY_INTERACTIVE / PRIORITY_NORMAL / PRIORITY_BULK）
+
+        Returns:
+            送信完了時に Message が設定される Future
+        """
+        job = _SendJob(channel_id, content, embeds, priority)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("送信キューは停止済みです")
+            self._start()
+            queue = self._queues.setdefault(channel_id, deque())
+            queue.append(job)
+            self._pending += 1
+            current = self._priority.get(channel_id)
+            if current is None or priority < current:
+                self._priority[channel_id] = priority
+                if channel_id not in self._in_flight:
+                    heapq.heappush(self._ready, (priority, next(self._seq), channel_id))
+            self._cond.notify()
+        return job.future
+
+    def _route_wait(self, channel_id: int) -> float:
+        # ロック内で呼ばれるため client.server は使わない（未取得だとサーバー情報の取得で通信してしまう）。
+        # 未取得ならまだ送信しておらずルートのレート制限情報もないので待たない
+        client = self.client
+        server_id = client._server_info.id if client._server_info else client._server_id
+        if server_id is None:
+            return 0.0
+        route = route_key("POST", f"/servers/{server_id}/channels/{channel_id}/messages")
+        return self.client.route_limiter.wait_time(route)
+
+    def _next_job(self, rate_wait: float):
+        """
+        次に送信するジョブを取り出す（ロック内で呼び出す）
+
+        Args:
+            rate_wait: ロックの外で確認したグローバル枠が空くまでの秒数
+
+        Returns:
+            ジョブ。停止済みでキューが空なら None、待機した場合は _AGAIN
+        """
+        while True:
+            now = time.monotonic()
+            while self._deferred and self._deferred[0][0] <= now:
+                _, channel_id = heapq.heappop(self._deferred)
+                if self._queues.get(channel_id):
+                    heapq.heappush(self._ready, (self._priority[channel_id], next(self._seq), channel_id))
+
+            # 古い（優先度が変わった・処理中・空の）エントリを捨てる
+            while self._ready:
+                priority, _, channel_id = self._ready[0]
+                if (
+                    channel_id in self._in_flight
+                    or not self._queues.get(channel_id)
+                    or self._priority.get(channel_id) != priority
+                ):
+                    heapq.heappop(self._ready)
+                    continue
+                break
+
+            if not self._ready:
+                if self._closed and self._pending == 0:
+                    return None
+                timeout = self._deferred[0][0] - now if self._deferred else None
+                self._cond.wait(timeout)
+                return _AGAIN
+
+            # グローバル枠が空くまでスリープせずに待つ（新しい送信や停止で起こされる）
+            if rate_wait > 0:
+                self._cond.wait(rate_wait)
+                return _AGAIN
+
+            _, _, channel_id = heapq.heappop(self._ready)
+            route_wait = self._route_wait(channel_id)
+            if route_wait > 0:
+                # このチャンネルはレート制限中なので後回しにして他のチャンネルを処理
+                heapq.heappush(self._deferred, (now + route_wait, channel_id))
+                continue
+
+            self._in_flight.add(channel_id)
+            return self._queues[channel_id].popleft()
+
+    def _finish(self, job: _SendJob):
+        """送信完了後のチャンネル状態を更新（ロック内で呼び出す）"""
+        channel_id = job.channel_id
+        self._in_flight.discard(channel_id)
+        self._pending -= 1
+        queue = self._queues.get(channel_id)
+        if queue:
+            priority = min(j.priority for j in queue)
+            self._priority[channel_id] = priority
+            heapq.heappush(self._ready, (priority, next(self._seq), channel_id))
+        else:
+            self._queues.pop(channel_id, None)
+            self._priority.pop(channel_id, None)
+        self._cond.notify_all()
+
+    def _worker(self):
+        limiter = self.client.rate_limiter
+        while True:
+            # グローバル枠はロックの外で確認する（SQLiteTokenBucket ではファイルの読み込みを伴う）
+            rate_wait = limiter.time_until_available()
+            with self._cond:
+                job = self._next_job(rate_wait)
+            if job is None:
+                return
+            if job is _AGAIN:
+                continue
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    message = self.client.send_message(job.channel_id, job.content, embeds=job.embeds)
+                except BaseException as e:
+                    job.future.set_exception(e)
+                else:
+                    job.future.set_result(message)
+            with self._cond:
+                self._finish(job)
+
+    @property
+    def pending(self) -> int:
+        """未送信（送信中を含む）の件数"""
+        with self._cond:
+            return self._pending
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        キューが空になるまで待機
+
+        Args:
+            timeout: 最大待機秒数（Noneで無制限）
+
+        Returns:
+            すべて送信済みなら True
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """
+        ディスパッチャーを停止
+
+        Args:
+            wait: ワーカーの終了を待つ
+            cancel_pending: 未送信の Future をキャンセルする（False なら送信し切ってから終了）
+        """
+        with self._cond:
+            self._closed = True
+            if cancel_pending:
+                for queue in self._queues.values():
+                    while queue:
+                        job = queue.popleft()
+                        job.future.cancel()
+                        self._pending -= 1
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __repr__(self):
+        return f"<SendDispatcher workers={self.workers} pending={self._pending}>"
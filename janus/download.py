@@ -0,0 +1,252 @@
+"""
+Janus SDK 添付ファイルのダウンロード
+
+Client.download_attachment / AsyncClient.download_attachment から利用される、
+Range リクエストの組み立てと、添付ファイルIDをキーにしたローカルディスクキャッシュを提供します。
+
+キャッシュは内容アドレス方式（SHA-256）で保存するため、同じ内容の添付ファイルは
+1つのファイルを共有します。合計サイズが上限を超えると、最も長く使われていないものから削除します。
+
+使用例:
+    client = Client(host, token, attachment_cache=AttachmentCache("~/.cache/janus", max_bytes=2 * 1024**3))
+    for attachment in message.attachments:
+        path = attachment.download(client)   # 2回目以降はダウンロードしない
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# 並列ダウンロードで1セグメントあたりの最小サイズ（これより小さいファイルは分割しない）
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+class RangeNotSupported(Exception):
+    """サーバーが Range リクエストに 206 で応答しなかった"""
+    pass
+
+
+def parse_content_range(value: Optional[str]) -> Optional[Tuple[int, int, Optional[int]]]:
+    """
+    Content-Range ヘッダーを解析
+
+    Args:
+        value: ヘッダー値（例: "bytes 0-1023/4096"）
+
+    Returns:
+        (開始位置, 終了位置, 全体サイズ) 。全体サイズが "*" の場合は None。解析できなければ None
+    """
+    match = _CONTENT_RANGE.match(value or "")
+    if not match:
+        return None
+    total = None if match.group(3) == "*" else int(match.group(3))
+    return int(match.group(1)), int(match.group(2)), total
+
+
+def range_header(start: int, end: Optional[int] = None) -> str:
+    """Range ヘッダー値を生成（end 省略時は末尾まで）"""
+    return f"bytes={start}-{'' if end is None else end}"
+
+
+def plan_segments(size: int, segments: int, min_segment_size: int = MIN_SEGMENT_SIZE) -> List[Tuple[int, int]]:
+    """
+    ファイルを並列ダウンロード用の範囲に分割
+
+    Args:
+        size: ファイルサイズ
+        segments: 最大分割数
+        min_segment_size: 1セグメントの最小バイト数
+
+    Returns:
+        (開始位置, 終了位置) のリスト（終了位置を含む）
+    """
+    count = max(1, min(segments, size // max(1, min_segment_size)))
+    step = -(-size // count)
+    return [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+
+def file_digest(path: str) -> str:
+    """ファイルの SHA-256 ダイジェスト（16進）"""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class AttachmentCache:
+    """
+    添付ファイルIDをキーにした内容アドレス方式のディスクキャッシュ
+
+    ファイル本体は `objects/<sha256の先頭2文字>/<sha256>` に保存し、添付ファイルIDとの対応と
+    最終アクセス時刻を SQLite のインデックスで管理します。複数スレッドから安全に利用できます。
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = 1024 * 1024 * 1024):
+        """
+        Args:
+            directory: キャッシュディレクトリ（省略時は ~/.cache/janus/attachments）
+            max_bytes: 保存するファイルの合計バイト数の上限（Noneで無制限）
+        """
+        if directory is None:
+            directory = os.path.join("~", ".cache", "janus", "attachments")
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_bytes = max_bytes
+        self._objects = os.path.join(self.directory, "objects")
+        self._tmp = os.path.join(self.directory, "tmp")
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._tmp, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(self.directory, "index.sqlite3"),
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS janus_attachments ("
+            "attachment_id TEXT PRIMARY KEY, digest TEXT NOT NULL, "
+            "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self._objects, digest[:2], digest)
+
+    def get(self, attachment_id) -> Optional[str]:
+        """
+        キャッシュ済みファイルのパスを取得（最近使用したものとして扱う）
+
+        Args:
+            attachment_id: 添付ファイルID
+
+        Returns:
+            ファイルパス（未キャッシュなら None）
+        """
+        key = str(attachment_id)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM janus_attachments WHERE attachment_id = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                path = self._object_path(row[0])
+                if os.path.exists(path):
+                    self._conn.execute(
+                        "UPDATE janus_attachments SET accessed = ? WHERE attachment_id = ?",
+                        (time.time(), key)
+                    )
+                    self.hits += 1
+                    return path
+                # ファイルが外部から削除された
+                self._conn.execute("DELETE FROM janus_attachments WHERE attachment_id = ?", (key,))
+            self.misses += 1
+            return None
+
+    def partial_path(self, attachment_id) -> str:
+        """ダウンロード途中のファイルのパス（中断後に同じ位置から再開できるよう固定）"""
+        return os.path.join(self._tmp, f"{attachment_id}.part")
+
+    def put(self, attachment_id, file_path: str) -> str:
+        """
+        ダウンロード済みファイルをキャッシュに移動
+
+        同じ内容のファイルが既に保存されていれば、そのファイルを共有して file_path は削除します。
+
+        Args:
+            attachment_id: 添付ファイルID
+            file_path: ダウンロードしたファイル（キャッシュディレクトリと同じファイルシステム上にあること）
+
+        Returns:
+            キャッシュ内のファイルパス
+        """
+        digest = file_digest(file_path)
+        size = os.path.getsize(file_path)
+        path = self._object_path(digest)
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path):
+                os.remove(file_path)
+            else:
+                os.replace(file_path, path)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO janus_attachments (attachment_id, digest, size, accessed) VALUES (?, ?, ?, ?)",
+                (str(attachment_id), digest, size, time.time())
+            )
+            self._evict(keep=digest)
+        return path
+
+    def _total_bytes(self) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM janus_attachments)"
+        ).fetchone()
+        return row[0]
+
+    def _evict(self, keep: Optional[str] = None):
+        """上限を超えた分を最終アクセスが古い順に削除（ロック内で呼び出す）"""
+        if self.max_bytes is None:
+            return
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT attachment_id, digest, size FROM janus_attachments ORDER BY accessed"
+        ).fetchall()
+        for attachment_id, digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            self._conn.execute("DELETE FROM janus_attachments WHERE attachment_id = ?", (attachment_id,))
+            total -= self._release(digest, size)
+
+    def _release(self, digest: str, size: int) -> int:
+        """どのIDからも参照されなくなったファイルを削除し、解放したバイト数を返す"""
+        shared = self._conn.execute(
+            "SELECT 1 FROM janus_attachments WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if shared:
+            return 0
+        try:
+            os.remove(self._object_path(digest))
+        except FileNotFoundError:
+            pass
+        return size
+
+    def invalidate(self, attachment_id=None):
+        """エントリを削除（attachment_id 省略時は全削除）"""
+        with self._lock:
+            if attachment_id is None:
+                rows = self._conn.execute("SELECT DISTINCT digest, size FROM janus_attachments").fetchall()
+                self._conn.execute("DELETE FROM janus_attachments")
+            else:
+                rows = self._conn.execute(
+                    "SELECT digest, size FROM janus_attachments WHERE attachment_id = ?", (str(attachment_id),)
+                ).fetchall()
+                self._conn.execute(
+                    "DELETE FROM janus_attachments WHERE attachment_id = ?", (str(attachment_id),)
+                )
+            for digest, size in rows:
+                self._release(digest, size)
+
+    @property
+    def total_bytes(self) -> int:
+        """保存しているファイルの合計バイト数"""
+        with self._lock:
+            return self._total_bytes()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM janus_attachments").fetchone()[0]
+
+    def __repr__(self):
+        return (
+            f"<AttachmentCache directory='{self.directory}' entries={len(self)} "
+            f"hits={self.hits} misses={self.misses}>"
+        )
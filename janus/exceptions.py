@@ -58,3 +58,16 @@ class UserNotFoundError(JanusAPIError):
 class ConnectionError(JanusAPIError):
     """Raised when there's a connection error."""
     pass
+
+
+class UploadError(JanusAPIError):
+    """
+    再開可能アップロードの途中で失敗したエラー
+
+    upload_id を send_file(..., upload_id=...) に渡すと、サーバーが受信済みの位置から再開できます。
+    """
+    
+    def __init__(self, message: str, upload_id: str = None, offset: int = 0):
+        super().__init__(message)
+        self.upload_id = upload_id
+        self.offset = offset
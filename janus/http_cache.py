@@ -0,0 +1,161 @@
+"""
+Janus SDK 条件付きリクエストキャッシュ
+
+GET レスポンスの検証子（ETag / Last-Modified）を保存し、次回の同一リクエストで
+`If-None-Match` / `If-Modified-Since` を送信します。サーバーが 304 Not Modified を
+返した場合はボディを再ダウンロード・再パースせず、前回パースしたモデルを再利用します。
+
+使用例:
+    client = Client(host, token, response_cache=ResponseCache(max_entries=512))
+    client.get_channels(force_refresh=True)  # 変更がなければ 304 で済む
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class CacheEntry:
+    """キャッシュされたレスポンス"""
+
+    __slots__ = ("etag", "last_modified", "body", "size", "parsed")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], body: Any, size: int):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.size = size
+        # パース関数ごとのパース結果（304 時に再利用）
+        self.parsed: Dict[Callable, Any] = {}
+
+
+class ResponseCache:
+    """
+    ETag / Last-Modified による HTTP キャッシュ（LRU・サイズ上限付き）
+
+    エントリ数とボディの合計バイト数の両方に上限を設定でき、超えた分は
+    最も長く使われていないエントリから破棄します。スレッドセーフです。
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: Optional[int] = 32 * 1024 * 1024):
+        """
+        Args:
+            max_entries: 最大エントリ数
+            max_bytes: ボディの合計バイト数の上限（Noneで無制限）
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0      # 304 で再利用できた回数
+        self.misses = 0    # 本文を受信した回数
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple:
+        """エンドポイントとクエリパラメータからキャッシュキーを生成"""
+        return (endpoint, tuple(sorted((params or {}).items())))
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """エントリを取得（最近使用したものとして扱う）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def conditional_headers(self, entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """条件付きリクエスト用のヘッダーを生成"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def not_modified(self, key: Hashable, entry: CacheEntry) -> Any:
+        """304 を受けたときにキャッシュ済みのボディを返す"""
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return entry.body
+
+    def store(self, key: Hashable, headers, body: Any, size: int):
+        """
+        200 レスポンスを保存
+
+        検証子がない場合や `Cache-Control: no-store` の場合は保存せず、古いエントリを削除します。
+
+        Args:
+            key: キャッシュキー
+            headers: レスポンスヘッダー
+            body: デコード済みボディ
+            size: ボディのバイト数
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        cacheable = (
+            (etag or last_modified)
+            and "no-store" not in headers.get("Cache-Control", "").lower()
+            and (self.max_bytes is None or size <= self.max_bytes)
+        )
+        with self._lock:
+            self.misses += 1
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            if not cacheable:
+                return
+            self._entries[key] = CacheEntry(etag, last_modified, body, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+
+    def parsed(self, key: Hashable, body: Any, parse: Callable[[Any], Any]) -> Any:
+        """
+        ボディをパース（同じボディのパース結果があれば再利用）
+
+        Args:
+            key: キャッシュキー
+            body: _make_request が返したボディ
+            parse: パース関数
+
+        Returns:
+            パース結果
+        """
+        entry = self.get(key)
+        if entry is None or entry.body is not body:
+            return parse(body)
+        result = entry.parsed.get(parse)
+        if result is None:
+            result = entry.parsed[parse] = parse(body)
+        return result
+
+    def invalidate(self, key: Hashable = None):
+        """エントリを削除（key 省略時は全削除）"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry.size
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return (
+            f"<ResponseCache entries={len(self._entries)}/{self.max_entries} "
+            f"bytes={self._bytes} hits={self.hits} misses={self.misses}>"
+        )
@@ -0,0 +1,151 @@
+"""
+Janus SDK ユーザーのアイデンティティマップ
+
+同じユーザーIDの User を1つのインスタンスにまとめます。履歴を読み込むと同じ投稿者が
+何千回も現れますが、各メッセージの author・メンバーディレクトリ・プロフィールのキャッシュが
+同じ User を共有するため、重複したオブジェクトを作らずに済みます。
+
+参照は弱参照で保持するため、どこからも使われなくなった User は通常どおり解放されます。
+新しいデータを受け取ると、既存のインスタンスのフィールドをその場で更新します。
+名前が変わった場合は attach したメンバーディレクトリの名前の索引も更新します。
+
+使用例:
+    client = Client(host, token, identity_map=True)
+    messages = client.get_messages(channel_id)
+    assert messages[0].author is client.identity_map.get(messages[0].author.id)
+"""
+
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+from .members import MemberDirectory
+from .models import User
+
+# 受信データから更新するフィールド
+_FIELDS = ("name", "display_name", "avatar_url", "status", "roles")
+# 変わるとメンバーディレクトリの索引を作り直すフィールド
+_NAME_FIELDS = ("name", "display_name")
+
+
+class UserIdentityMap:
+    """
+    ユーザーID → User の弱参照マップ（スレッドセーフ）
+    """
+
+    def __init__(self):
+        self._users: "weakref.WeakValueDictionary[str, User]" = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        # 名前の変更を通知するメンバーディレクトリ
+        self._directories: "weakref.WeakSet[MemberDirectory]" = weakref.WeakSet()
+        self.hits = 0
+        self.misses = 0
+
+    def attach(self, directory: MemberDirectory):
+        """
+        User の名前が変わったときに索引を更新するメンバーディレクトリを登録
+
+        共有している User をその場で更新するため、登録しないとディレクトリの名前の索引が古い名前のまま残ります。
+        ディレクトリは弱参照で保持します。
+        """
+        self._directories.add(directory)
+
+    def _renamed(self, user: User):
+        for directory in list(self._directories):
+            directory.reindex(user.id)
+
+    def get(self, user_id: str) -> Optional[User]:
+        """ユーザーIDで取得（保持していなければ None）"""
+        return self._users.get(user_id)
+
+    def intern(self, data: Dict[str, Any]) -> User:
+        """
+        ユーザーデータから User を取得
+
+        同じIDの User があれば、data に含まれるフィールドで更新してそれを返します。
+
+        Args:
+            data: API のユーザーデータ
+
+        Returns:
+            共有される User
+        """
+        user_id = data.get("id", "")
+        renamed = False
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                user = User.from_dict(data)
+                self._users[user_id] = user
+                self.misses += 1
+            else:
+                renamed = _update(user, data)
+                self.hits += 1
+        if renamed:
+            self._renamed(user)
+        return user
+
+    def intern_id(self, user_id: str) -> User:
+        """
+        ユーザーIDだけから User を取得（author がIDのみのメッセージなど）
+
+        既存の User があれば変更せずに返し、なければIDを名前とした User を作成します。
+        """
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is None:
+                user = User(id=user_id, name=user_id, display_name=user_id)
+                self._users[user_id] = user
+                self.misses += 1
+            else:
+                self.hits += 1
+            return user
+
+    def refresh(self, data: Dict[str, Any]) -> Optional[User]:
+        """
+        保持している User だけを更新（user_update イベントなど）
+
+        Returns:
+            更新した User（保持していなければ None）
+        """
+        renamed = False
+        with self._lock:
+            user = self._users.get(data.get("id", ""))
+            if user is not None:
+                renamed = _update(user, data)
+        if renamed:
+            self._renamed(user)
+        return user
+
+    def stats(self) -> Dict[str, Any]:
+        """統計情報"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._users),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __contains__(self, user_id) -> bool:
+        return user_id in self._users
+
+    def __len__(self):
+        return len(self._users)
+
+    def __repr__(self):
+        return f"<UserIdentityMap users={len(self._users)} hits={self.hits} misses={self.misses}>"
+
+
+def _update(user: User, data: Dict[str, Any]) -> bool:
+    """data に含まれるフィールドだけを反映（名前が変わったら True）"""
+    renamed = False
+    for name in _FIELDS:
+        if name in data:
+            value = data[name]
+            if name == "roles" and value is None:
+                value = []
+            if getattr(user, name) != value:
+                setattr(user, name, value)
+                renamed = renamed or name in _NAME_FIELDS
+    return renamed
@@ -0,0 +1,198 @@
+"""
+Janus SDK メンバーディレクトリ
+
+サーバーメンバーをユーザーID・表示名・ロールで索引化し、get_user / has_permission / is_admin を
+メンバー一覧の再取得や線形探索なしで解決します。一覧は TTL が切れたときだけ再取得し、
+その間は WebSocket の member_join イベントで差分更新します。
+
+使用例:
+    members = client.get_member_directory()
+    member = members.get(user_id)
+    admins = members.with_role("admin")
+    alice = members.find_by_name("Alice")
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .models import Member
+
+
+# 権限ごとに許可されるロール（オーナーは常に全権限）
+ROLE_PERMISSIONS: Dict[str, tuple] = {
+    "SEND_MESSAGES": ("owner", "admin", "member"),
+    "DELETE_MESSAGES": ("owner", "admin"),
+    "MANAGE_CHANNELS": ("owner", "admin"),
+    "MANAGE_SERVER": ("owner",),
+    "INVITE_USERS": ("owner", "admin", "member"),
+}
+
+ADMIN_ROLES = ("owner", "admin")
+
+
+def _name_key(name: str) -> str:
+    return name.casefold()
+
+
+class MemberDirectory:
+    """
+    サーバーメンバーの索引（スレッドセーフ）
+
+    - ユーザーID → Member
+    - 表示名（大文字小文字を区別しない。重複があり得るためリスト）→ Member
+    - ロール → {ユーザーID: Member}
+    """
+
+    def __init__(self, ttl: Optional[float] = 300.0):
+        """
+        Args:
+            ttl: メンバー一覧を再取得するまでの秒数（Noneで期限なし。イベントによる差分更新のみ）
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._by_id: Dict[str, Member] = {}
+        self._by_name: Dict[str, List[Member]] = {}
+        self._by_role: Dict[str, Dict[str, Member]] = {}
+        self._names: Dict[str, set] = {}             # ユーザーID → 索引に登録した名前
+        self._loaded_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        """一度でも一覧を読み込んだか"""
+        return self._loaded_at is not None
+
+    @property
+    def stale(self) -> bool:
+        """一覧の再取得が必要か（未読み込み・TTL 切れ）"""
+        if self._loaded_at is None:
+            return True
+        return self.ttl is not None and time.monotonic() - self._loaded_at >= self.ttl
+
+    def replace(self, members: Iterable[Member]):
+        """メンバー一覧で索引を作り直す"""
+        by_id: Dict[str, Member] = {}
+        by_name: Dict[str, List[Member]] = {}
+        by_role: Dict[str, Dict[str, Member]] = {}
+        names: Dict[str, set] = {}
+        for member in members:
+            self._index(member, by_id, by_name, by_role, names)
+        with self._lock:
+            self._by_id = by_id
+            self._by_name = by_name
+            self._by_role = by_role
+            self._names = names
+            self._loaded_at = time.monotonic()
+
+    @staticmethod
+    def _name_keys(member: Member) -> set:
+        user = member.user
+        return {_name_key(name) for name in (user.display_name, user.name) if name}
+
+    def _index(self, member: Member, by_id, by_name, by_role, names):
+        user_id = member.user.id
+        old = by_id.get(user_id)
+        if old is not None:
+            self._unindex(old, by_id, by_name, by_role, names)
+        by_id[user_id] = member
+        # User は共有されてその場で改名されることがあるため、削除用に登録した名前を覚えておく
+        keys = names[user_id] = self._name_keys(member)
+        for name in keys:
+            by_name.setdefault(name, []).append(member)
+        by_role.setdefault(member.role, {})[user_id] = member
+
+    def _unindex(self, member: Member, by_id, by_name, by_role, names):
+        user_id = member.user.id
+        by_id.pop(user_id, None)
+        for name in names.pop(user_id, ()):
+            same_name = [m for m in by_name.get(name, ()) if m.user.id != user_id]
+            if same_name:
+                by_name[name] = same_name
+            else:
+                by_name.pop(name, None)
+        role = by_role.get(member.role)
+        if role is not None:
+            role.pop(user_id, None)
+            if not role:
+                by_role.pop(member.role, None)
+
+    def add(self, member: Member):
+        """メンバーを追加・更新（member_join イベントなど）"""
+        with self._lock:
+            self._index(member, self._by_id, self._by_name, self._by_role, self._names)
+
+    def remove(self, user_id: str) -> Optional[Member]:
+        """メンバーを削除"""
+        with self._lock:
+            member = self._by_id.get(user_id)
+            if member is not None:
+                self._unindex(member, self._by_id, self._by_name, self._by_role, self._names)
+            return member
+
+    def reindex(self, user_id: str):
+        """メンバーの名前の索引を現在の名前で作り直す（User が改名された後など）"""
+        with self._lock:
+            member = self._by_id.get(user_id)
+            if member is not None:
+                self._index(member, self._by_id, self._by_name, self._by_role, self._names)
+
+    def invalidate(self):
+        """次回のアクセスで一覧を再取得させる（索引はそのまま残す）"""
+        with self._lock:
+            self._loaded_at = None
+
+    def get(self, user_id: str) -> Optional[Member]:
+        """ユーザーIDでメンバーを取得"""
+        return self._by_id.get(user_id)
+
+    def find_by_name(self, name: str) -> Optional[Member]:
+        """表示名（またはユーザー名）でメンバーを取得（大文字小文字を区別しない）"""
+        members = self._by_name.get(_name_key(name))
+        return members[0] if members else None
+
+    def find_all_by_name(self, name: str) -> List[Member]:
+        """表示名（またはユーザー名）が一致するメンバーをすべて取得"""
+        return list(self._by_name.get(_name_key(name), ()))
+
+    def with_role(self, role: str) -> List[Member]:
+        """指定ロールのメンバー一覧"""
+        return list(self._by_role.get(role, {}).values())
+
+    def online(self) -> List[Member]:
+        """オンラインのメンバー一覧"""
+        return [member for member in self if member.user.status == "online"]
+
+    def has_permission(self, user_id: str, permission: str) -> bool:
+        """
+        権限チェック
+
+        Args:
+            user_id: ユーザーID
+            permission: 権限名（ROLE_PERMISSIONS のキー）
+
+        Returns:
+            権限有無（メンバーでなければ False）
+        """
+        member = self.get(user_id)
+        if member is None:
+            return False
+        if member.role == "owner":
+            return True
+        return member.role in ROLE_PERMISSIONS.get(permission, ())
+
+    def is_admin(self, user_id: str) -> bool:
+        """オーナーまたは管理者か"""
+        member = self.get(user_id)
+        return member is not None and member.role in ADMIN_ROLES
+
+    def __contains__(self, user_id) -> bool:
+        return user_id in self._by_id
+
+    def __iter__(self) -> Iterator[Member]:
+        return iter(list(self._by_id.values()))
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __repr__(self):
+        return f"<MemberDirectory members={len(self._by_id)} ttl={self.ttl}>"
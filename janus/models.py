@@ -6,6 +6,12 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 
+from .timestamps import parse_timestamp, parse_epoch_us
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
 
 @dataclass
 class User:
@@ -31,6 +37,17 @@ class User:
             status=data.get("status", "offline"),
             roles=data.get("roles", [])
         )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """from_dict で復元できる辞書に変換"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "display_name": self.display_name,
+            "avatar_url": self.avatar_url,
+            "status": self.status,
+            "roles": list(self.roles),
+        }
 
 
 @dataclass 
@@ -42,13 +59,28 @@ class Member:
     joined_at: datetime
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Member':
+    def from_dict(cls, data: Dict[str, Any], users=None) -> 'Member':
+        """
+        Args:
+            data: API のメンバーデータ
+            users: User を共有する UserIdentityMap（省略時は毎回作成）
+        """
+        user_data = data.get("user", {})
         return cls(
             id=data.get("id", 0),
-            user=User.from_dict(data.get("user", {})),
+            user=users.intern(user_data) if users is not None else User.from_dict(user_data),
             role=data.get("role", "member"),
-            joined_at=datetime.fromisoformat(data.get("joined_at", datetime.now().isoformat()))
+            joined_at=parse_timestamp(data.get("joined_at")) or datetime.now()
         )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """from_dict で復元できる辞書に変換"""
+        return {
+            "id": self.id,
+            "user": self.user.to_dict(),
+            "role": self.role,
+            "joined_at": _isoformat(self.joined_at),
+        }
 
 
 @dataclass
@@ -70,9 +102,21 @@ class Channel:
             description=data.get("description", ""),
             type=data.get("type", "text"),
             server_id=data.get("server_id", 0),
-            created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None,
-            updated_at=datetime.fromisoformat(data["updated_at"]) if data.get("updated_at") else None
+            created_at=parse_timestamp(data.get("created_at")),
+            updated_at=parse_timestamp(data.get("updated_at"))
         )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """from_dict で復元できる辞書に変換"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "type": self.type,
+            "server_id": self.server_id,
+            "created_at": _isoformat(self.created_at),
+            "updated_at": _isoformat(self.updated_at),
+        }
 
 
 @dataclass
@@ -93,6 +137,30 @@ class Attachment:
             size=data.get("size", 0),
             content_type=data.get("content_type", "")
         )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """from_dict で復元できる辞書に変換"""
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "url": self.url,
+            "size": self.size,
+            "content_type": self.content_type,
+        }
+    
+    def download(self, client, dest: Optional[str] = None, **kwargs):
+        """
+        添付ファイルをダウンロード（client.download_attachment のショートカット）
+        
+        Args:
+            client: Client または AsyncClient（AsyncClient の場合は await が必要）
+            dest: 保存先のパス
+            **kwargs: download_attachment に渡す引数（segments, progress など）
+            
+        Returns:
+            ダウンロードしたファイルのパス
+        """
+        return client.download_attachment(self, dest, **kwargs)
 
 
 @dataclass
@@ -114,37 +182,137 @@ class Message:
             self.embeds = []
     
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Message':
-        # Handle author field - it might be a string (user_auth0_id) or dict
-        author_data = data.get("author", {})
-        if isinstance(author_data, str):
-            # If author is a string, create a User with minimal info
-            author = User(id=author_data, name=author_data, display_name=author_data)
-        elif isinstance(author_data, dict):
-            author = User.from_dict(author_data)
-        else:
-            author = User(id="unknown", name="Unknown", display_name="Unknown")
-        
-        # Handle timestamp/createdAt field
-        timestamp_str = data.get("timestamp") or data.get("createdAt")
-        if timestamp_str:
-            if isinstance(timestamp_str, str):
-                timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            else:
-                timestamp = datetime.now()
-        else:
-            timestamp = datetime.now()
-        
+    def from_dict(cls, data: Dict[str, Any], users=None) -> 'Message':
+        """
+        Args:
+            data: API のメッセージデータ
+            users: author の User を共有する UserIdentityMap（省略時は毎回作成）
+        """
         return cls(
             id=data.get("id", 0),
             channel_id=data.get("channel_id") or data.get("channelId", 0),
-            author=author,
+            author=_message_author(data, users),
             content=data.get("content", ""),
-            timestamp=timestamp,
-            edited_at=datetime.fromisoformat(data["edited_at"]) if data.get("edited_at") else None,
+            timestamp=_message_timestamp(data),
+            edited_at=parse_timestamp(data.get("edited_at"), memoize=False),
             attachments=[Attachment.from_dict(att) for att in data.get("attachments", [])],
             embeds=data.get("embeds", [])
         )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """from_dict で復元できる辞書に変換"""
+        return {
+            "id": self.id,
+            "channel_id": self.channel_id,
+            "author": self.author.to_dict(),
+            "content": self.content,
+            "timestamp": _isoformat(self.timestamp),
+            "edited_at": _isoformat(self.edited_at),
+            "attachments": [att.to_dict() for att in self.attachments],
+            "embeds": list(self.embeds),
+        }
+    
+    @property
+    def timestamp_us(self) -> Optional[int]:
+        """投稿日時の UNIX 時間（マイクロ秒）。タイムゾーンなしは UTC とみなす"""
+        return parse_epoch_us(self.timestamp)
+
+
+def _message_author(data: Dict[str, Any], users=None) -> User:
+    # Handle author field - it might be a string (user_auth0_id) or dict
+    author_data = data.get("author", {})
+    if isinstance(author_data, str):
+        # If author is a string, create a User with minimal info
+        if users is not None:
+            return users.intern_id(author_data)
+        return User(id=author_data, name=author_data, display_name=author_data)
+    elif isinstance(author_data, dict):
+        if users is not None:
+            return users.intern(author_data)
+        return User.from_dict(author_data)
+    else:
+        return User(id="unknown", name="Unknown", display_name="Unknown")
+
+
+def _message_timestamp(data: Dict[str, Any]) -> datetime:
+    # Handle timestamp/createdAt field
+    timestamp_str = data.get("timestamp") or data.get("createdAt")
+    if timestamp_str and isinstance(timestamp_str, str):
+        return parse_timestamp(timestamp_str, memoize=False)
+    return datetime.now()
+
+
+class _decoded:
+    """最初のアクセス時に値を計算してインスタンスに保存する（以降は通常の属性として参照される）"""
+    
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+    
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.name] = self.func(obj)
+        return value
+
+
+class LazyMessage(Message):
+    """
+    フィールドを最初にアクセスしたときにデコードするメッセージ
+    
+    受信した辞書をそのまま保持し、author / timestamp / attachments などは
+    参照されたときに初めて変換します（変換結果はキャッシュ）。
+    Message のサブクラスなので、Message と同じように扱えます。
+    """
+    
+    def __init__(self, data: Dict[str, Any], users=None):
+        self.raw = data
+        self._users = users
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], users=None) -> 'LazyMessage':
+        return cls(data, users)
+    
+    @_decoded
+    def id(self) -> int:
+        return self.raw.get("id", 0)
+    
+    @_decoded
+    def channel_id(self) -> int:
+        return self.raw.get("channel_id") or self.raw.get("channelId", 0)
+    
+    @_decoded
+    def author(self) -> User:
+        return _message_author(self.raw, self._users)
+    
+    @_decoded
+    def content(self) -> str:
+        return self.raw.get("content", "")
+    
+    @_decoded
+    def timestamp(self) -> datetime:
+        return _message_timestamp(self.raw)
+    
+    @_decoded
+    def timestamp_us(self) -> Optional[int]:
+        """投稿日時の UNIX 時間（マイクロ秒）。timestamp を参照せずに raw から直接変換する"""
+        value = self.raw.get("timestamp") or self.raw.get("createdAt")
+        if "timestamp" in self.__dict__ or not value or not isinstance(value, str):
+            return parse_epoch_us(self.timestamp)
+        return parse_epoch_us(value, memoize=False)
+    
+    @_decoded
+    def edited_at(self) -> Optional[datetime]:
+        return parse_timestamp(self.raw.get("edited_at"), memoize=False)
+    
+    @_decoded
+    def attachments(self) -> List[Attachment]:
+        return [Attachment.from_dict(att) for att in self.raw.get("attachments", [])]
+    
+    @_decoded
+    def embeds(self) -> List[Dict[str, Any]]:
+        return self.raw.get("embeds", [])
 
 
 @dataclass
@@ -167,5 +335,17 @@ class Server:
             invite_code=data.get("invite_code"),
             api_token=data.get("api_token"),
             member_count=data.get("member_count", 0),
-            created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
+            created_at=parse_timestamp(data.get("created_at"))
         )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """from_dict で復元できる辞書に変換（api_token を含む）"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "icon_url": self.icon_url,
+            "invite_code": self.invite_code,
+            "api_token": self.api_token,
+            "member_count": self.member_count,
+            "created_at": _isoformat(self.created_at),
+        }
@@ -0,0 +1,110 @@
+"""
+Janus SDK ページネーション
+
+メッセージ履歴を `before` / `after` カーソルで辿るための状態管理です。
+Client.iter_messages / AsyncClient.iter_messages と get_message_batch から利用されます。
+"""
+
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional
+
+from .models import Message
+
+_message_id = attrgetter("id")
+
+
+class HistoryCursor:
+    """
+    メッセージ履歴のカーソル
+
+    - `after` のみ指定: 古い → 新しい方向に辿る（カーソルはページ内の最大ID）
+    - それ以外: 新しい → 古い方向に辿る（カーソルはページ内の最小ID）。
+      `after` も指定されていれば、そのIDに達した時点で終了
+
+    サーバーがページ内をどの順で返しても、辿る方向に並べ直してから返します。
+    """
+
+    def __init__(
+        self,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+        page_size: int = 100,
+        limit: Optional[int] = None
+    ):
+        """
+        Args:
+            before: このIDより前のメッセージから取得
+            after: このIDより後のメッセージまで取得
+            page_size: 1リクエストあたりの取得件数
+            limit: 取得する最大件数（Noneで全件）
+        """
+        if page_size < 1:
+            raise ValueError("page_size は1以上である必要があります")
+        self.forward = after is not None and before is None
+        self.before = before
+        self.after = after
+        self.page_size = page_size
+        self.remaining = limit
+        self.done = limit is not None and limit <= 0
+
+    def params(self) -> Dict[str, Any]:
+        """次のページを取得するためのクエリパラメータ"""
+        size = self.page_size
+        if self.remaining is not None:
+            size = min(size, self.remaining)
+        params = {"limit": size}
+        if self.forward:
+            params["after"] = self.after
+        elif self.before is not None:
+            params["before"] = self.before
+        return params
+
+    def advance(self, page: List[Message], key: Optional[Callable[[Any], int]] = None) -> List[Message]:
+        """
+        取得したページでカーソルを進める
+
+        Args:
+            page: get_messages が返したページ
+            key: 要素からメッセージIDを取り出す関数（省略時は Message.id。API の辞書をそのまま辿る場合に指定）
+
+        Returns:
+            呼び出し元に返すメッセージ（辿る方向順、範囲外と上限超過分を除外）
+        """
+        if key is None:
+            key = _message_id
+        # サーバーが要求件数未満を返したら最後のページ
+        last_page = len(page) < self.params()["limit"]
+        if not page:
+            self.done = True
+            return []
+
+        if self.forward:
+            page = sorted(page, key=key)
+            page = [m for m in page if key(m) > self.after]
+            if page:
+                self.after = key(page[-1])
+        else:
+            page = sorted(page, key=key, reverse=True)
+            if self.before is not None:
+                page = [m for m in page if key(m) < self.before]
+            if page:
+                self.before = key(page[-1])
+            if self.after is not None:
+                in_range = [m for m in page if key(m) > self.after]
+                if len(in_range) < len(page):
+                    self.done = True
+                page = in_range
+
+        if not page:
+            # カーソルが進まない（サーバーがカーソルを無視した）場合は無限ループを防ぐ
+            self.done = True
+            return []
+
+        if self.remaining is not None:
+            page = page[:self.remaining]
+            self.remaining -= len(page)
+            if self.remaining <= 0:
+                self.done = True
+        if last_page:
+            self.done = True
+        return page
@@ -0,0 +1,457 @@
+"""
+Janus SDK レート制限
+
+トークンバケット方式のレートリミッターを提供します。
+すべてのリミッターはスレッドセーフで、同期（acquire）・非同期（acquire_async）・
+ノンブロッキング（try_acquire）の3種類の取得方法をサポートします。
+
+使用例:
+    limiter = TokenBucket(rate=60, per=60.0)
+    client_a = Client(host, token, rate_limiter=limiter)
+    client_b = Client(host, token, rate_limiter=limiter)  # 同じ枠を共有
+
+    # 同一ホスト上の複数プロセスで共有する場合
+    limiter = SQLiteTokenBucket("/tmp/janus_ratelimit.db", rate=60, per=60.0)
+"""
+
+import asyncio
+import re
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    """
+    レートリミッター基底クラス
+
+    サブクラスは `_reserve` を実装します。`_reserve` はトークンを予約し、
+    予約したトークンが使えるようになるまでの待機秒数を返します。
+    """
+
+    def _reserve(self, tokens: int, max_wait: Optional[float]) -> Optional[float]:
+        """
+        トークンを予約
+
+        Args:
+            tokens: 消費するトークン数
+            max_wait: 許容する最大待機秒数（Noneで無制限）
+
+        Returns:
+            待機秒数（0なら即時利用可）。max_wait を超える場合は予約せず None
+        """
+        raise NotImplementedError
+
+    def time_until_available(self, tokens: int = 1) -> float:
+        """トークンを消費せずに、利用可能になるまでの秒数を返す"""
+        raise NotImplementedError
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """
+        ノンブロッキングでトークンを取得
+
+        Returns:
+            取得できた場合 True
+        """
+        return self._reserve(tokens, 0.0) == 0.0
+
+    def acquire(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        トークンを取得（必要なら現在のスレッドで待機）
+
+        Args:
+            tokens: 消費するトークン数
+            timeout: 最大待機秒数（Noneで無制限）
+
+        Returns:
+            取得できた場合 True、timeout 内に取得できない場合 False
+        """
+        wait = self._reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    async def acquire_async(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        """
+        トークンを取得（イベントループをブロックせずに待機）
+
+        Args:
+            tokens: 消費するトークン数
+            timeout: 最大待機秒数（Noneで無制限）
+
+        Returns:
+            取得できた場合 True、timeout 内に取得できない場合 False
+        """
+        wait = self._reserve(tokens, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+
+class TokenBucket(RateLimiter):
+    """
+    プロセス内トークンバケット
+
+    `per` 秒あたり `rate` 個のトークンを補充します。1回の取得は O(1) です。
+    待機が必要な取得はトークンを前借り（残量がマイナス）して順番を確保するため、
+    複数スレッド・コルーチンが同時に待っても割り当てが公平になります。
+    """
+
+    def __init__(self, rate: float, per: float = 60.0, capacity: Optional[float] = None):
+        """
+        Args:
+            rate: per 秒あたりのトークン数
+            per: 補充期間（秒）
+            capacity: バケット容量（バースト上限）。省略時は rate
+        """
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate と per は正の値である必要があります")
+        self.rate = rate
+        self.per = per
+        self.capacity = capacity if capacity is not None else rate
+        self._fill_rate = rate / per
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self._fill_rate)
+            self._updated = now
+
+    def _reserve(self, tokens: int, max_wait: Optional[float]) -> Optional[float]:
+        if tokens > self.capacity:
+            raise ValueError(f"要求トークン数 {tokens} がバケット容量 {self.capacity} を超えています")
+        with self._lock:
+            self._refill(time.monotonic())
+            deficit = tokens - self._tokens
+            wait = deficit / self._fill_rate if deficit > 0 else 0.0
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= tokens
+            return wait
+
+    def time_until_available(self, tokens: int = 1) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            deficit = tokens - self._tokens
+            return deficit / self._fill_rate if deficit > 0 else 0.0
+
+    @property
+    def available(self) -> float:
+        """現在のトークン残量"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def __repr__(self):
+        return f"<TokenBucket rate={self.rate}/{self.per}s capacity={self.capacity}>"
+
+
+class SQLiteTokenBucket(RateLimiter):
+    """
+    SQLite ファイルを介して複数プロセスで共有するトークンバケット
+
+    同一ホスト上の複数のBotプロセスが同じデータベースファイルを指定すると、
+    全体で1つのレート枠を共有します。更新は `BEGIN IMMEDIATE` トランザクションで
+    直列化されるため、プロセス間でも取得がアトミックになります。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rate: float,
+        per: float = 60.0,
+        capacity: Optional[float] = None,
+        name: str = "default",
+        busy_timeout: float = 10.0
+    ):
+        """
+        Args:
+            path: SQLite データベースファイルのパス
+            rate: per 秒あたりのトークン数
+            per: 補充期間（秒）
+            capacity: バケット容量（バースト上限）。省略時は rate
+            name: バケット名（1つのファイルに複数のバケットを保存可能）
+            busy_timeout: ロック待ちの最大秒数
+        """
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate と per は正の値である必要があります")
+        self.path = path
+        self.rate = rate
+        self.per = per
+        self.capacity = capacity if capacity is not None else rate
+        self.name = name
+        self._fill_rate = rate / per
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path,
+            timeout=busy_timeout,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS janus_token_buckets ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _current(self, cursor: sqlite3.Cursor, now: float) -> float:
+        """補充分を反映した現在のトークン残量"""
+        row = cursor.execute(
+            "SELECT tokens, updated FROM janus_token_buckets WHERE name = ?",
+            (self.name,)
+        ).fetchone()
+        if row is None:
+            return float(self.capacity)
+        return min(self.capacity, row[0] + max(0.0, now - row[1]) * self._fill_rate)
+
+    def _reserve(self, tokens: int, max_wait: Optional[float]) -> Optional[float]:
+        if tokens > self.capacity:
+            raise ValueError(f"要求トークン数 {tokens} がバケット容量 {self.capacity} を超えています")
+        with self._lock:
+            cursor = self._conn.cursor()
+            try:
+                # BEGIN に失敗したら ROLLBACK しない（ROLLBACK のエラーで元の例外が隠れる）
+                cursor.execute("BEGIN IMMEDIATE")
+            except Exception:
+                cursor.close()
+                raise
+            try:
+                now = time.time()
+                current = self._current(cursor, now)
+                deficit = tokens - current
+                wait = deficit / self._fill_rate if deficit > 0 else 0.0
+                if max_wait is not None and wait > max_wait:
+                    cursor.execute("ROLLBACK")
+                    return None
+                cursor.execute(
+                    "INSERT OR REPLACE INTO janus_token_buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                    (self.name, current - tokens, now)
+                )
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            finally:
+                cursor.close()
+        return wait
+
+    async def acquire_async(self, tokens: int = 1, timeout: Optional[float] = None) -> bool:
+        # 予約はロック待ち（最大 busy_timeout 秒）を伴う書き込みなので、イベントループを塞がないようスレッドで実行
+        wait = await asyncio.get_running_loop().run_in_executor(None, self._reserve, tokens, timeout)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def time_until_available(self, tokens: int = 1) -> float:
+        # 参照のみ（書き込みロックを取らない）
+        with self._lock:
+            cursor = self._conn.cursor()
+            try:
+                deficit = tokens - self._current(cursor, time.time())
+            finally:
+                cursor.close()
+        return deficit / self._fill_rate if deficit > 0 else 0.0
+
+    def close(self):
+        """データベース接続を閉じる"""
+        with self._lock:
+            self._conn.close()
+
+    def __repr__(self):
+        return f"<SQLiteTokenBucket path='{self.path}' name='{self.name}' rate={self.rate}/{self.per}s>"
+
+
+_ID_SEGMENT = re.compile(r"^\d+$")
+# ルートを区別するパラメータ（この直後のIDはルートキーに残す）
+_MAJOR_PARAMETERS = ("servers", "channels")
+
+
+def route_key(method: str, endpoint: str) -> str:
+    """
+    リクエストのルートキーを生成
+
+    サーバーID・チャンネルIDはキーに残し（チャンネルごとに別のバケットになる）、
+    それ以外のID（メッセージIDなど）は `{id}` に置き換えます。
+
+    例:
+        route_key("GET", "/servers/1/channels/5/messages") -> "GET /servers/1/channels/5/messages"
+        route_key("DELETE", "/servers/1/messages/99")      -> "DELETE /servers/1/messages/{id}"
+    """
+    segments = endpoint.strip("/").split("/")
+    normalized = []
+    for i, segment in enumerate(segments):
+        if _ID_SEGMENT.match(segment) and not (i > 0 and segments[i - 1] in _MAJOR_PARAMETERS):
+            normalized.append("{id}")
+        else:
+            normalized.append(segment)
+    return f"{method.upper()} /{'/'.join(normalized)}"
+
+
+def parse_retry_after(headers, default: float = 60.0) -> float:
+    """
+    Retry-After ヘッダーを秒数に変換
+
+    秒数（小数可）と HTTP-date の両形式に対応します。
+
+    Args:
+        headers: レスポンスヘッダー
+        default: ヘッダーがない・解釈できない場合の値
+
+    Returns:
+        待機秒数
+    """
+    value = headers.get("Retry-After")
+    if value is None:
+        value = headers.get("X-RateLimit-Reset-After")
+    if value is None:
+        return default
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return default
+
+
+class _RouteState:
+    """ルートごとのレート制限状態"""
+
+    __slots__ = ("limit", "remaining", "reset_at", "blocked_until")
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+
+
+class RouteRateLimiter:
+    """
+    ルート（エンドポイント）ごとのレート制限
+
+    サーバーから返される `X-RateLimit-*` ヘッダーと 429 レスポンスの
+    `Retry-After` を学習し、制限中のルートへのリクエストだけを待機させます。
+    あるチャンネルが制限されても、他のチャンネルやメンバー一覧への通信は止まりません。
+    スレッドセーフで、複数のクライアント間で共有できます。
+    """
+
+    GLOBAL = "*"
+
+    def __init__(self, max_routes: int = 4096):
+        """
+        Args:
+            max_routes: 保持するルート状態の上限（超えると期限切れのものを破棄し、
+                それでも多ければ最後の更新が古いものから破棄）
+        """
+        self.max_routes = max_routes
+        self._routes: Dict[str, _RouteState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, key: str) -> _RouteState:
+        # 更新したルートを末尾に移し、辞書の並びを最後の更新順に保つ
+        state = self._routes.pop(key, None)
+        if state is None:
+            if len(self._routes) >= self.max_routes:
+                self._prune(time.monotonic())
+            state = _RouteState()
+        self._routes[key] = state
+        return state
+
+    def _prune(self, now: float):
+        expired = [
+            key for key, state in self._routes.items()
+            if state.blocked_until <= now and state.reset_at <= now
+        ]
+        for key in expired:
+            del self._routes[key]
+        if len(self._routes) < self.max_routes:
+            return
+        # 期限切れがなければ最後の更新が古いものから破棄（毎回走査しないよう上限の 3/4 まで減らす）
+        excess = len(self._routes) - self.max_routes * 3 // 4
+        oldest = [key for key in self._routes if key != self.GLOBAL][:excess]
+        for key in oldest:
+            del self._routes[key]
+
+    def _route_wait(self, key: str, now: float) -> float:
+        state = self._routes.get(key)
+        if state is None:
+            return 0.0
+        wait = state.blocked_until - now
+        if state.remaining is not None and state.remaining <= 0:
+            wait = max(wait, state.reset_at - now)
+        return max(0.0, wait)
+
+    def wait_time(self, key: str) -> float:
+        """
+        ルートが利用可能になるまでの秒数
+
+        Args:
+            key: route_key() で生成したルートキー
+
+        Returns:
+            待機秒数（0なら即時送信可）
+        """
+        now = time.monotonic()
+        with self._lock:
+            return max(self._route_wait(key, now), self._route_wait(self.GLOBAL, now))
+
+    def update(self, key: str, headers):
+        """
+        レスポンスヘッダーからルートの残量を更新
+
+        Args:
+            key: ルートキー
+            headers: レスポンスヘッダー
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        now = time.monotonic()
+        try:
+            remaining = int(float(remaining))
+            limit = headers.get("X-RateLimit-Limit")
+            reset_after = headers.get("X-RateLimit-Reset-After")
+            if reset_after is not None:
+                reset_at = now + float(reset_after)
+            elif headers.get("X-RateLimit-Reset") is not None:
+                reset_at = now + max(0.0, float(headers["X-RateLimit-Reset"]) - time.time())
+            else:
+                reset_at = now
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            state = self._state(key)
+            state.remaining = remaining
+            state.reset_at = reset_at
+            if limit is not None:
+                try:
+                    state.limit = int(float(limit))
+                except (TypeError, ValueError):
+                    pass
+
+    def block(self, key: str, retry_after: float, is_global: bool = False):
+        """
+        429 レスポンスを受けてルートを一定時間ブロック
+
+        Args:
+            key: ルートキー
+            retry_after: ブロックする秒数
+            is_global: サーバーがグローバル制限を示した場合 True（全ルートをブロック）
+        """
+        until = time.monotonic() + retry_after
+        with self._lock:
+            state = self._state(self.GLOBAL if is_global else key)
+            state.blocked_until = max(state.blocked_until, until)
@@ -0,0 +1,201 @@
+"""
+Janus SDK 再試行ポリシー
+
+非相関ジッター（decorrelated jitter）付きの指数バックオフ、
+最大経過時間、分あたりの再試行予算、冪等性を考慮した再試行判定を提供します。
+
+使用例:
+    policy = RetryPolicy(max_attempts=5, max_elapsed=30.0, retry_budget_per_minute=20)
+    client = Client(host, token, retry_policy=policy)
+
+    print(client.retry_stats)  # {'requests': 120, 'retries': 3, ...}
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from .ratelimit import TokenBucket
+
+
+# 再送しても副作用が重複しないHTTPメソッド
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryStats:
+    """
+    再試行の統計情報（スレッドセーフ）
+
+    Attributes:
+        requests: リクエスト（論理）数
+        retries: 再試行した回数
+        gave_up: 再試行を諦めてエラーにした回数
+        budget_exhausted: 再試行予算切れで諦めた回数
+        by_reason: 再試行理由ごとの回数 ("connect", "timeout", "status_503", "rate_limit" など)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """カウンターをリセット"""
+        with self._lock:
+            self.requests = 0
+            self.retries = 0
+            self.gave_up = 0
+            self.budget_exhausted = 0
+            self.by_reason: Dict[str, int] = {}
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_retry(self, reason: str):
+        with self._lock:
+            self.retries += 1
+            self.by_reason[reason] = self.by_reason.get(reason, 0) + 1
+
+    def record_give_up(self, budget_exhausted: bool = False):
+        with self._lock:
+            self.gave_up += 1
+            if budget_exhausted:
+                self.budget_exhausted += 1
+
+    def as_dict(self) -> Dict[str, object]:
+        """統計のスナップショットを辞書で取得"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "gave_up": self.gave_up,
+                "budget_exhausted": self.budget_exhausted,
+                "by_reason": dict(self.by_reason)
+            }
+
+    def __repr__(self):
+        return f"<RetryStats {self.as_dict()}>"
+
+
+class RetryPolicy:
+    """
+    再試行ポリシー
+
+    待機時間は decorrelated jitter（`min(max_delay, uniform(base_delay, 前回の待機 * 3))`）で
+    決めるため、多数のBotが同時に再接続しても再試行のタイミングが分散します。
+
+    POST などの冪等でないリクエストは、サーバーに届いていないことが確実な場合
+    （接続確立前の失敗）か、冪等キー（Idempotency-Key）付きの場合にだけ再試行します。
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        max_elapsed: Optional[float] = 60.0,
+        retry_statuses: Iterable[int] = (502, 503, 504),
+        retry_budget_per_minute: Optional[int] = None,
+        idempotent_methods: Iterable[str] = IDEMPOTENT_METHODS
+    ):
+        """
+        Args:
+            max_attempts: 最大試行回数（初回を含む）
+            base_delay: 最小待機秒数
+            max_delay: 1回あたりの最大待機秒数
+            max_elapsed: 初回リクエストからの最大経過秒数（Noneで無制限）
+            retry_statuses: 再試行するHTTPステータスコード
+            retry_budget_per_minute: 分あたりに使える再試行回数（Noneで無制限）。
+                                     ポリシーを共有するクライアント全体で消費されます
+            idempotent_methods: 常に再試行してよいHTTPメソッド
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts は1以上である必要があります")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_elapsed = max_elapsed
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+        self.retry_budget_per_minute = retry_budget_per_minute
+        self._budget = (
+            TokenBucket(retry_budget_per_minute, per=60.0)
+            if retry_budget_per_minute else None
+        )
+        self.stats = RetryStats()
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """再試行対象のステータスコードか"""
+        return status_code in self.retry_statuses
+
+    def is_safe_to_retry(self, method: str, request_sent: bool, has_idempotency_key: bool = False) -> bool:
+        """
+        冪等性の観点から再送信してよいか
+
+        Args:
+            method: HTTPメソッド
+            request_sent: リクエストがサーバーに届いた可能性があるか
+            has_idempotency_key: Idempotency-Key ヘッダー付きか
+        """
+        return (
+            method.upper() in self.idempotent_methods
+            or not request_sent
+            or has_idempotency_key
+        )
+
+    def next_delay(self, previous_delay: float) -> float:
+        """decorrelated jitter による次の待機秒数"""
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+    def backoff(
+        self,
+        method: str,
+        attempt: int,
+        started: float,
+        previous_delay: float,
+        reason: str,
+        request_sent: bool = True,
+        has_idempotency_key: bool = False
+    ) -> Optional[float]:
+        """
+        再試行するかを判定し、待機秒数を返す
+
+        再試行する場合は統計と予算を更新します。
+
+        Args:
+            method: HTTPメソッド
+            attempt: 失敗した試行の番号（0始まり）
+            started: 初回リクエストの time.monotonic()
+            previous_delay: 前回の待機秒数（初回は0）
+            reason: 再試行理由（統計用）
+            request_sent: リクエストがサーバーに届いた可能性があるか
+            has_idempotency_key: Idempotency-Key ヘッダー付きか
+
+        Returns:
+            待機秒数。再試行しない場合は None
+        """
+        if attempt + 1 >= self.max_attempts:
+            self.stats.record_give_up()
+            return None
+        if not self.is_safe_to_retry(method, request_sent, has_idempotency_key):
+            self.stats.record_give_up()
+            return None
+
+        delay = self.next_delay(previous_delay)
+        if self.max_elapsed is not None and time.monotonic() - started + delay > self.max_elapsed:
+            self.stats.record_give_up()
+            return None
+        if self._budget is not None and not self._budget.try_acquire():
+            self.stats.record_give_up(budget_exhausted=True)
+            return None
+
+        self.stats.record_retry(reason)
+        return delay
+
+    def __repr__(self):
+        return (
+            f"<RetryPolicy max_attempts={self.max_attempts} "
+            f"delay={self.base_delay}-{self.max_delay}s max_elapsed={self.max_elapsed}>"
+        )
@@ -0,0 +1,517 @@
+"""
+Janus SDK データモデルのシリアライズ
+
+janus.models のモデル（User / Member / Channel / Attachment / Message / Server）を
+msgpack 形式のコンパクトなバイト列に変換します。ディスクへのキャッシュやワーカープロセス間の受け渡しに使えます。
+
+- 各モデルはフィールド名を持たない配列（スキーマの順）として保存し、先頭にスキーマのバージョンを書き込む
+- dumps_many はメッセージの投稿者・メンバーのユーザーを表にまとめ、各行からは番号で参照する
+  （読み込んだ後も同じ内容の User は1つのインスタンスを共有します）
+- 読み込みで作られるのは None・真偽値・数値・文字列・バイト列・リスト・辞書とモデルだけなので、
+  pickle と違い信頼できないファイルを読み込んでも任意のコードは実行されません
+
+msgpack がインストールされていればそれを使い（pip install janus-sdk[speedups]）、
+なければ同じ形式を読み書きする純 Python の実装にフォールバックします。
+辞書形式が必要な場合は各モデルの to_dict() / from_dict() を使ってください。
+
+使用例:
+    from janus.serialization import dumps_many, loads_many
+    with open("history.bin", "wb") as f:
+        f.write(dumps_many(messages))
+    with open("history.bin", "rb") as f:
+        messages = loads_many(f.read())
+"""
+
+import struct
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .models import Attachment, Channel, Member, Message, Server, User
+
+try:
+    import msgpack
+    _MSGPACK_AVAILABLE = True
+except Exception:
+    msgpack = None
+    _MSGPACK_AVAILABLE = False
+
+MAGIC = "janus"
+SCHEMA_VERSION = 1
+
+# モデルごとのフィールドの並び。フィールドを追加するときは末尾に追加し（既定値を持たせる）、
+# SCHEMA_VERSION を上げる。古いバージョンの行は不足するフィールドが既定値になる
+SCHEMAS = {
+    "User": ("id", "name", "display_name", "avatar_url", "status", "roles"),
+    "Member": ("id", "user", "role", "joined_at"),
+    "Channel": ("id", "name", "description", "type", "server_id", "created_at", "updated_at"),
+    "Attachment": ("id", "filename", "url", "size", "content_type"),
+    "Message": ("id", "channel_id", "author", "content", "timestamp", "edited_at", "attachments", "embeds"),
+    "Server": ("id", "name", "icon_url", "invite_code", "api_token", "member_count", "created_at"),
+}
+
+_MODELS = {
+    "User": User,
+    "Member": Member,
+    "Channel": Channel,
+    "Attachment": Attachment,
+    "Message": Message,
+    "Server": Server,
+}
+_KINDS = {model: kind for kind, model in _MODELS.items()}
+_GETTERS = {kind: attrgetter(*fields) for kind, fields in SCHEMAS.items()}
+
+# datetime のフィールドの位置。UTC は UNIX 時間（マイクロ秒）の整数、タイムゾーンなしは [マイクロ秒]、
+# その他のオフセットは [マイクロ秒, オフセットの秒] として保存する
+_DATETIME_FIELDS = {
+    kind: tuple(i for i, name in enumerate(fields) if name.endswith("_at") or name == "timestamp")
+    for kind, fields in SCHEMAS.items()
+}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_SECOND = timedelta(seconds=1)
+
+# 入れ子の深さの上限（埋め込みなど任意の JSON を含むため）
+_MAX_DEPTH = 64
+
+
+def _kind_of(model: Any) -> str:
+    for cls in type(model).__mro__:
+        kind = _KINDS.get(cls)
+        if kind is not None:
+            return kind
+    raise TypeError(f"シリアライズできないオブジェクトです: {type(model).__name__}")
+
+
+def _encode_datetime(value: Any) -> Any:
+    if value is None:
+        return None
+    offset = value.utcoffset()
+    if offset is None:
+        return [(value - _NAIVE_EPOCH) // _MICROSECOND]
+    epoch_us = (value - _EPOCH) // _MICROSECOND
+    return [epoch_us, offset // _SECOND] if offset else epoch_us
+
+
+def _decode_datetime(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return _EPOCH + timedelta(microseconds=value)
+    if isinstance(value, list) and len(value) == 1 and isinstance(value[0], int):
+        return _NAIVE_EPOCH + timedelta(microseconds=value[0])
+    if isinstance(value, list) and len(value) == 2 and all(isinstance(v, int) for v in value):
+        return (_EPOCH + timedelta(microseconds=value[0])).astimezone(timezone(timedelta(seconds=value[1])))
+    raise ValueError(f"日時のデータが正しくありません: {value!r}")
+
+
+# 純 Python の msgpack 実装（msgpack がない場合）
+def _pack(obj: Any, out: bytearray, depth: int = 0):
+    if depth > _MAX_DEPTH:
+        raise ValueError("入れ子が深すぎます")
+    if obj is None:
+        out.append(0xc0)
+    elif obj is True:
+        out.append(0xc3)
+    elif obj is False:
+        out.append(0xc2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -0x20 <= obj < 0:
+            out.append(obj & 0xff)
+        elif obj >= 0:
+            if obj <= 0xff:
+                out += struct.pack(">BB", 0xcc, obj)
+            elif obj <= 0xffff:
+                out += struct.pack(">BH", 0xcd, obj)
+            elif obj <= 0xffffffff:
+                out += struct.pack(">BI", 0xce, obj)
+            else:
+                out += struct.pack(">BQ", 0xcf, obj)
+        elif obj >= -0x80:
+            out += struct.pack(">Bb", 0xd0, obj)
+        elif obj >= -0x8000:
+            out += struct.pack(">Bh", 0xd1, obj)
+        elif obj >= -0x80000000:
+            out += struct.pack(">Bi", 0xd2, obj)
+        else:
+            out += struct.pack(">Bq", 0xd3, obj)
+    elif isinstance(obj, str):
+        data = obj.encode("utf-8")
+        size = len(data)
+        if size < 32:
+            out.append(0xa0 | size)
+        elif size <= 0xff:
+            out += struct.pack(">BB", 0xd9, size)
+        elif size <= 0xffff:
+            out += struct.pack(">BH", 0xda, size)
+        else:
+            out += struct.pack(">BI", 0xdb, size)
+        out += data
+    elif isinstance(obj, float):
+        out += struct.pack(">Bd", 0xcb, obj)
+    elif isinstance(obj, (list, tuple)):
+        size = len(obj)
+        if size < 16:
+            out.append(0x90 | size)
+        elif size <= 0xffff:
+            out += struct.pack(">BH", 0xdc, size)
+        else:
+            out += struct.pack(">BI", 0xdd, size)
+        for value in obj:
+            _pack(value, out, depth + 1)
+    elif isinstance(obj, dict):
+        size = len(obj)
+        if size < 16:
+            out.append(0x80 | size)
+        elif size <= 0xffff:
+            out += struct.pack(">BH", 0xde, size)
+        else:
+            out += struct.pack(">BI", 0xdf, size)
+        for key, value in obj.items():
+            _pack(key, out, depth + 1)
+            _pack(value, out, depth + 1)
+    elif isinstance(obj, (bytes, bytearray)):
+        size = len(obj)
+        if size <= 0xff:
+            out += struct.pack(">BB", 0xc4, size)
+        elif size <= 0xffff:
+            out += struct.pack(">BH", 0xc5, size)
+        else:
+            out += struct.pack(">BI", 0xc6, size)
+        out += obj
+    else:
+        raise TypeError(f"シリアライズできない値です: {type(obj).__name__}")
+
+
+def _read(data: bytes, pos: int, depth: int = 0) -> Tuple[Any, int]:
+    """
+    msgpack の値を1つ読み込む（長さ・入れ子の深さを検証し、基本型だけを返す。拡張型は受け付けない）
+
+    Returns:
+        (値, 次の位置)
+    """
+    tag = data[pos]
+    pos += 1
+    if tag < 0x80:
+        return tag, pos
+    if tag >= 0xe0:
+        return tag - 0x100, pos
+    if tag >= 0xa0 and tag <= 0xbf:
+        return _read_text(data, pos, tag & 0x1f)
+    if tag >= 0x90 and tag <= 0x9f:
+        return _read_array(data, pos, tag & 0x0f, depth)
+    if tag >= 0x80 and tag <= 0x8f:
+        return _read_map(data, pos, tag & 0x0f, depth)
+    if tag == 0xc0:
+        return None, pos
+    if tag == 0xc2:
+        return False, pos
+    if tag == 0xc3:
+        return True, pos
+    fmt = _FIXED.get(tag)
+    if fmt is not None:
+        return fmt.unpack_from(data, pos)[0], pos + fmt.size
+    kind = _SIZED.get(tag)
+    if kind is None:
+        raise ValueError(f"不正なデータです（タグ 0x{tag:02x}）")
+    reader, fmt = kind
+    if isinstance(fmt, int):
+        size = fmt
+    else:
+        size = fmt.unpack_from(data, pos)[0]
+        pos += fmt.size
+    if reader is _read_array or reader is _read_map:
+        return reader(data, pos, size, depth)
+    return reader(data, pos, size)
+
+
+def _check_size(data: bytes, pos: int, size: int):
+    # 要素は少なくとも1バイトなので、残りのバイト数を超える長さ・件数は不正
+    if pos + size > len(data):
+        raise ValueError("データが途中で終わっています")
+
+
+def _read_text(data: bytes, pos: int, size: int) -> Tuple[str, int]:
+    end = pos + size
+    _check_size(data, pos, size)
+    return data[pos:end].decode("utf-8"), end
+
+
+def _read_bytes(data: bytes, pos: int, size: int) -> Tuple[bytes, int]:
+    end = pos + size
+    _check_size(data, pos, size)
+    return data[pos:end], end
+
+
+def _read_array(data: bytes, pos: int, size: int, depth: int) -> Tuple[List[Any], int]:
+    if depth >= _MAX_DEPTH:
+        raise ValueError("入れ子が深すぎます")
+    _check_size(data, pos, size)
+    items = []
+    append = items.append
+    depth += 1
+    length = len(data)
+    for _ in range(size):
+        # 行の大半を占める小さい整数・短い文字列・None はその場で読む
+        tag = data[pos]
+        if tag < 0x80:
+            append(tag)
+            pos += 1
+        elif tag >= 0xa0 and tag <= 0xbf:
+            end = pos + 1 + (tag & 0x1f)
+            if end > length:
+                raise ValueError("データが途中で終わっています")
+            append(data[pos + 1:end].decode("utf-8"))
+            pos = end
+        elif tag == 0xc0:
+            append(None)
+            pos += 1
+        else:
+            value, pos = _read(data, pos, depth)
+            append(value)
+    return items, pos
+
+
+def _read_map(data: bytes, pos: int, size: int, depth: int) -> Tuple[Dict[str, Any], int]:
+    if depth >= _MAX_DEPTH:
+        raise ValueError("入れ子が深すぎます")
+    _check_size(data, pos, size)
+    result = {}
+    depth += 1
+    for _ in range(size):
+        key, pos = _read(data, pos, depth)
+        if not isinstance(key, (str, bytes)):
+            raise ValueError("辞書のキーは文字列である必要があります")
+        result[key], pos = _read(data, pos, depth)
+    return result, pos
+
+
+_INT8 = struct.Struct(">b")
+_U8 = struct.Struct(">B")
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_FIXED = {
+    0xcc: _U8, 0xcd: _U16, 0xce: _U32, 0xcf: struct.Struct(">Q"),
+    0xd0: _INT8, 0xd1: struct.Struct(">h"), 0xd2: struct.Struct(">i"), 0xd3: struct.Struct(">q"),
+    0xca: struct.Struct(">f"), 0xcb: struct.Struct(">d"),
+}
+_SIZED = {
+    0xd9: (_read_text, _U8), 0xda: (_read_text, _U16), 0xdb: (_read_text, _U32),
+    0xc4: (_read_bytes, _U8), 0xc5: (_read_bytes, _U16), 0xc6: (_read_bytes, _U32),
+    0xdc: (_read_array, _U16), 0xdd: (_read_array, _U32),
+    0xde: (_read_map, _U16), 0xdf: (_read_map, _U32),
+}
+
+
+def _ext_hook(code: int, payload: bytes) -> Any:
+    raise ValueError(f"未対応の拡張型です: {code}")
+
+
+def _packb(obj: Any) -> bytes:
+    if _MSGPACK_AVAILABLE:
+        return msgpack.packb(obj, use_bin_type=True)
+    out = bytearray()
+    _pack(obj, out)
+    return bytes(out)
+
+
+def _unpackb(data: bytes) -> Any:
+    if _MSGPACK_AVAILABLE:
+        try:
+            return msgpack.unpackb(data, raw=False, ext_hook=_ext_hook)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"データをデコードできません: {e}") from e
+    data = bytes(data)
+    try:
+        value, pos = _read(data, 0)
+    except (IndexError, struct.error) as e:
+        raise ValueError(f"データをデコードできません: {e}") from e
+    if pos != len(data):
+        raise ValueError("データの末尾に余分なバイトがあります")
+    return value
+
+
+# モデル ⇔ 行
+class _Encoder:
+    """モデルを行（配列）に変換（ユーザーは表にまとめて番号で参照）"""
+
+    def __init__(self):
+        self.users: List[Any] = []
+        self._by_object: Dict[int, int] = {}
+        self._by_row: Dict[Any, int] = {}
+        self._keep: List[Any] = []
+
+    def user(self, user: User) -> int:
+        index = self._by_object.get(id(user))
+        if index is not None:
+            return index
+        row = _GETTERS["User"](user)
+        key = row[:5] + (tuple(row[5] or ()),)
+        index = self._by_row.get(key)
+        if index is None:
+            index = self._by_row[key] = len(self.users)
+            self.users.append(row)
+        # id() の再利用を防ぐため、エンコード中はオブジェクトを保持する
+        self._keep.append(user)
+        self._by_object[id(user)] = index
+        return index
+
+    def row(self, kind: str, model: Any) -> Any:
+        row = list(_GETTERS[kind](model))
+        for i in _DATETIME_FIELDS[kind]:
+            row[i] = _encode_datetime(row[i])
+        if kind == "Message":
+            row[2] = self.user(row[2])
+            if row[6]:
+                row[6] = [_GETTERS["Attachment"](att) for att in row[6]]
+        elif kind == "Member":
+            row[1] = self.user(row[1])
+        return row
+
+
+def _check_row(kind: str, row: Any) -> List[Any]:
+    if not isinstance(row, list) or len(row) > len(SCHEMAS[kind]):
+        raise ValueError(f"{kind} のデータが正しくありません")
+    return row
+
+
+def _user(users: List[User], index: Any) -> User:
+    """ユーザー表の番号を User に変換（負の数・真偽値などで別のユーザーを指さないよう範囲を検査する）"""
+    if type(index) is not int or not 0 <= index < len(users):
+        raise ValueError(f"ユーザーの参照が正しくありません: {index!r}")
+    return users[index]
+
+
+def _build_message(row: Any, users: List[User]) -> Message:
+    """Message の行を復元（履歴の読み込みで最も多いため、現行スキーマの行は個別に処理する）"""
+    if type(row) is not list or len(row) != 8:
+        return _build("Message", row, users)
+    message_id, channel_id, author, content, timestamp, edited_at, attachments, embeds = row
+    try:
+        return Message(
+            message_id,
+            channel_id,
+            _user(users, author),
+            content,
+            _EPOCH + timedelta(microseconds=timestamp) if type(timestamp) is int else _decode_datetime(timestamp),
+            None if edited_at is None else _decode_datetime(edited_at),
+            [Attachment(*_check_row("Attachment", att)) for att in attachments] if attachments else None,
+            embeds
+        )
+    except (IndexError, TypeError, OverflowError) as e:
+        raise ValueError(f"Message のデータが正しくありません: {e}") from e
+
+
+def _build(kind: str, row: List[Any], users: List[User]) -> Any:
+    row = _check_row(kind, row)
+    try:
+        for i in _DATETIME_FIELDS[kind]:
+            if i < len(row):
+                row[i] = _decode_datetime(row[i])
+        if kind == "Message":
+            row[2] = _user(users, row[2])
+            if len(row) > 6 and row[6]:
+                row[6] = [Attachment(*_check_row("Attachment", att)) for att in row[6]]
+        elif kind == "Member":
+            row[1] = _user(users, row[1])
+        return _MODELS[kind](*row)
+    except (IndexError, TypeError, OverflowError) as e:
+        raise ValueError(f"{kind} のデータが正しくありません: {e}") from e
+
+
+def _encode(kind: str, models: Iterable[Any], many: bool) -> bytes:
+    encoder = _Encoder()
+    if kind == "User":
+        rows = [encoder.user(model) for model in models]
+    else:
+        rows = [encoder.row(kind, model) for model in models]
+    return _packb([MAGIC, SCHEMA_VERSION, kind, many, encoder.users, rows])
+
+
+def _decode(data: bytes) -> Any:
+    payload = _unpackb(data)
+    if not isinstance(payload, list) or len(payload) != 6 or payload[0] != MAGIC:
+        raise ValueError("Janus のシリアライズ形式ではありません")
+    _, version, kind, many, user_rows, rows = payload
+    if type(version) is not int or not 1 <= version <= SCHEMA_VERSION:
+        raise ValueError(f"未対応のスキーマバージョンです: {version}（対応: {SCHEMA_VERSION} 以下）")
+    if kind not in SCHEMAS or not isinstance(user_rows, list) or not isinstance(rows, list):
+        raise ValueError("Janus のシリアライズ形式ではありません")
+    try:
+        users = [User(*_check_row("User", row)) for row in user_rows]
+    except TypeError as e:
+        raise ValueError(f"User のデータが正しくありません: {e}") from e
+    if kind == "User":
+        models = [_user(users, index) for index in rows]
+    elif kind == "Message":
+        models = [_build_message(row, users) for row in rows]
+    else:
+        models = [_build(kind, row, users) for row in rows]
+    return bool(many), models
+
+
+def dumps(model: Any) -> bytes:
+    """
+    モデルをバイト列に変換
+
+    Args:
+        model: janus.models のモデル（LazyMessage は Message として保存）
+
+    Returns:
+        バイト列
+
+    Raises:
+        TypeError: 対応していないオブジェクト
+    """
+    return _encode(_kind_of(model), [model], False)
+
+
+def loads(data: bytes) -> Any:
+    """
+    dumps で作成したバイト列からモデルを復元
+
+    Raises:
+        ValueError: 形式・スキーマバージョンが正しくないデータ
+    """
+    many, models = _decode(data)
+    if many or len(models) != 1:
+        raise ValueError("dumps_many で作成したデータは loads_many で読み込んでください")
+    return models[0]
+
+
+def dumps_many(models: Iterable[Any]) -> bytes:
+    """
+    同じ種類のモデルのリストをまとめてバイト列に変換
+
+    メッセージの投稿者・メンバーのユーザーは表にまとめ、同じユーザーは1回だけ保存します。
+
+    Args:
+        models: janus.models のモデルのリスト（空でもよい）
+
+    Returns:
+        バイト列
+
+    Raises:
+        TypeError: 対応していないオブジェクト、または種類の異なるモデルが混在している
+    """
+    models = list(models)
+    kinds = {_kind_of(model) for model in models}
+    if len(kinds) > 1:
+        raise TypeError(f"種類の異なるモデルは一緒に保存できません: {sorted(kinds)}")
+    return _encode(kinds.pop() if kinds else "Message", models, True)
+
+
+def loads_many(data: bytes) -> List[Any]:
+    """
+    dumps_many で作成したバイト列からモデルのリストを復元
+
+    Raises:
+        ValueError: 形式・スキーマバージョンが正しくないデータ
+    """
+    _, models = _decode(data)
+    return models
@@ -0,0 +1,122 @@
+"""
+Janus SDK シングルフライト（同一リクエストの合流）
+
+同じキーの処理が実行中であれば、後から来た呼び出しは新たに実行せず
+先行する処理の結果を共有します。同時に大量のコマンドが `get_members()` を
+呼んでも、HTTPリクエストとレスポンスのパースは1回だけになります。
+
+- SingleFlight: スレッド間で合流（同期 Client 用）
+- AsyncSingleFlight: コルーチン間で合流（AsyncClient 用）
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    """実行中の呼び出し"""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    スレッド間で同一キーの呼び出しを1回にまとめる
+
+    使用例:
+        group = SingleFlight()
+        members = group.do(("GET", "/servers/1/members"), fetch_members)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.shared = 0  # 合流によって省略できた呼び出し数
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        キーごとに fn を1回だけ実行し、結果を共有
+
+        Args:
+            key: 合流キー
+            fn: 実行する関数
+
+        Returns:
+            fn の戻り値（先行する呼び出しの結果を含む）
+
+        Raises:
+            fn が送出した例外（合流した全呼び出しに伝搬）
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def in_flight(self) -> int:
+        """実行中のキー数"""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    コルーチン間で同一キーの呼び出しを1回にまとめる
+
+    先行する呼び出しはタスクとして実行されるため、最初の呼び出し元が
+    キャンセルされても合流した他の呼び出しには結果が届きます。
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, "asyncio.Task"] = {}
+        self.shared = 0  # 合流によって省略できた呼び出し数
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        キーごとに fn を1回だけ実行し、結果を共有
+
+        Args:
+            key: 合流キー
+            fn: コルーチンを返す関数
+
+        Returns:
+            fn の戻り値（先行する呼び出しの結果を含む）
+        """
+        task = self._tasks.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _t, key=key: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """実行中のキー数"""
+        return len(self._tasks)
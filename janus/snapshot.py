@@ -0,0 +1,167 @@
+"""
+Janus SDK ウォームスタート用スナップショット
+
+サーバー情報・チャンネル一覧・メンバー一覧を SQLite ファイルに保存し、次回の起動時に
+ネットワークを待たずに読み込みます。読み込んだ内容はバックグラウンドで再検証（再取得）され、
+最新の状態で上書きされます。多数の Bot プロセスを同時に再起動しても、起動時のリクエストが
+一斉に集中しないよう再検証の開始をランダムに遅らせます。
+
+使用例:
+    client = Client(host, token, snapshot="~/.cache/janus/snapshot.sqlite3")
+    client = Client(host, token, snapshot=Snapshot(path, max_age=3600))
+
+トークンそのものやサーバーの api_token は保存しません。
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .codec import JSONCodec, get_codec
+
+# 保存する項目
+SNAPSHOT_KINDS = ("server", "channels", "members")
+
+# 保存しないフィールド（秘密情報）
+_SECRET_FIELDS = ("api_token",)
+
+
+def _plain(value: Any) -> Any:
+    """datetime を ISO 8601 文字列に変換（from_dict で復元できる形式）"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items() if k not in _SECRET_FIELDS}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    return value
+
+
+def model_to_dict(model: Any) -> Dict[str, Any]:
+    """データモデルを from_dict で復元できる辞書に変換"""
+    return _plain(model.to_dict())
+
+
+class Snapshot:
+    """
+    SQLite によるスナップショットストア
+
+    1つのファイルに複数のクライアント（ホスト・トークンの組）の状態を保存できます。
+    複数プロセスから同じファイルを共有できます。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_age: Optional[float] = 24 * 60 * 60,
+        revalidate_jitter: float = 5.0,
+        codec: Union[str, JSONCodec] = "auto",
+        busy_timeout: float = 10.0
+    ):
+        """
+        Args:
+            path: SQLite データベースファイルのパス
+            max_age: これより古いスナップショットは使わない（秒、Noneで無制限）
+            revalidate_jitter: 読み込み後の再検証を開始するまでの最大遅延（秒、0〜この値でランダム）
+            codec: 保存形式のJSONコーデック
+            busy_timeout: ロック待ちの最大秒数
+        """
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_age = max_age
+        self.revalidate_jitter = revalidate_jitter
+        self.codec = get_codec(codec)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path,
+            timeout=busy_timeout,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS janus_snapshots ("
+            "client_key TEXT NOT NULL, kind TEXT NOT NULL, data BLOB NOT NULL, saved REAL NOT NULL, "
+            "PRIMARY KEY (client_key, kind))"
+        )
+
+    @staticmethod
+    def key_for(host: str, token: str, server_id: Optional[int] = None) -> str:
+        """ホストとトークン（とサーバーID）からキーを生成（トークンはハッシュ化して保存）"""
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+        key = f"{host.rstrip('/')}|{digest}"
+        return key if server_id is None else f"{key}|{server_id}"
+
+    def save(self, client_key: str, kind: str, data: Union[Any, Iterable[Any]]):
+        """
+        項目を保存
+
+        Args:
+            client_key: key_for で生成したキー
+            kind: "server" / "channels" / "members"
+            data: モデル（server）またはモデルのリスト（channels / members）
+        """
+        if kind not in SNAPSHOT_KINDS:
+            raise ValueError(f"不明なスナップショット項目です: {kind}")
+        if kind == "server":
+            payload = model_to_dict(data)
+        else:
+            payload = [model_to_dict(item) for item in data]
+        blob = self.codec.dumps(payload)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO janus_snapshots (client_key, kind, data, saved) VALUES (?, ?, ?, ?)",
+                (client_key, kind, blob, time.time())
+            )
+
+    def load(self, client_key: str) -> Optional[Dict[str, Any]]:
+        """
+        スナップショットを読み込む
+
+        Args:
+            client_key: key_for で生成したキー
+
+        Returns:
+            {"server": dict, "channels": list?, "members": list?}
+            （サーバー情報がない・max_age より古い場合は None。古い項目は含めない）
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, data, saved FROM janus_snapshots WHERE client_key = ?", (client_key,)
+            ).fetchall()
+        now = time.time()
+        state = {}
+        for kind, blob, saved in rows:
+            if self.max_age is not None and now - saved > self.max_age:
+                continue
+            try:
+                state[kind] = self.codec.loads(bytes(blob))
+            except Exception:
+                continue
+        if "server" not in state:
+            return None
+        return state
+
+    def clear(self, client_key: Optional[str] = None):
+        """スナップショットを削除（client_key 省略時は全削除）"""
+        with self._lock:
+            if client_key is None:
+                self._conn.execute("DELETE FROM janus_snapshots")
+            else:
+                self._conn.execute("DELETE FROM janus_snapshots WHERE client_key = ?", (client_key,))
+
+    def kinds(self, client_key: str) -> List[str]:
+        """保存済みの項目一覧"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind FROM janus_snapshots WHERE client_key = ?", (client_key,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def __repr__(self):
+        return f"<Snapshot path='{self.path}' max_age={self.max_age}>"
@@ -0,0 +1,155 @@
+"""
+Janus SDK タイムスタンプのデコード
+
+API の日時文字列（`2025-09-13T12:34:56.789Z` / `...+09:00` / タイムゾーンなし）を datetime または
+UNIX 時間（マイクロ秒の整数）に変換します。janus.models・janus.compact・janus.batch で共有します。
+
+- Python 3.11 以降は `Z` 付きの文字列をそのまま datetime.fromisoformat に渡す（置換によるコピーなし）
+- それ以前のバージョン、または fromisoformat が受け付けない桁数の小数秒は正規表現で解析
+- 変換結果はメモ化するため、joined_at や created_at のように同じ値が繰り返し現れても解析は1回
+  （datetime は変更不可なので、同じインスタンスを共有しても問題ありません）。
+  メッセージの投稿日時のように値がほぼ重複しないものは memoize=False で直接変換します
+
+使用例:
+    from janus.timestamps import parse_timestamp, parse_epoch_us, from_epoch_us
+    parse_timestamp("2025-09-13T12:34:56.789Z")   # datetime(..., tzinfo=timezone.utc)
+    us = parse_epoch_us("2025-09-13T12:34:56Z")     # 1757766896000000
+    from_epoch_us(us)                               # 必要になった時点で datetime に変換
+"""
+
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+# メモ化する値の上限（超えたら全て破棄して作り直す）
+CACHE_SIZE = 4096
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_FROMISOFORMAT_Z = sys.version_info >= (3, 11)
+
+_ISO = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d+))?)?"
+    r"(Z|[+-]\d{2}:?\d{2})?$"
+)
+
+_datetimes: Dict[str, datetime] = {}
+_epochs: Dict[str, int] = {}
+
+
+def _slow_parse(value: str) -> datetime:
+    """fromisoformat が受け付けない形式（小数秒の桁数が3・6以外など）の解析"""
+    match = _ISO.match(value)
+    if match is None:
+        raise ValueError(f"日時の形式が正しくありません: {value!r}")
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    tzinfo = None
+    if offset == "Z":
+        tzinfo = timezone.utc
+    elif offset:
+        sign = -1 if offset[0] == "-" else 1
+        digits = offset[1:].replace(":", "")
+        tzinfo = timezone(sign * timedelta(hours=int(digits[:2]), minutes=int(digits[2:])))
+    return datetime(
+        int(year), int(month), int(day), int(hour), int(minute), int(second or 0),
+        int(fraction[:6].ljust(6, "0")) if fraction else 0,
+        tzinfo=tzinfo
+    )
+
+
+if _FROMISOFORMAT_Z:
+    def _parse(value: str) -> datetime:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return _slow_parse(value)
+else:
+    def _parse(value: str) -> datetime:
+        try:
+            if value[-1] != "Z":
+                return datetime.fromisoformat(value)
+            return datetime.fromisoformat(value[:-1]).replace(tzinfo=timezone.utc)
+        except ValueError:
+            return _slow_parse(value)
+
+
+def parse_timestamp(value: Any, memoize: bool = True) -> Optional[datetime]:
+    """
+    日時文字列を datetime に変換
+
+    Args:
+        value: ISO 8601 形式の文字列、UNIX 時間（秒）の数値、datetime
+            （None・空文字列は None）
+        memoize: 変換結果をメモ化する（メッセージの投稿日時のように値がほぼ重複しない場合は False）
+
+    Returns:
+        datetime（`Z`・オフセット付きならタイムゾーン付き、なしならタイムゾーンなし）
+
+    Raises:
+        ValueError: 日時として解析できない文字列
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        if not memoize:
+            return _parse(value)
+        parsed = _datetimes.get(value)
+        if parsed is None:
+            parsed = _parse(value)
+            if len(_datetimes) >= CACHE_SIZE:
+                _datetimes.clear()
+            _datetimes[value] = parsed
+        return parsed
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    raise ValueError(f"日時の形式が正しくありません: {value!r}")
+
+
+def to_epoch_us(value: datetime) -> int:
+    """datetime を UNIX 時間（マイクロ秒）に変換（タイムゾーンなしは UTC とみなす）"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def parse_epoch_us(value: Any, memoize: bool = True) -> Optional[int]:
+    """
+    日時文字列を UNIX 時間（マイクロ秒の整数）に変換
+
+    集計などで datetime が不要な場合に使います。タイムゾーンなしの文字列は UTC とみなします。
+
+    Args:
+        value: parse_timestamp と同じ
+        memoize: 変換結果をメモ化する
+
+    Returns:
+        UNIX 時間（マイクロ秒）。value が None・空文字列なら None
+    """
+    if isinstance(value, str) and value:
+        if not memoize:
+            return to_epoch_us(_parse(value))
+        epoch = _epochs.get(value)
+        if epoch is None:
+            epoch = to_epoch_us(_parse(value))
+            if len(_epochs) >= CACHE_SIZE:
+                _epochs.clear()
+            _epochs[value] = epoch
+        return epoch
+    parsed = parse_timestamp(value)
+    return None if parsed is None else to_epoch_us(parsed)
+
+
+def from_epoch_us(value: Optional[int]) -> Optional[datetime]:
+    """UNIX 時間（マイクロ秒）を UTC の datetime に変換"""
+    if value is None:
+        return None
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def clear_cache():
+    """メモ化した変換結果を破棄"""
+    _datetimes.clear()
+    _epochs.clear()
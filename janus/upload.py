@@ -0,0 +1,286 @@
+"""
+Janus SDK ファイルアップロード
+
+ファイルをメモリに読み込まずにストリーミング送信するためのマルチパートボディと、
+チャンク単位で再開できるアップロードのプロトコル定義を提供します。
+
+再開可能アップロード（サーバーが対応している場合）:
+    1. POST /servers/{server_id}/channels/{channel_id}/uploads
+       {"filename", "size", "content_type", "message"} -> {"upload_id", "offset", "chunk_size"?}
+    2. PUT  /servers/{server_id}/uploads/{upload_id}
+       Content-Range: bytes {start}-{end}/{size} でチャンクを送信
+       -> 途中は {"offset"}、最後のチャンクで送信された Message
+    3. GET  /servers/{server_id}/uploads/{upload_id} -> {"offset", "message"?}
+       （通信が途切れたときに、サーバーが受信済みの位置を確認。完了済みなら送信されたメッセージも返す）
+    エンドポイント 1 が 404 / 405 / 501 を返すサーバーでは通常のマルチパート送信にフォールバックします。
+"""
+
+import asyncio
+import mimetypes
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Tuple
+
+from .exceptions import UploadError
+from .models import Message
+
+# 進捗コールバック: (送信済みバイト数, 合計バイト数)
+ProgressCallback = Callable[[int, int], None]
+# 一括送信の進捗コールバック: (ファイルパス, 送信済みバイト数, 合計バイト数)
+BatchProgressCallback = Callable[[str, int, int], None]
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_RESUMABLE_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def guess_content_type(file_path: str) -> str:
+    """ファイル名から Content-Type を推測（不明なら application/octet-stream）"""
+    content_type, _ = mimetypes.guess_type(file_path)
+    return content_type or "application/octet-stream"
+
+
+def _quote(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\r", "").replace("\n", "")
+
+
+class MultipartFileStream:
+    """
+    ファイルをチャンク単位で読み出すマルチパート（multipart/form-data）ボディ
+
+    合計サイズを事前に計算するため Content-Length 付きで送信でき、メモリ使用量は
+    ファイルサイズに関係なく chunk_size 程度です。イテレートするたびにファイルの
+    先頭から読み直すため、再試行時にも同じボディを再送できます。
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        fields: Optional[dict] = None,
+        field_name: str = "file",
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None
+    ):
+        """
+        Args:
+            file_path: 送信するファイルのパス
+            fields: ファイル以外のフォームフィールド
+            field_name: ファイルのフィールド名
+            filename: 送信するファイル名（省略時はパスのベース名）
+            content_type: ファイルの Content-Type（省略時は拡張子から推測）
+            chunk_size: 1回に読み込むバイト数
+            progress: 進捗コールバック（ファイル部分の送信済みバイト数, ファイルサイズ）
+        """
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.file_size = os.path.getsize(file_path)
+        self.boundary = uuid.uuid4().hex
+        filename = filename or os.path.basename(file_path)
+        content_type = content_type or guess_content_type(file_path)
+
+        parts = []
+        for name, value in (fields or {}).items():
+            parts.append(
+                f"--{self.boundary}\r\n"
+                f"Content-Disposition: form-data; name=\"{_quote(name)}\"\r\n\r\n"
+                f"{value}\r\n"
+            )
+        parts.append(
+            f"--{self.boundary}\r\n"
+            f"Content-Disposition: form-data; name=\"{_quote(field_name)}\"; filename=\"{_quote(filename)}\"\r\n"
+            f"Content-Type: {content_type}\r\n\r\n"
+        )
+        self._head = "".join(parts).encode("utf-8")
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode("utf-8")
+
+    @property
+    def content_type(self) -> str:
+        """リクエストの Content-Type ヘッダー値"""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return len(self._head) + self.file_size + len(self._tail)
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._head
+        sent = 0
+        with open(self.file_path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                sent += len(chunk)
+                yield chunk
+                if self.progress:
+                    self.progress(sent, self.file_size)
+        yield self._tail
+
+    async def aiter(self) -> AsyncIterator[bytes]:
+        """aiohttp 用の非同期イテレーター（ファイル読み込みはスレッドプールで実行）"""
+        loop = asyncio.get_running_loop()
+        yield self._head
+        sent = 0
+        with open(self.file_path, "rb") as f:
+            while True:
+                chunk = await loop.run_in_executor(None, f.read, self.chunk_size)
+                if not chunk:
+                    break
+                sent += len(chunk)
+                yield chunk
+                if self.progress:
+                    self.progress(sent, self.file_size)
+        yield self._tail
+
+
+class ResumableUpload:
+    """
+    チャンク単位で再開できるアップロードの状態
+
+    HTTP 通信はクライアント側で行い、このクラスは送信位置（offset）と
+    次に送るチャンクの組み立てだけを管理します。
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        message: str = "",
+        chunk_size: int = DEFAULT_RESUMABLE_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        upload_id: Optional[str] = None
+    ):
+        """
+        Args:
+            file_path: 送信するファイルのパス
+            message: 追加メッセージ
+            chunk_size: 1リクエストで送信するバイト数
+            progress: 進捗コールバック（送信済みバイト数, ファイルサイズ）
+            upload_id: 以前のアップロードを再開する場合のID
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size は1以上である必要があります")
+        self.file_path = file_path
+        self.message = message
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.upload_id = upload_id
+        self.size = os.path.getsize(file_path)
+        self.offset = 0
+
+    @staticmethod
+    def create_endpoint(server_id: int, channel_id: int) -> str:
+        return f"/servers/{server_id}/channels/{channel_id}/uploads"
+
+    def session_endpoint(self, server_id: int) -> str:
+        return f"/servers/{server_id}/uploads/{self.upload_id}"
+
+    def create_payload(self) -> Dict[str, Any]:
+        """アップロード開始リクエストのボディ"""
+        payload = {
+            "filename": os.path.basename(self.file_path),
+            "size": self.size,
+            "content_type": guess_content_type(self.file_path),
+        }
+        if self.message:
+            payload["message"] = self.message
+        return payload
+
+    def begin(self, response: Dict[str, Any]):
+        """アップロード開始レスポンスを反映（サーバーがチャンクサイズを指定していれば従う）"""
+        self.upload_id = response["upload_id"]
+        if response.get("chunk_size"):
+            self.chunk_size = int(response["chunk_size"])
+        self.sync(response)
+
+    def sync(self, response: Dict[str, Any]):
+        """サーバーが受信済みの位置に合わせる"""
+        offset = int(response.get("offset", 0))
+        if not 0 <= offset <= self.size:
+            raise ValueError(f"サーバーが不正な offset を返しました: {offset}")
+        self.offset = offset
+        if self.progress:
+            self.progress(self.offset, self.size)
+
+    def read_chunk(self, f) -> Tuple[bytes, Dict[str, str]]:
+        """
+        現在の offset から次のチャンクを読み込む
+
+        Args:
+            f: バイナリモードで開いたファイル
+
+        Returns:
+            (チャンク, リクエストヘッダー)
+        """
+        f.seek(self.offset)
+        chunk = f.read(min(self.chunk_size, self.size - self.offset))
+        headers = {
+            "Content-Type": "application/octet-stream",
+            "Content-Range": content_range(self.offset, len(chunk), self.size),
+        }
+        return chunk, headers
+
+    def advance(self, response: Any, sent: int) -> Optional[Dict[str, Any]]:
+        """
+        チャンクの送信結果を反映
+
+        Args:
+            response: PUT のレスポンス
+            sent: 送信したバイト数
+
+        Returns:
+            アップロードが完了していれば送信されたメッセージ、途中なら None
+        """
+        if isinstance(response, dict) and "offset" in response and "id" not in response:
+            self.sync(response)
+            return None
+        self.offset = min(self.offset + sent, self.size)
+        if self.progress:
+            self.progress(self.offset, self.size)
+        if self.offset >= self.size:
+            return response
+        return None
+
+    def completed(self, status: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        受信済みの位置がファイル末尾に達していたときの結果を取り出す
+
+        Args:
+            status: GET のレスポンス
+
+        Returns:
+            送信されたメッセージ
+
+        Raises:
+            UploadError: サーバーがメッセージを返さなかった
+        """
+        message = status.get("message") if isinstance(status, dict) else None
+        if not isinstance(message, dict):
+            raise UploadError("アップロードは完了しましたがメッセージを取得できません", self.upload_id, self.offset)
+        return message
+
+    @property
+    def done(self) -> bool:
+        return self.offset >= self.size
+
+    def __repr__(self):
+        return f"<ResumableUpload id={self.upload_id} {self.offset}/{self.size}>"
+
+
+@dataclass
+class UploadResult:
+    """send_files の1ファイル分の結果"""
+    path: str
+    message: Optional[Message] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """送信に成功したか"""
+        return self.error is None
+
+
+def content_range(start: int, length: int, total: int) -> str:
+    """Content-Range ヘッダー値を生成"""
+    return f"bytes {start}-{start + length - 1}/{total}"
@@ -18,6 +18,7 @@ import time
 import threading
 import re
 from janus import Client
+from janus.exceptions import ChannelNotFoundError
 
 class PseudoWebhook:
     """指定チャンネルをポーリングし、on_messageコールバックで新着メッセージを受信"""
@@ -32,9 +33,9 @@ class PseudoWebhook:
         self.on_message = None
 
     def start(self):
-        channels = self.client.get_channels()
-        ch = next((c for c in channels if c.name == self.channel_name), None)
-        if not ch:
+        try:
+            ch = self.client.get_channel_by_name(self.channel_name)
+        except ChannelNotFoundError:
             raise RuntimeError(f"チャンネル '{self.channel_name}' が見つかりません")
         self.channel_id = ch.id
         msgs = self.client.get_messages(self.channel_id, limit=1)
@@ -84,13 +85,15 @@ class ChannelAggregator:
     def __init__(self, client):
         self.client = client
 
-    def get_all_messages(self, channel_names, limit=100):
-        result = {}
+    def get_all_messages(self, channel_names, limit=100, concurrency=8):
+        targets = {}
         for name in channel_names:
-            ch = next((c for c in self.client.get_channels() if c.name == name), None)
-            if ch:
-                msgs = self.client.get_messages(ch.id, limit=limit)
-                result[name] = msgs
+            info = InfoUtils.get_channel_info(self.client, name)
+            if info:
+                targets[info.id] = name
+        result = {}
+        for channel_id, msgs in self.client.iter_channel_histories(targets, limit=limit, concurrency=concurrency):
+            result[targets[channel_id]] = msgs
         return result
 
 class UserHistory:
@@ -98,17 +101,18 @@ class UserHistory:
     def __init__(self, client):
         self.client = client
 
-    def get_user_messages(self, user_display_name, channel_name=None, limit=200):
+    def get_user_messages(self, user_display_name, channel_name=None, limit=200, concurrency=8):
         if channel_name:
-            ch = next((c for c in self.client.get_channels() if c.name == channel_name), None)
-            if not ch:
+            channel = InfoUtils.get_channel_info(self.client, channel_name)
+            if not channel:
                 return []
-            msgs = self.client.get_messages(ch.id, limit=limit)
+            channels = [channel]
         else:
-            msgs = []
-            for ch in self.client.get_channels():
-                msgs += self.client.get_messages(ch.id, limit=limit)
-        return [m for m in msgs if m.author.display_name == user_display_name]
+            channels = self.client.get_channels()
+        msgs = []
+        for _, page in self.client.iter_channel_histories([c.id for c in channels], limit=limit, concurrency=concurrency):
+            msgs += [m for m in page if m.author.display_name == user_display_name]
+        return msgs
 
 class AutoResponder:
     """条件付き自動返信Bot（例: 特定ワード/ユーザーに反応）"""
@@ -124,9 +128,9 @@ class AutoResponder:
         self._thread = None
 
     def start(self):
-        channels = self.client.get_channels()
-        ch = next((c for c in channels if c.name == self.channel_name), None)
-        if not ch:
+        try:
+            ch = self.client.get_channel_by_name(self.channel_name)
+        except ChannelNotFoundError:
             raise RuntimeError(f"チャンネル '{self.channel_name}' が見つかりません")
         self.channel_id = ch.id
         msgs = self.client.get_messages(self.channel_id, limit=1)
@@ -162,13 +166,14 @@ class InfoUtils:
 
     @staticmethod
     def get_channel_info(client, channel_name):
-        ch = next((c for c in client.get_channels() if c.name == channel_name), None)
-        return ch
+        try:
+            return client.get_channel_by_name(channel_name)
+        except ChannelNotFoundError:
+            return None
 
     @staticmethod
     def get_user_profile(client, user_display_name):
-        members = client.get_members()
-        return next((m for m in members if m.display_name == user_display_name), None)
+        return client.get_member_directory().find_by_name(user_display_name)
 
 # --- ここまで ---
 # 使い方例はREADMEや各クラスのdocstring参照
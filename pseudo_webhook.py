@@ -13,6 +13,7 @@ Janusサーバーからのイベント（新着メッセージ等）を疑似的
 import time
 import threading
 from janus import Client
+from janus.exceptions import ChannelNotFoundError
 
 class PseudoWebhook:
     def __init__(self, host, token, channel_name, poll_interval=3, use_server_token=True):
@@ -26,9 +27,9 @@ class PseudoWebhook:
         self.on_message = None  # コールバック: def on_message(msg): ...
 
     def start(self):
-        channels = self.client.get_channels()
-        ch = next((c for c in channels if c.name == self.channel_name), None)
-        if not ch:
+        try:
+            ch = self.client.get_channel_by_name(self.channel_name)
+        except ChannelNotFoundError:
             raise RuntimeError(f"チャンネル '{self.channel_name}' が見つかりません")
         self.channel_id = ch.id
         msgs = self.client.get_messages(self.channel_id, limit=1)
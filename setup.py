@@ -35,9 +35,12 @@ setup(
     ],
     extras_require={
         "websocket": ["websockets>=10.0"],
+        "async": ["aiohttp>=3.8.0"],
+        "speedups": ["orjson>=3.6.0", "msgpack>=1.0.0"],
         "database": ["aiosqlite>=0.17.0"],
         "postgresql": ["psycopg2-binary>=2.9.0"],
         "mysql": ["mysql-connector-python>=8.0.0"],
+        "analytics": ["numpy>=1.20.0", "pyarrow>=8.0.0"],
         "dev": [
             "pytest>=6.0.0",
             "pytest-asyncio>=0.18.0",
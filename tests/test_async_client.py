@@ -0,0 +1,140 @@
+"""
+AsyncClient のテスト
+
+ローカルに aiohttp のサーバーを立てて、実際の HTTP 通信で動作を確認します。
+"""
+
+import asyncio
+import json
+import os
+import threading
+
+from aiohttp import web
+
+from janus import AsyncClient, async_client
+from janus.models import Attachment
+from janus.retry import RetryPolicy
+
+
+async def _serve(app: web.Application):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_retry_resends_original_request_body():
+    """503 の後の再試行でも、エラーレスポンスではなく元のリクエストボディを送る"""
+    received = []
+
+    async def servers(request):
+        return web.json_response([{"id": 1, "name": "test"}])
+
+    async def server(request):
+        return web.json_response({"id": 1, "name": "test"})
+
+    async def send(request):
+        received.append((request.headers.get("Content-Type"), await request.read()))
+        if len(received) == 1:
+            return web.json_response({"error": "unavailable"}, status=503)
+        return web.json_response({
+            "id": 10, "channel_id": 1, "author": "bot", "content": "hello",
+            "timestamp": "2025-09-13T12:34:56Z"
+        })
+
+    app = web.Application()
+    app.router.add_get("/api/v1/servers", servers)
+    app.router.add_get("/api/v1/servers/{server_id}", server)
+    app.router.add_post("/api/v1/servers/{server_id}/channels/{channel_id}/messages", send)
+
+    async def main():
+        runner, url = await _serve(app)
+        try:
+            policy = RetryPolicy(max_attempts=2, base_delay=0.01, max_delay=0.01)
+            async with AsyncClient(url, "token", server_id=1, retry_policy=policy) as client:
+                message = await client.send_message(1, "hello", idempotency_key="key-1")
+        finally:
+            await runner.cleanup()
+        return message
+
+    message = asyncio.run(main())
+
+    assert message.content == "hello"
+    assert len(received) == 2
+    for content_type, body in received:
+        assert content_type.startswith("application/json")
+        assert json.loads(body) == {"content": "hello"}
+
+
+def test_timeout_does_not_cap_slow_transfers():
+    """timeout は受信待ちの上限で、転送全体がそれより長くかかっても打ち切らない"""
+
+    async def slow(request):
+        response = web.StreamResponse(headers={"Content-Type": "application/octet-stream"})
+        await response.prepare(request)
+        for _ in range(6):
+            await asyncio.sleep(0.3)
+            await response.write(b"x" * 1024)
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/api/v1/slow", slow)
+
+    async def main():
+        runner, url = await _serve(app)
+        try:
+            async with AsyncClient(url, "token", server_id=1, timeout=1) as client:
+                return await client._make_request("GET", "slow")
+        finally:
+            await runner.cleanup()
+
+    assert asyncio.run(main()) == b"x" * 6 * 1024
+
+
+def test_download_writes_off_event_loop(tmp_path, monkeypatch):
+    """分割ダウンロードの内容が正しく、ファイルへの書き込みはイベントループのスレッドで行わない"""
+    source = tmp_path / "source.bin"
+    source.write_bytes(os.urandom(1024 * 1024 + 123))
+    write_threads = set()
+
+    class _File:
+        def __init__(self, f):
+            self._f = f
+
+        def write(self, data):
+            write_threads.add(threading.get_ident())
+            return self._f.write(data)
+
+        def close(self):
+            self._f.close()
+
+    open_at = async_client._open_at
+    monkeypatch.setattr(async_client, "_open_at", lambda path, position: _File(open_at(path, position)))
+
+    async def file(request):
+        return web.FileResponse(source)
+
+    app = web.Application()
+    app.router.add_get("/files/source.bin", file)
+
+    async def main():
+        runner, url = await _serve(app)
+        try:
+            async with AsyncClient(url, "token", server_id=1) as client:
+                attachment = Attachment(1, "source.bin", "/files/source.bin", source.stat().st_size, "")
+                paths = [
+                    await client.download_attachment(attachment, str(tmp_path / f"out{segments}.bin"), segments=segments)
+                    for segments in (1, 4)
+                ]
+        finally:
+            await runner.cleanup()
+        return paths, threading.get_ident()
+
+    paths, loop_thread = asyncio.run(main())
+    for path in paths:
+        with open(path, "rb") as f:
+            assert f.read() == source.read_bytes()
+    assert write_threads and loop_thread not in write_threads
@@ -0,0 +1,48 @@
+"""
+MessageBatch のテスト
+"""
+
+import pytest
+
+from janus import batch as batch_module
+from janus.batch import MessageBatch
+
+
+def _message(i: int) -> dict:
+    return {
+        "id": i,
+        "channel_id": i % 3,
+        "author": {"id": f"u{i % 4}", "display_name": f"ユーザー{i % 2}"},
+        "content": "メッセージ" * (i % 5) + str(i),
+        "timestamp": None if i % 7 == 0 else f"2025-09-{1 + i % 10:02d}T12:00:00Z",
+    }
+
+
+def _columns(batch: MessageBatch):
+    return (
+        list(batch.ids), list(batch.channel_ids), [str(ts) for ts in batch.timestamps],
+        list(batch.author_codes), list(batch.content_offsets), list(batch.contents())
+    )
+
+
+def test_numpy_matches_pure_python(monkeypatch):
+    """numpy があってもなくても行の選択・集計の結果は同じ"""
+    pytest.importorskip("numpy")
+    batch = MessageBatch.from_dicts(_message(i) for i in range(200))
+    indices = [5, -1, 0, 5, 199, -200]
+
+    def run():
+        return (
+            _columns(batch.take(indices)),
+            _columns(batch.take([])),
+            _columns(batch.filter(batch.contains("メッセージ"))),
+            _columns(batch.filter(batch.author_mask(user_id="u1"))),
+            batch.count_by_author(),
+            batch.count_by_author(by="name"),
+            batch.count_by_channel(),
+            batch.count_by_day(),
+        )
+
+    vectorized = run()
+    monkeypatch.setattr(batch_module, "_NUMPY_AVAILABLE", False)
+    assert vectorized == run()
@@ -0,0 +1,102 @@
+"""
+TTLCache / ChannelCache のテスト
+"""
+
+import pytest
+
+from janus import cache as cache_module
+from janus.cache import ChannelCache, TTLCache
+from janus.models import Channel
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(maxsize=10, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=None)
+    cache.set("c", 3, ttl=60)
+    clock.now += 30
+    assert cache.get("a") is None
+    assert cache.get("b") == 2 and cache.get("c") == 3
+    assert "a" not in cache and cache.values() == [2, 3]
+    clock.now += 30
+    assert cache.peek("c") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert [key for key, _ in cache.items()] == ["a", "c"]
+
+    # peek は LRU の順序を変えない
+    cache.peek("a")
+    cache.set("d", 4)
+    assert "a" not in cache and "c" in cache
+    stats = cache.stats()
+    assert (stats["size"], stats["evictions"]) == (2, 2)
+
+
+def test_stats_and_invalidate():
+    cache = TTLCache(maxsize=4)
+    cache.set_many([("a", 1), ("b", 2)])
+    cache.get("a")
+    cache.get("missing")
+    assert cache.stats()["hit_rate"] == 0.5
+    assert cache.pop("a") == 1 and cache.pop("a", "none") == "none"
+    cache.invalidate()
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0)
+
+
+def _channel(channel_id: int, name: str) -> Channel:
+    return Channel(id=channel_id, name=name, type="text")
+
+
+def test_channel_listing_is_fresh_until_ttl(clock):
+    channels = ChannelCache(maxsize=10, ttl=60)
+    assert channels.all() is None
+    channels.replace([_channel(1, "general"), _channel(2, "random")])
+    assert [c.id for c in channels.all()] == [1, 2]
+    assert channels.known_missing(3) and not channels.known_missing(1)
+    clock.now += 60
+    assert channels.all() is None and not channels.known_missing(3)
+
+
+def test_channel_events_update_listing_and_names():
+    channels = ChannelCache(maxsize=10)
+    channels.replace([_channel(1, "general"), _channel(2, "random")])
+    channels.add(_channel(3, "News"))
+    channels.add(_channel(2, "chat"))
+    assert [c.id for c in channels.all()] == [1, 2, 3]
+    assert channels.find_by_name("random") is None
+    assert channels.find_by_name("CHAT").id == 2 and channels.find_by_name("news").id == 3
+
+    channels.remove(1)
+    assert [c.id for c in channels.all()] == [2, 3]
+    assert channels.get(1) is None and channels.find_by_name("general") is None
+
+
+def test_evicted_channel_invalidates_listing():
+    channels = ChannelCache(maxsize=2)
+    channels.replace([_channel(1, "a"), _channel(2, "b"), _channel(3, "c")])
+    assert channels.all() is None
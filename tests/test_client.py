@@ -0,0 +1,98 @@
+"""
+Client のテスト
+
+標準ライブラリの HTTP サーバーをローカルに立てて、実際の HTTP 通信で動作を確認します。
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from janus import AsyncClient, Client
+from janus.exceptions import ChannelNotFoundError
+
+
+class _ChannelServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _ChannelHandler)
+        self.servers = [{"id": 1, "name": "first"}, {"id": 2, "name": "second"}]
+        self.channels = [{"id": 1, "name": "general", "type": "text"}]
+        self.requests = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _ChannelHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests += 1
+        body = json.dumps(self.server.servers if self.path.endswith("/servers") else self.server.channels).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def channel_server():
+    server = _ChannelServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_channel_by_name_refetches_on_miss(channel_server):
+    """キャッシュが新しくても、見つからなければ一覧を再取得してから探す"""
+    client = Client(channel_server.url, "token", server_id=1)
+    assert client.get_channel_by_name("general").id == 1
+    assert channel_server.requests == 1
+
+    channel_server.channels.append({"id": 2, "name": "announcements", "type": "text"})
+    assert client.get_channel_by_name("Announcements").id == 2
+    assert channel_server.requests == 2
+
+    with pytest.raises(ChannelNotFoundError):
+        client.get_channel_by_name("missing")
+    assert channel_server.requests == 3
+
+
+def test_for_server_resolves_own_server_lazily(channel_server):
+    """初期化前でも、自身のサーバーを指定したら子クライアントを作らずに自身を返す"""
+    client = Client(channel_server.url, "token", skip_initialization=True)
+    assert client.for_server(1) is client
+    assert client.for_server(2) is not client
+    assert list(client._children) == [2]
+
+
+def test_async_start_skips_duplicate_of_own_server(channel_server, monkeypatch):
+    """初期化前に for_server で自身のサーバーを指定しても、start() で同じ WebSocket を二重に開かない"""
+    connected = []
+
+    async def websocket_connection(self):
+        connected.append(self._server_info.id)
+
+    monkeypatch.setattr(AsyncClient, "_websocket_connection", websocket_connection)
+
+    async def main():
+        client = AsyncClient(channel_server.url, "token")
+        try:
+            client.for_server(1)
+            client.for_server(2)
+            await client.start()
+        finally:
+            await client.close()
+
+    asyncio.run(main())
+    assert sorted(connected) == [1, 2]
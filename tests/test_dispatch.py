@@ -0,0 +1,21 @@
+"""
+SendDispatcher のテスト
+"""
+
+from janus import Client
+from janus.dispatch import SendDispatcher
+from janus.retry import RetryPolicy
+
+
+def test_server_lookup_failure_is_set_on_future():
+    """サーバー情報の取得に失敗しても、ワーカーが止まらず Future に例外が設定される"""
+    client = Client(
+        "http://127.0.0.1:9", "token", skip_initialization=True, retry_policy=RetryPolicy(max_attempts=1)
+    )
+    dispatcher = SendDispatcher(client, workers=1)
+    futures = [dispatcher.submit(1, "hello"), dispatcher.submit(2, "hello")]
+
+    for future in futures:
+        assert future.exception(timeout=10) is not None
+    assert dispatcher.flush(timeout=10)
+    dispatcher.shutdown()
@@ -0,0 +1,112 @@
+"""
+ResponseCache のテスト
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from janus import Client
+from janus.http_cache import ResponseCache
+
+
+def test_conditional_headers_and_not_modified():
+    cache = ResponseCache()
+    key = ResponseCache.make_key("/servers/1/channels", {"b": 2, "a": 1})
+    assert key == ResponseCache.make_key("/servers/1/channels", {"a": 1, "b": 2})
+    body = [{"id": 1}]
+    cache.store(key, {"ETag": '"v1"', "Last-Modified": "Sat, 13 Sep 2025 12:00:00 GMT"}, body, 10)
+
+    entry = cache.get(key)
+    assert cache.conditional_headers(entry) == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Sat, 13 Sep 2025 12:00:00 GMT"
+    }
+    assert cache.conditional_headers(None) == {}
+    assert cache.not_modified(key, entry) is body
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_parsed_result_is_reused_for_same_body():
+    cache = ResponseCache()
+    body = [{"id": 1}]
+    cache.store("key", {"ETag": '"v1"'}, body, 10)
+    calls = []
+
+    def parse(data):
+        calls.append(data)
+        return list(data)
+
+    first = cache.parsed("key", body, parse)
+    assert cache.parsed("key", body, parse) is first
+    # 別のボディ（新しい 200 レスポンス）は再パース
+    assert cache.parsed("key", [{"id": 2}], parse) == [{"id": 2}]
+    assert len(calls) == 2
+
+
+def test_uncacheable_responses_drop_old_entry():
+    cache = ResponseCache()
+    cache.store("key", {"ETag": '"v1"'}, [], 10)
+    cache.store("key", {}, [], 10)
+    assert cache.get("key") is None
+    cache.store("key", {"ETag": '"v2"', "Cache-Control": "private, no-store"}, [], 10)
+    assert cache.get("key") is None
+
+
+def test_lru_bounds_by_entries_and_bytes():
+    cache = ResponseCache(max_entries=2, max_bytes=100)
+    cache.store("a", {"ETag": "a"}, "a", 10)
+    cache.store("b", {"ETag": "b"}, "b", 10)
+    cache.get("a")
+    cache.store("c", {"ETag": "c"}, "c", 10)
+    assert cache.get("b") is None and cache.get("a") is not None and cache.get("c") is not None
+
+    cache.store("d", {"ETag": "d"}, "d", 95)
+    assert len(cache) == 1 and cache.get("d") is not None
+    cache.store("e", {"ETag": "e"}, "e", 101)
+    assert cache.get("e") is None
+
+    cache.invalidate("d")
+    assert len(cache) == 0 and cache._bytes == 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            return
+        body = json.dumps([{"id": 1, "name": "general", "type": "text"}]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def etag_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_reuses_parsed_models_on_304(etag_server):
+    client = Client(f"http://127.0.0.1:{etag_server.server_address[1]}", "token", server_id=1, response_cache=True)
+    first = client.get_channels(force_refresh=True)
+    second = client.get_channels(force_refresh=True)
+    assert etag_server.requests == [None, '"v1"']
+    assert second[0] is first[0]
+    assert client.response_cache.hits == 1
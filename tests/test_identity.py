@@ -0,0 +1,44 @@
+"""
+UserIdentityMap のテスト
+"""
+
+from janus.identity import UserIdentityMap
+from janus.members import MemberDirectory
+from janus.models import Member
+
+
+def _member(users: UserIdentityMap, user_id: str, name: str) -> Member:
+    return Member.from_dict({"id": 1, "user": {"id": user_id, "name": name, "display_name": name}}, users)
+
+
+def test_intern_shares_and_updates_user():
+    users = UserIdentityMap()
+    first = users.intern({"id": "u1", "name": "alice", "status": "online"})
+    second = users.intern({"id": "u1", "name": "alice", "status": "offline"})
+    assert first is second and first.status == "offline"
+    assert users.intern_id("u1") is first
+    assert users.refresh({"id": "unknown", "name": "x"}) is None
+    assert users.stats()["hits"] == 2
+
+
+def test_rename_updates_member_directory():
+    """共有 User が改名されたら名前の索引も更新され、削除後は古い名前も新しい名前も残らない"""
+    users = UserIdentityMap()
+    directory = MemberDirectory()
+    users.attach(directory)
+    directory.replace([_member(users, "u1", "Alice"), _member(users, "u2", "Carol")])
+
+    # メッセージの author として新しい名前を受け取る
+    users.intern({"id": "u1", "name": "Bob", "display_name": "Bob"})
+    assert directory.find_by_name("Alice") is None
+    assert directory.find_by_name("bob").user.id == "u1"
+
+    # user_update イベント
+    users.refresh({"id": "u1", "display_name": "Dave"})
+    assert directory.find_by_name("Bob").user.id == "u1"
+    assert directory.find_by_name("dave").user.id == "u1"
+
+    assert directory.remove("u1") is not None
+    for name in ("Alice", "Bob", "Dave"):
+        assert directory.find_by_name(name) is None
+    assert directory.find_by_name("Carol").user.id == "u2"
@@ -0,0 +1,67 @@
+"""
+LazyMessage のテスト
+"""
+
+from datetime import datetime, timezone
+
+from janus.identity import UserIdentityMap
+from janus.models import LazyMessage, Message, parse_epoch_us
+
+_FIELDS = ("id", "channel_id", "author", "content", "timestamp", "edited_at", "attachments", "embeds")
+
+
+def _data():
+    return {
+        "id": 7,
+        "channelId": 3,
+        "author": {"id": "u1", "name": "alice", "display_name": "Alice"},
+        "content": "hello",
+        "timestamp": "2025-09-13T12:34:56.789Z",
+        "edited_at": "2025-09-13T13:00:00Z",
+        "attachments": [{"id": 1, "filename": "a.png", "url": "/files/a.png", "size": 10}],
+        "embeds": [{"title": "t"}],
+    }
+
+
+def test_fields_decode_only_on_access():
+    message = LazyMessage.from_dict(_data())
+    assert isinstance(message, Message)
+    assert not any(name in message.__dict__ for name in _FIELDS)
+
+    assert message.content == "hello"
+    assert "content" in message.__dict__
+    assert "author" not in message.__dict__ and "timestamp" not in message.__dict__
+
+    # 2回目以降はキャッシュした同じオブジェクト
+    author = message.author
+    assert message.author is author and message.attachments is message.attachments
+
+
+def test_matches_message_from_dict():
+    data = _data()
+    lazy = LazyMessage.from_dict(data)
+    eager = Message.from_dict(data)
+    for name in _FIELDS:
+        assert getattr(lazy, name) == getattr(eager, name), name
+    assert lazy.to_dict() == eager.to_dict()
+    assert lazy.timestamp_us == eager.timestamp_us
+
+    empty = LazyMessage.from_dict({"id": 1, "author": "u9"})
+    assert empty.author.id == "u9" and empty.attachments == [] and empty.edited_at is None
+
+
+def test_timestamp_us_does_not_decode_timestamp():
+    message = LazyMessage.from_dict(_data())
+    expected = parse_epoch_us(datetime(2025, 9, 13, 12, 34, 56, 789000, tzinfo=timezone.utc))
+    assert message.timestamp_us == expected
+    assert "timestamp" not in message.__dict__
+
+
+def test_fields_can_be_assigned_and_share_users():
+    users = UserIdentityMap()
+    first = LazyMessage.from_dict(_data(), users)
+    second = LazyMessage.from_dict(_data(), users)
+    assert first.author is second.author
+
+    first.content = "edited"
+    assert first.content == "edited" and first.raw["content"] == "hello"
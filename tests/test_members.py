@@ -0,0 +1,108 @@
+"""
+MemberDirectory のテスト
+"""
+
+from datetime import datetime
+
+from janus import members as members_module
+from janus.members import MemberDirectory
+from janus.models import Member, User
+
+
+def _member(user_id: str, name: str, role: str = "member", display_name: str = None, status: str = "offline") -> Member:
+    user = User(id=user_id, name=name, display_name=display_name or name, status=status)
+    return Member(id=0, user=user, role=role, joined_at=datetime(2025, 1, 1))
+
+
+def _directory() -> MemberDirectory:
+    directory = MemberDirectory()
+    directory.replace([
+        _member("u1", "alice", "owner", display_name="Alice", status="online"),
+        _member("u2", "bob", "admin", display_name="Bobby"),
+        _member("u3", "carol"),
+        _member("u4", "alice2", display_name="Alice"),
+    ])
+    return directory
+
+
+def test_lookup_by_id_name_and_role():
+    directory = _directory()
+    assert len(directory) == 4 and "u3" in directory and "u9" not in directory
+    assert directory.get("u2").user.name == "bob"
+    # 表示名・ユーザー名のどちらでも、大文字小文字を区別せず引ける
+    assert directory.find_by_name("BOBBY").user.id == "u2"
+    assert directory.find_by_name("bob").user.id == "u2"
+    assert [m.user.id for m in directory.find_all_by_name("alice")] == ["u1", "u4"]
+    assert directory.find_by_name("nobody") is None
+    assert [m.user.id for m in directory.with_role("member")] == ["u3", "u4"]
+    assert directory.with_role("guest") == []
+    assert [m.user.id for m in directory.online()] == ["u1"]
+
+
+def test_permissions():
+    directory = _directory()
+    assert directory.has_permission("u1", "MANAGE_SERVER")
+    assert directory.has_permission("u1", "UNKNOWN")
+    assert directory.has_permission("u2", "DELETE_MESSAGES")
+    assert not directory.has_permission("u2", "MANAGE_SERVER")
+    assert directory.has_permission("u3", "SEND_MESSAGES")
+    assert not directory.has_permission("u3", "MANAGE_CHANNELS")
+    assert not directory.has_permission("u9", "SEND_MESSAGES")
+    assert directory.is_admin("u1") and directory.is_admin("u2")
+    assert not directory.is_admin("u3") and not directory.is_admin("u9")
+
+
+def test_add_replaces_old_index_entries():
+    directory = _directory()
+    directory.add(_member("u3", "carol", "admin", display_name="Caroline"))
+    assert len(directory) == 4
+    assert directory.find_by_name("carol").user.display_name == "Caroline"
+    assert [m.user.id for m in directory.with_role("member")] == ["u4"]
+    assert {m.user.id for m in directory.with_role("admin")} == {"u2", "u3"}
+    assert directory.is_admin("u3")
+
+    directory.add(_member("u5", "dave"))
+    assert directory.get("u5") is not None and len(directory) == 5
+
+
+def test_remove_clears_every_index():
+    directory = _directory()
+    removed = directory.remove("u1")
+    assert removed.user.id == "u1"
+    assert directory.remove("u1") is None
+    assert directory.get("u1") is None and not directory.has_permission("u1", "SEND_MESSAGES")
+    assert [m.user.id for m in directory.find_all_by_name("alice")] == ["u4"]
+    assert directory.with_role("owner") == [] and "owner" not in directory._by_role
+
+    directory.remove("u4")
+    assert "alice" not in directory._by_name
+
+
+def test_reindex_after_in_place_rename():
+    directory = _directory()
+    member = directory.get("u3")
+    member.user.display_name = "Cee"
+    directory.reindex("u3")
+    assert directory.find_by_name("cee").user.id == "u3"
+    directory.remove("u3")
+    assert directory.find_by_name("carol") is None and directory.find_by_name("cee") is None
+
+
+def test_stale_until_loaded_and_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(members_module.time, "monotonic", lambda: now[0])
+    directory = MemberDirectory(ttl=60)
+    assert directory.stale and not directory.loaded
+    directory.replace([_member("u1", "alice")])
+    assert not directory.stale and directory.loaded
+    now[0] += 60
+    assert directory.stale
+
+    directory.replace([])
+    directory.invalidate()
+    assert directory.stale and not directory.loaded
+
+    forever = MemberDirectory(ttl=None)
+    forever.replace([])
+    now[0] += 10 ** 6
+    assert not forever.stale
@@ -0,0 +1,97 @@
+"""
+HistoryCursor・iter_messages のテスト
+"""
+
+import threading
+import time
+
+from janus import Client
+from janus.models import Message, User
+from janus.pagination import HistoryCursor
+
+_AUTHOR = User(id="u1", name="alice")
+
+
+def _history(count: int):
+    return [Message(i, 1, _AUTHOR, f"m{i}", None) for i in range(1, count + 1)]
+
+
+class _FakeServer:
+    """before / after / limit に従ってページを返す（新しい順）"""
+
+    def __init__(self, messages, ignore_cursor: bool = False):
+        self.messages = messages
+        self.ignore_cursor = ignore_cursor
+        self.calls = []
+
+    def get_messages(self, channel_id, limit=50, before=None, after=None):
+        self.calls.append({"limit": limit, "before": before, "after": after})
+        page = sorted(self.messages, key=lambda m: m.id, reverse=True)
+        if not self.ignore_cursor:
+            if before is not None:
+                page = [m for m in page if m.id < before]
+            if after is not None:
+                page = [m for m in page if m.id > after]
+                if before is None:
+                    return page[-limit:]
+        return page[:limit]
+
+
+def _walk(server: _FakeServer, **kwargs):
+    cursor = HistoryCursor(**kwargs)
+    result = []
+    while not cursor.done:
+        result.extend(cursor.advance(server.get_messages(1, **cursor.params())))
+    return result
+
+
+def test_backward_pages_until_short_page():
+    server = _FakeServer(_history(25))
+    assert [m.id for m in _walk(server, page_size=10)] == list(range(25, 0, -1))
+    assert [call["before"] for call in server.calls] == [None, 16, 6]
+
+
+def test_exact_multiple_of_page_size_stops_on_empty_page():
+    server = _FakeServer(_history(20))
+    assert len(_walk(server, page_size=10)) == 20
+    assert len(server.calls) == 3
+
+
+def test_forward_from_after():
+    server = _FakeServer(_history(25))
+    assert [m.id for m in _walk(server, after=5, page_size=10)] == list(range(6, 26))
+
+
+def test_before_and_after_bound_the_range():
+    server = _FakeServer(_history(50))
+    assert [m.id for m in _walk(server, before=30, after=12, page_size=7)] == list(range(29, 12, -1))
+
+
+def test_limit_shrinks_last_request():
+    server = _FakeServer(_history(100))
+    assert len(_walk(server, page_size=10, limit=25)) == 25
+    assert [call["limit"] for call in server.calls] == [10, 10, 5]
+
+
+def test_cursor_ignored_by_server_does_not_loop():
+    server = _FakeServer(_history(30), ignore_cursor=True)
+    assert [m.id for m in _walk(server, page_size=10)] == list(range(30, 20, -1))
+    assert len(server.calls) == 2
+
+
+def test_iter_messages_prefetch_stops_when_closed(monkeypatch):
+    """途中で止めたら先読みは1ページまでで、先読みスレッドも終了する"""
+    server = _FakeServer(_history(1000))
+    client = Client("http://127.0.0.1:9", "token", server_id=1)
+    monkeypatch.setattr(client, "get_messages", server.get_messages)
+    before = set(threading.enumerate())
+
+    messages = client.iter_messages(1, page_size=10)
+    assert [next(messages).id for _ in range(15)] == list(range(1000, 985, -1))
+    messages.close()
+
+    assert len(server.calls) <= 3
+    deadline = time.monotonic() + 5
+    while set(threading.enumerate()) - before and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not set(threading.enumerate()) - before
@@ -0,0 +1,63 @@
+"""
+レート制限のテスト
+"""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from janus.ratelimit import RouteRateLimiter, SQLiteTokenBucket
+
+
+def test_sqlite_bucket_keeps_lock_error(tmp_path):
+    """BEGIN がロック待ちで失敗したとき、ROLLBACK のエラーではなく元の例外を送出する"""
+    path = str(tmp_path / "bucket.sqlite3")
+    bucket = SQLiteTokenBucket(path, rate=10, busy_timeout=0.05)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            bucket.try_acquire()
+        # 残量の参照は書き込みロックを取らない
+        assert bucket.time_until_available() == 0.0
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+    assert bucket.try_acquire()
+
+
+def test_sqlite_bucket_shares_tokens_and_acquires_off_loop(tmp_path):
+    """同じファイルのバケットは枠を共有し、acquire_async はイベントループを塞がない"""
+    path = str(tmp_path / "bucket.sqlite3")
+    first = SQLiteTokenBucket(path, rate=2, per=60)
+    second = SQLiteTokenBucket(path, rate=2, per=60)
+    assert first.try_acquire() and second.try_acquire()
+    assert not first.try_acquire()
+    assert second.time_until_available() == pytest.approx(30, rel=0.05)
+
+    async def main():
+        threads = []
+        reserve = first._reserve
+        first._reserve = lambda *args: threads.append(threading.get_ident()) or reserve(*args)
+        acquired = await first.acquire_async(timeout=0)
+        return acquired, threads, threading.get_ident()
+
+    acquired, threads, loop_thread = asyncio.run(main())
+    assert acquired is False and threads and threads[0] != loop_thread
+
+
+def test_route_limiter_bounds_unexpired_routes():
+    """期限切れのルートがなくても上限を超えず、最後の更新が古いものから破棄する"""
+    limiter = RouteRateLimiter(max_routes=8)
+    headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "60"}
+    limiter.block("route-0", 60, is_global=True)
+    for i in range(100):
+        limiter.update(f"route-{i}", headers)
+        limiter.update("route-0", headers)
+        assert len(limiter._routes) <= 8
+
+    assert limiter.GLOBAL in limiter._routes
+    assert "route-0" in limiter._routes and "route-99" in limiter._routes
+    assert "route-1" not in limiter._routes
@@ -0,0 +1,123 @@
+"""
+janus.serialization のテスト
+
+msgpack がある場合とない場合（純 Python の実装）の両方で確認します。
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from janus import serialization
+from janus.models import Attachment, Channel, Member, Message, User
+
+
+@pytest.fixture(params=["python", "msgpack"])
+def backend(request, monkeypatch):
+    if request.param == "msgpack":
+        pytest.importorskip("msgpack")
+    else:
+        monkeypatch.setattr(serialization, "_MSGPACK_AVAILABLE", False)
+    return request.param
+
+
+def _messages():
+    alice = User(id="u1", name="alice", display_name="Alice", roles=["admin"])
+    bob = User(id="u2", name="bob")
+    jst = timezone(timedelta(hours=9))
+    return [
+        Message(1, 10, alice, "hello", datetime(2025, 9, 13, 12, 34, 56, 789000, tzinfo=timezone.utc)),
+        Message(
+            2, 10, bob, "添付", datetime(2025, 9, 13, 21, 0, tzinfo=jst), edited_at=datetime(2025, 9, 13, 12, 0),
+            attachments=[Attachment(5, "a.png", "/files/a.png", 123, "image/png")],
+            embeds=[{"title": "t", "fields": [1, 2.5, None, True]}]
+        ),
+        Message(3, 11, alice, "again", datetime(2025, 9, 14, tzinfo=timezone.utc)),
+    ]
+
+
+def _tamper(data: bytes, change) -> bytes:
+    payload = serialization._unpackb(data)
+    change(payload)
+    return serialization._packb(payload)
+
+
+def test_round_trip(backend):
+    messages = _messages()
+    loaded = serialization.loads_many(serialization.dumps_many(messages))
+    assert loaded == messages
+    assert loaded[0].author is loaded[2].author
+    assert loaded[1].timestamp.utcoffset() == timedelta(hours=9)
+    assert loaded[1].edited_at.tzinfo is None
+
+    channel = Channel(id=1, name="general", created_at=datetime(2025, 1, 1, tzinfo=timezone.utc))
+    assert serialization.loads(serialization.dumps(channel)) == channel
+    member = Member(id=1, user=messages[0].author, role="admin", joined_at=datetime(2025, 1, 1))
+    assert serialization.loads(serialization.dumps(member)) == member
+    assert serialization.loads_many(serialization.dumps_many([])) == []
+
+
+def test_backends_write_identical_bytes(monkeypatch):
+    pytest.importorskip("msgpack")
+    data = serialization.dumps_many(_messages())
+    monkeypatch.setattr(serialization, "_MSGPACK_AVAILABLE", False)
+    assert serialization.dumps_many(_messages()) == data
+    assert serialization.loads_many(data) == _messages()
+
+
+def test_rejects_wrong_magic(backend):
+    data = _tamper(serialization.dumps_many(_messages()), lambda p: p.__setitem__(0, "other"))
+    with pytest.raises(ValueError, match="形式"):
+        serialization.loads_many(data)
+    with pytest.raises(ValueError):
+        serialization.loads_many(b"not janus")
+
+
+def test_rejects_newer_version(backend):
+    data = _tamper(serialization.dumps_many(_messages()), lambda p: p.__setitem__(1, serialization.SCHEMA_VERSION + 1))
+    with pytest.raises(ValueError, match="バージョン"):
+        serialization.loads_many(data)
+
+
+def test_rejects_extension_types(backend):
+    data = serialization.dumps_many(_messages())
+    # fixext 1（型 1）を末尾の要素として埋め込む: 6要素の配列 → 7要素の配列
+    assert data[0] == 0x96
+    with pytest.raises(ValueError):
+        serialization.loads_many(bytes([0x97]) + data[1:] + b"\xd4\x01\x00")
+
+
+def test_rejects_trailing_bytes(backend):
+    with pytest.raises(ValueError):
+        serialization.loads_many(serialization.dumps_many(_messages()) + b"\x00")
+
+
+@pytest.mark.parametrize("index", [-1, 2, True, "0", 1.0])
+def test_rejects_out_of_range_user_index(backend, index):
+    def change(payload):
+        payload[5][0][2] = index
+
+    with pytest.raises(ValueError, match="ユーザーの参照"):
+        serialization.loads_many(_tamper(serialization.dumps_many(_messages()), change))
+
+    member = Member(id=1, user=User(id="u1", name="alice"), role="member", joined_at=datetime(2025, 1, 1))
+
+    def change_member(payload):
+        payload[5][0][1] = index
+
+    with pytest.raises(ValueError, match="ユーザーの参照"):
+        serialization.loads(_tamper(serialization.dumps(member), change_member))
+
+    def change_user(payload):
+        payload[5][0] = index
+
+    with pytest.raises(ValueError, match="ユーザーの参照"):
+        serialization.loads(_tamper(serialization.dumps(User(id="u1", name="alice")), change_user))
+
+
+def test_rejects_overflowing_timestamp(backend):
+    def change(payload):
+        payload[5][0][4] = 2 ** 62
+
+    with pytest.raises(ValueError):
+        serialization.loads_many(_tamper(serialization.dumps_many(_messages()), change))
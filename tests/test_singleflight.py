@@ -0,0 +1,117 @@
+"""
+SingleFlight / AsyncSingleFlight のテスト
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from janus.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def _wait_until(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return ["member"]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        leader = executor.submit(group.do, "members", fetch)
+        started.wait(5)
+        followers = [executor.submit(group.do, "members", fetch) for _ in range(7)]
+        _wait_until(lambda: group.shared == 7)
+        release.set()
+        results = [leader.result(5)] + [f.result(5) for f in followers]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert group.in_flight() == 0
+    # 完了後は合流せず再実行する
+    assert group.do("members", fetch) == ["member"] and len(calls) == 2
+
+
+def test_error_propagates_to_all_callers():
+    group = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(group.do, "key", fail)
+        started.wait(5)
+        followers = [executor.submit(group.do, "key", fail) for _ in range(3)]
+        _wait_until(lambda: group.shared == 3)
+        release.set()
+        for future in [leader] + followers:
+            with pytest.raises(RuntimeError, match="boom"):
+                future.result(5)
+    assert group.in_flight() == 0
+
+
+def test_different_keys_run_separately():
+    group = SingleFlight()
+    assert group.do("a", lambda: 1) == 1
+    assert group.do("b", lambda: 2) == 2
+    assert group.shared == 0
+
+
+def test_async_calls_share_one_execution_and_errors():
+    group = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        results = await asyncio.gather(*(group.do("key", fetch) for _ in range(5)))
+        errors = await asyncio.gather(*(group.do("bad", fail) for _ in range(3)), return_exceptions=True)
+        return results, errors
+
+    results, errors = asyncio.run(main())
+    assert len(calls) == 1 and all(result is results[0] for result in results)
+    assert all(isinstance(e, RuntimeError) for e in errors)
+    assert group.shared == 6 and group.in_flight() == 0
+
+
+def test_async_leader_cancellation_does_not_cancel_followers():
+    group = AsyncSingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        leader = asyncio.ensure_future(group.do("key", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(group.do("key", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower, leader.cancelled()
+
+    assert asyncio.run(main()) == ("done", True)
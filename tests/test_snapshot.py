@@ -0,0 +1,79 @@
+"""
+Snapshot のテスト
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from janus import snapshot as snapshot_module
+from janus.models import Channel, Member, Server, User
+from janus.snapshot import Snapshot, model_to_dict
+
+_TOKEN = "secret-client-token"
+_API_TOKEN = "secret-server-api-token"
+
+
+def _server() -> Server:
+    return Server(
+        id=1, name="home", api_token=_API_TOKEN, member_count=2,
+        created_at=datetime(2025, 1, 1, tzinfo=timezone.utc)
+    )
+
+
+def test_secrets_are_never_written(tmp_path):
+    path = tmp_path / "snapshot.sqlite3"
+    store = Snapshot(str(path), codec="json")
+    key = Snapshot.key_for("http://example.com/", _TOKEN, 1)
+    store.save(key, "server", _server())
+    store.save(key, "channels", [Channel(id=1, name="general")])
+    store._conn.close()
+
+    data = path.read_bytes()
+    assert _TOKEN.encode() not in data and _API_TOKEN.encode() not in data
+    assert key.startswith("http://example.com|") and key.endswith("|1")
+
+
+def test_round_trip_without_api_token(tmp_path):
+    store = Snapshot(str(tmp_path / "snapshot.sqlite3"), codec="json")
+    key = Snapshot.key_for("http://example.com", _TOKEN)
+    alice = User(id="u1", name="alice", display_name="Alice")
+    store.save(key, "server", _server())
+    store.save(key, "members", [Member(id=1, user=alice, role="owner", joined_at=datetime(2025, 1, 1))])
+
+    state = store.load(key)
+    assert "api_token" not in state["server"]
+    server = Server.from_dict(state["server"])
+    assert (server.id, server.name, server.api_token) == (1, "home", None)
+    assert server.created_at == datetime(2025, 1, 1, tzinfo=timezone.utc)
+    member = Member.from_dict(state["members"][0])
+    assert member.user == alice and member.role == "owner"
+    assert sorted(store.kinds(key)) == ["members", "server"]
+
+
+def test_model_to_dict_strips_nested_secrets():
+    class _Model:
+        def to_dict(self):
+            return {"server": {"id": 1, "api_token": _API_TOKEN}, "items": [{"api_token": _API_TOKEN}]}
+
+    assert model_to_dict(_Model()) == {"server": {"id": 1}, "items": [{}]}
+
+
+def test_load_skips_old_entries_and_requires_server(tmp_path, monkeypatch):
+    store = Snapshot(str(tmp_path / "snapshot.sqlite3"), max_age=60, codec="json")
+    key = Snapshot.key_for("http://example.com", _TOKEN)
+    assert store.load(key) is None
+    store.save(key, "channels", [])
+    assert store.load(key) is None
+
+    now = [1000.0]
+    monkeypatch.setattr(snapshot_module.time, "time", lambda: now[0])
+    store.save(key, "server", _server())
+    assert store.load(key) is not None
+    now[0] += 61
+    assert store.load(key) is None
+
+    store.clear(key)
+    assert store.kinds(key) == []
+    with pytest.raises(ValueError):
+        store.save(key, "tokens", [])